@@ -126,6 +126,7 @@ fi
 : "${AUDIOBOOKS_BIND_ADDRESS:=0.0.0.0}"
 : "${AUDIOBOOKS_HTTPS_ENABLED:=true}"
 : "${AUDIOBOOKS_USE_WAITRESS:=true}"  # Use waitress WSGI server (production mode)
+: "${AUDIOBOOKS_USE_X_SENDFILE:=false}"  # Let front-end server send files via X-Sendfile
 
 # Export all variables
 export AUDIOBOOKS_DATA AUDIOBOOKS_LIBRARY AUDIOBOOKS_SOURCES AUDIOBOOKS_SUPPLEMENTS
@@ -135,7 +136,7 @@ export AUDIOBOOKS_STAGING AUDIOBOOKS_PARALLEL_JOBS AUDIOBOOKS_SCAN_INTERVAL
 export AUDIOBOOKS_TMPFS_THRESHOLD AUDIOBOOKS_OPUS_LEVEL AUDIOBOOKS_DOWNLOAD_DELAY
 export AUDIOBOOKS_RUN_DIR AUDIOBOOKS_VAR_DIR AUDIOBOOKS_TRIGGERS AUDIOBOOKS_DOWNLOADER_LOCK
 export AUDIOBOOKS_AUDIBLE_CMD
-export AUDIOBOOKS_API_PORT AUDIOBOOKS_WEB_PORT AUDIOBOOKS_HTTP_REDIRECT_PORT AUDIOBOOKS_BIND_ADDRESS AUDIOBOOKS_HTTPS_ENABLED AUDIOBOOKS_USE_WAITRESS
+export AUDIOBOOKS_API_PORT AUDIOBOOKS_WEB_PORT AUDIOBOOKS_HTTP_REDIRECT_PORT AUDIOBOOKS_BIND_ADDRESS AUDIOBOOKS_HTTPS_ENABLED AUDIOBOOKS_USE_WAITRESS AUDIOBOOKS_USE_X_SENDFILE
 
 # -----------------------------------------------------------------------------
 # Legacy variable mapping (for backwards compatibility)
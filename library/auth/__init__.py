@@ -10,6 +10,7 @@ from .database import (
     hash_token,
     generate_session_token,
     generate_verification_token,
+    VERIFICATION_TOKEN_LENGTH,
 )
 
 from .models import (
@@ -75,6 +76,7 @@ __all__ = [
     "hash_token",
     "generate_session_token",
     "generate_verification_token",
+    "VERIFICATION_TOKEN_LENGTH",
     # Enums
     "AuthType",
     "NotificationType",
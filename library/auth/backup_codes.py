@@ -150,11 +150,10 @@ class BackupCodeRepository:
             )
 
             # Insert new codes
-            for code_hash in code_hashes:
-                conn.execute(
-                    "INSERT INTO backup_codes (user_id, code_hash) VALUES (?, ?)",
-                    (user_id, code_hash)
-                )
+            conn.executemany(
+                "INSERT INTO backup_codes (user_id, code_hash) VALUES (?, ?)",
+                [(user_id, code_hash) for code_hash in code_hashes]
+            )
 
         return raw_codes
 
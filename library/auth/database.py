@@ -9,6 +9,7 @@ from __future__ import annotations
 import os
 import secrets
 import hashlib
+import threading
 from pathlib import Path
 from contextlib import contextmanager
 from typing import Optional, Generator
@@ -74,6 +75,8 @@ class AuthDatabase:
         self.key_path = Path(key_path)
 
         self._key: Optional[str] = None
+        # One open connection per thread, reused across connection() blocks
+        self._local = threading.local()
 
     def _default_key_path(self) -> str:
         """Determine default key path based on mode."""
@@ -145,7 +148,8 @@ class AuthDatabase:
 
     def _create_connection(self) -> sqlcipher.Connection:
         """Create new encrypted database connection."""
-        conn = sqlcipher.connect(str(self.db_path))
+        # Room for every distinct auth query, so they are parsed once per thread
+        conn = sqlcipher.connect(str(self.db_path), cached_statements=256)
 
         # CRITICAL: Set encryption key FIRST, before any other operations
         conn.execute(f"PRAGMA key = \"x'{self.key}'\"")
@@ -164,6 +168,9 @@ class AuthDatabase:
         # Enable foreign keys
         conn.execute("PRAGMA foreign_keys = ON")
 
+        # Keep sort/temp b-trees in memory rather than temp files
+        conn.execute("PRAGMA temp_store = MEMORY")
+
         return conn
 
     @contextmanager
@@ -171,18 +178,61 @@ class AuthDatabase:
         """
         Context manager for database connections.
 
+        Each thread keeps its connection open between blocks, so the key
+        setup and decryption check run once per thread rather than on
+        every call. Nested blocks share the connection and run inside a
+        savepoint, so a failing inner block still undoes only its own
+        writes; the outermost block commits or rolls back.
+
         Usage:
             with db.connection() as conn:
                 cursor = conn.execute("SELECT * FROM users")
         """
-        conn = self._create_connection()
+        local = self._local
+        conn = getattr(local, "conn", None)
+        if conn is None:
+            conn = self._create_connection()
+            local.conn = conn
+            local.depth = 0
+
+        local.depth += 1
+        savepoint = None
+        if local.depth > 1:
+            # An explicit BEGIN keeps RELEASE from committing early when the
+            # outer block has not written anything yet
+            if not conn.in_transaction:
+                conn.execute("BEGIN")
+            savepoint = f"nested_{local.depth}"
+            conn.execute(f"SAVEPOINT {savepoint}")
         try:
             yield conn
-            conn.commit()
+            if savepoint:
+                conn.execute(f"RELEASE {savepoint}")
+            else:
+                conn.commit()
         except Exception:
-            conn.rollback()
+            if savepoint:
+                conn.execute(f"ROLLBACK TO {savepoint}")
+                conn.execute(f"RELEASE {savepoint}")
+            else:
+                conn.rollback()
             raise
         finally:
+            local.depth -= 1
+
+    def close(self) -> None:
+        """
+        Close the calling thread's connection, if it has one open.
+
+        Raises:
+            AuthDatabaseError: If called inside a connection() block
+        """
+        if getattr(self._local, "depth", 0) > 0:
+            raise AuthDatabaseError("Cannot close inside an open connection() block")
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            self._local.conn = None
+            self._local.depth = 0
             conn.close()
 
     def initialize(self) -> bool:
@@ -321,6 +371,10 @@ def generate_session_token() -> tuple[str, str]:
     return raw_token, token_hash
 
 
+# Length of the tokens sent out in registration and magic-link messages
+VERIFICATION_TOKEN_LENGTH = 32
+
+
 def generate_verification_token() -> tuple[str, str]:
     """
     Generate a verification token for registration.
@@ -329,6 +383,8 @@ def generate_verification_token() -> tuple[str, str]:
         Tuple of (raw_token, token_hash)
     """
     alphabet = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
-    raw_token = "".join(secrets.choice(alphabet) for _ in range(32))
+    raw_token = "".join(
+        secrets.choice(alphabet) for _ in range(VERIFICATION_TOKEN_LENGTH)
+    )
     token_hash = hash_token(raw_token)
     return raw_token, token_hash
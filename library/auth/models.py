@@ -5,9 +5,10 @@ These models provide a clean interface to the encrypted auth database.
 All credential data is stored encrypted via SQLCipher.
 """
 
+import weakref
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional, List
+from typing import Iterable, Optional, List
 from enum import Enum
 
 from .database import AuthDatabase, hash_token, generate_session_token, generate_verification_token
@@ -173,6 +174,22 @@ class UserRepository:
             row = cursor.fetchone()
             return User.from_row(row) if row else None
 
+    def get_by_ids(self, user_ids: Iterable[int]) -> dict[int, User]:
+        """Get users by ID in as few queries as possible, keyed by ID."""
+        ids = list(set(user_ids))
+        users: dict[int, User] = {}
+        with self.db.connection() as conn:
+            # Stay under SQLite's default limit on bound parameters
+            for start in range(0, len(ids), 900):
+                batch = ids[start:start + 900]
+                placeholders = ",".join("?" * len(batch))
+                cursor = conn.execute(
+                    f"SELECT * FROM users WHERE id IN ({placeholders})", batch
+                )
+                for row in cursor:
+                    users[row[0]] = User.from_row(row)
+        return users
+
     def get_by_username(self, username: str) -> Optional[User]:
         """Get user by username (case-sensitive)."""
         with self.db.connection() as conn:
@@ -334,13 +351,16 @@ class Session:
             # Invalidate existing sessions
             conn.execute("DELETE FROM sessions WHERE user_id = ?", (user_id,))
 
-            # Create new session
+            # Create new session; last_seen is written in local time like
+            # touch() does, since the column default is UTC
             cursor = conn.execute(
                 """
-                INSERT INTO sessions (user_id, token_hash, user_agent, ip_address)
-                VALUES (?, ?, ?, ?)
+                INSERT INTO sessions
+                    (user_id, token_hash, user_agent, ip_address, last_seen)
+                VALUES (?, ?, ?, ?, ?)
                 """,
-                (user_id, token_hash, user_agent, ip_address)
+                (user_id, token_hash, user_agent, ip_address,
+                 datetime.now().isoformat())
             )
             session_id = cursor.lastrowid
 
@@ -396,6 +416,48 @@ class SessionRepository:
             row = cursor.fetchone()
             return Session.from_row(row) if row else None
 
+    def get_with_user(
+        self, raw_token: str, grace_minutes: Optional[int] = None
+    ) -> Optional[tuple[Session, Optional["User"]]]:
+        """
+        Get session by raw token together with its user, in one query.
+
+        Returns None if there is no such session; the user is None if the
+        session's user no longer exists. If grace_minutes is given, a
+        session with no activity within that period is deleted and treated
+        as missing.
+        """
+        token_hash = hash_token(raw_token)
+        # datetime() normalizes both the 'T' and space separated formats
+        stale_sql = (
+            "s.last_seen IS NULL OR "
+            "datetime(s.last_seen) < datetime('now', 'localtime', ?)"
+            if grace_minutes is not None else "0"
+        )
+        params: tuple = (token_hash,)
+        if grace_minutes is not None:
+            params = (f"-{grace_minutes} minutes", token_hash)
+        with self.db.connection() as conn:
+            cursor = conn.execute(
+                f"""
+                SELECT s.id, s.user_id, s.token_hash, s.created_at, s.last_seen,
+                       s.expires_at, s.user_agent, s.ip_address,
+                       ({stale_sql}) AS stale, u.*
+                FROM sessions s
+                LEFT JOIN users u ON u.id = s.user_id
+                WHERE s.token_hash = ?
+                """,
+                params
+            )
+            row = cursor.fetchone()
+            if row is not None and row[8]:
+                conn.execute("DELETE FROM sessions WHERE id = ?", (row[0],))
+                return None
+        if row is None:
+            return None
+        user = User.from_row(row[9:]) if row[9] is not None else None
+        return Session.from_row(row[:8]), user
+
     def get_by_user_id(self, user_id: int) -> Optional[Session]:
         """Get active session for user (if any)."""
         with self.db.connection() as conn:
@@ -628,14 +690,32 @@ class NotificationRepository:
             except Exception:
                 return False  # Already dismissed
 
-    def list_all(self) -> List[Notification]:
-        """List all notifications (admin)."""
+    def list_all(
+        self, limit: Optional[int] = None, offset: int = 0
+    ) -> List[Notification]:
+        """List notifications (admin), newest first; limit=None for all."""
         with self.db.connection() as conn:
             cursor = conn.execute(
-                "SELECT * FROM notifications ORDER BY created_at DESC"
+                "SELECT * FROM notifications ORDER BY created_at DESC, id DESC "
+                "LIMIT ? OFFSET ?",
+                (-1 if limit is None else limit, offset)
             )
             return [Notification.from_row(row) for row in cursor.fetchall()]
 
+    def count_all(self) -> int:
+        """Count all notifications."""
+        with self.db.connection() as conn:
+            cursor = conn.execute("SELECT COUNT(*) FROM notifications")
+            return cursor.fetchone()[0]
+
+    def delete(self, notification_id: int) -> bool:
+        """Delete a notification. Returns False if it doesn't exist."""
+        with self.db.connection() as conn:
+            cursor = conn.execute(
+                "DELETE FROM notifications WHERE id = ?", (notification_id,)
+            )
+            return cursor.rowcount > 0
+
 
 @dataclass
 class InboxMessage:
@@ -741,19 +821,39 @@ class InboxRepository:
             )
             return [InboxMessage.from_row(row) for row in cursor.fetchall()]
 
-    def list_all(self, include_archived: bool = False) -> List[InboxMessage]:
-        """List all messages."""
+    def list_all(
+        self,
+        include_archived: bool = False,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[InboxMessage]:
+        """List messages, newest first; limit=None for all."""
+        where = "" if include_archived else "WHERE status != 'archived' "
         with self.db.connection() as conn:
-            if include_archived:
-                cursor = conn.execute(
-                    "SELECT * FROM inbox ORDER BY created_at DESC"
-                )
-            else:
-                cursor = conn.execute(
-                    "SELECT * FROM inbox WHERE status != 'archived' ORDER BY created_at DESC"
-                )
+            cursor = conn.execute(
+                f"SELECT * FROM inbox {where}ORDER BY created_at DESC, id DESC "
+                "LIMIT ? OFFSET ?",
+                (-1 if limit is None else limit, offset)
+            )
             return [InboxMessage.from_row(row) for row in cursor.fetchall()]
 
+    def count_all_and_unread(self, include_archived: bool = False) -> tuple[int, int]:
+        """
+        Count messages and unread messages in one pass.
+
+        Returns:
+            Tuple of (total, unread); total leaves out archived messages
+            unless include_archived is set
+        """
+        total = "COUNT(*)" if include_archived else "SUM(status != 'archived')"
+        with self.db.connection() as conn:
+            cursor = conn.execute(
+                f"SELECT COALESCE({total}, 0), COALESCE(SUM(status = 'unread'), 0) "
+                "FROM inbox"
+            )
+            total_count, unread_count = cursor.fetchone()
+            return total_count, unread_count
+
     def count_unread(self) -> int:
         """Count unread messages."""
         with self.db.connection() as conn:
@@ -1075,12 +1175,19 @@ class AccessRequest:
         }
 
 
+# Databases whose access_requests table has already been created/migrated
+_access_request_tables_ready: "weakref.WeakSet[AuthDatabase]" = weakref.WeakSet()
+
+
 class AccessRequestRepository:
     """Repository for AccessRequest operations."""
 
     def __init__(self, db: AuthDatabase):
         self.db = db
-        self._ensure_table()
+        # Repositories are built per request; only check the table once
+        if db not in _access_request_tables_ready:
+            self._ensure_table()
+            _access_request_tables_ready.add(db)
 
     def _ensure_table(self):
         """Create table if it doesn't exist, and migrate if needed."""
@@ -14,7 +14,7 @@ import json
 import secrets
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Optional, Union
 
 from webauthn import (
     generate_registration_options,
@@ -185,7 +185,7 @@ def create_registration_options(
 
 
 def verify_registration(
-    credential_json: str,
+    credential_json: Union[str, dict[str, Any]],
     expected_challenge: bytes,
     expected_origin: str = DEFAULT_ORIGIN,
     expected_rp_id: str = DEFAULT_RP_ID,
@@ -194,7 +194,8 @@ def verify_registration(
     Verify a WebAuthn registration response.
 
     Args:
-        credential_json: JSON string from navigator.credentials.create()
+        credential_json: Credential from navigator.credentials.create(), as a
+            JSON string or the already-decoded object
         expected_challenge: The challenge that was sent
         expected_origin: Expected origin URL
         expected_rp_id: Expected relying party ID
@@ -293,7 +294,7 @@ def create_authentication_options(
 
 
 def verify_authentication(
-    credential_json: str,
+    credential_json: Union[str, dict[str, Any]],
     expected_challenge: bytes,
     credential_public_key: bytes,
     credential_current_sign_count: int,
@@ -304,7 +305,8 @@ def verify_authentication(
     Verify a WebAuthn authentication response.
 
     Args:
-        credential_json: JSON string from navigator.credentials.get()
+        credential_json: Credential from navigator.credentials.get(), as a
+            JSON string or the already-decoded object
         expected_challenge: The challenge that was sent
         credential_public_key: The stored public key for this credential
         credential_current_sign_count: The stored sign count
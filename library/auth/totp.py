@@ -18,6 +18,15 @@ DEFAULT_ISSUER = "AudiobookLibrary"
 # Number of 30-second windows to allow for clock drift (1 = ±30 seconds)
 VALID_WINDOW = 1
 
+# QR symbol version for provisioning URIs. With the default issuer and a
+# 16-character username the URI is ~112 bytes; version 6 at error
+# correction L holds 134, so the usual case skips the best-fit search.
+QR_VERSION = 6
+
+# QR mask pattern. Any of the eight is valid; letting qrcode choose renders
+# the symbol once per mask to score them, which is most of the encode time.
+QR_MASK_PATTERN = 0
+
 
 def generate_secret() -> bytes:
     """
@@ -47,16 +56,16 @@ def base32_to_secret(base32_secret: str) -> bytes:
     Convert base32 string back to raw bytes.
 
     Args:
-        base32_secret: Base32-encoded string
+        base32_secret: Base32-encoded string (padding optional, any case)
 
     Returns:
         Raw secret bytes
     """
-    # Add padding if needed
-    padding = 8 - (len(base32_secret) % 8)
-    if padding != 8:
+    # Restore the '=' padding stripped by secret_to_base32 (0-7 chars)
+    padding = -len(base32_secret) % 8
+    if padding:
         base32_secret += '=' * padding
-    return base64.b32decode(base32_secret)
+    return base64.b32decode(base32_secret, casefold=True)
 
 
 def get_provisioning_uri(
@@ -97,19 +106,25 @@ def generate_qr_code(
     """
     try:
         import qrcode
+        from qrcode.exceptions import DataOverflowError
         from qrcode.image.pil import PilImage
     except ImportError:
         raise ImportError("qrcode[pil] package required for QR code generation")
 
     uri = get_provisioning_uri(secret, username, issuer)
     qr = qrcode.QRCode(
-        version=1,
+        version=QR_VERSION,
         error_correction=qrcode.constants.ERROR_CORRECT_L,
         box_size=10,
         border=4,
+        mask_pattern=QR_MASK_PATTERN,
     )
     qr.add_data(uri)
-    qr.make(fit=True)
+    try:
+        qr.make(fit=False)
+    except DataOverflowError:
+        # Unusually long username or issuer - let qrcode pick a version
+        qr.make(fit=True)
 
     img = qr.make_image(fill_color="black", back_color="white")
 
@@ -27,12 +27,13 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 # Type alias for Flask route return types (backward compatibility)
 from typing import Optional, Union
 
-from config import API_PORT, DATABASE_PATH, PROJECT_DIR, SUPPLEMENTS_DIR
+from config import (API_PORT, AUDIOBOOKS_USE_X_SENDFILE, DATABASE_PATH,
+                    PROJECT_DIR, SUPPLEMENTS_DIR)
 
 from .audiobooks import audiobooks_bp, init_audiobooks_routes
 from .collections import (COLLECTIONS, collections_bp, genre_query,
                           init_collections_routes, multi_genre_query)
-from .core import add_cors_headers
+from .core import OrjsonProvider, add_cors_headers, ensure_schema, orjson
 from .core import get_db as _get_db_with_path
 from .duplicates import duplicates_bp, init_duplicates_routes
 from .editions import (editions_bp, has_edition_marker, init_editions_routes,
@@ -50,6 +51,7 @@ from .auth import (
     auth_if_enabled,
     download_permission_required,
     admin_if_enabled,
+    strip_optional_auth,
 )
 
 FlaskResponse = Union[Response, tuple[Response, int], tuple[str, int]]
@@ -72,6 +74,7 @@ def create_app(
     auth_db_path: Optional[Path] = None,
     auth_key_path: Optional[Path] = None,
     auth_dev_mode: bool = False,
+    use_x_sendfile: Optional[bool] = None,
 ):
     """
     Create and configure the Flask application.
@@ -81,6 +84,8 @@ def create_app(
         project_dir: Path to the project root directory (default: from config)
         supplements_dir: Path to the supplements directory (default: from config)
         api_port: Port to run the API on (default: from config)
+        use_x_sendfile: Delegate file bodies to the front-end server via
+            X-Sendfile (default: from config)
 
     Returns:
         Configured Flask application
@@ -90,8 +95,12 @@ def create_app(
     project_dir = project_dir or PROJECT_DIR
     supplements_dir = supplements_dir or SUPPLEMENTS_DIR
     api_port = api_port or API_PORT
+    if use_x_sendfile is None:
+        use_x_sendfile = AUDIOBOOKS_USE_X_SENDFILE
 
     flask_app = Flask(__name__)
+    if orjson is not None:
+        flask_app.json = OrjsonProvider(flask_app)
 
     # Store configuration
     flask_app.config["DATABASE_PATH"] = database_path
@@ -99,6 +108,9 @@ def create_app(
     flask_app.config["SUPPLEMENTS_DIR"] = supplements_dir
     flask_app.config["API_PORT"] = api_port
     flask_app.config["AUTH_DEV_MODE"] = auth_dev_mode
+    # send_file() honors this: the response carries only an X-Sendfile header
+    # and the front-end server moves the bytes with sendfile(2)
+    flask_app.config["USE_X_SENDFILE"] = use_x_sendfile
 
     project_root = project_dir / "library"
 
@@ -122,6 +134,9 @@ def create_app(
         """Handle CORS preflight requests"""
         return "", 204
 
+    # Apply schema additions (columns, triggers, indices) to existing databases
+    ensure_schema(database_path)
+
     # Initialize all route modules with their dependencies
     init_audiobooks_routes(database_path, project_root, database_path)
     init_collections_routes(database_path)
@@ -151,6 +166,9 @@ def create_app(
     # Register auth blueprint if configured
     if flask_app.config["AUTH_ENABLED"]:
         flask_app.register_blueprint(auth_bp)
+    else:
+        # Single-user mode: optional auth checks would always pass through
+        strip_optional_auth(flask_app)
 
     return flask_app
 
@@ -215,6 +233,8 @@ def run_server(
             print("Running in production mode (waitress)")
             print(f"Listening on: http://{bind_address}:{port}")
             print()
+            # waitress provides wsgi.file_wrapper, so send_file() responses
+            # are written from the open file rather than Python-side chunks
             serve(flask_app, host=bind_address, port=port, threads=4)
         except ImportError:
             print("Error: waitress not installed. Install with: pip install waitress")
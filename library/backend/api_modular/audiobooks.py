@@ -5,18 +5,20 @@ Note: All queries filter by content_type to exclude non-audiobook content
 (podcasts, newspapers, etc.) from the main library.
 """
 
+import re
 import sys
 from pathlib import Path
+from typing import Optional
 
-from flask import (Blueprint, Response, jsonify, request, send_file,
-                   send_from_directory)
+from flask import (Blueprint, Response, current_app, jsonify, request,
+                   send_file, send_from_directory)
 
 # Add parent directory to path for config import
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from config import COVER_DIR
 
 from .collections import COLLECTIONS
-from .core import FlaskResponse, get_db
+from .core import NAME_LIST_SEPARATOR, FlaskResponse, get_db
 from .editions import has_edition_marker, normalize_base_title
 from .auth import auth_if_enabled, download_permission_required
 
@@ -29,6 +31,52 @@ audiobooks_bp = Blueprint("audiobooks", __name__)
 # nosec B608: This constant is safe for SQL - it's hardcoded, not user input
 AUDIOBOOK_FILTER = "(content_type IN ('Product', 'Lecture', 'Performance', 'Speech') OR content_type IS NULL)"
 
+# Cover files are named after a hash of the audio file path and never
+# rewritten once extracted, so browsers may keep them indefinitely
+COVER_CACHE_MAX_AGE = 365 * 24 * 60 * 60  # 1 year in seconds
+
+
+# Word tokens as the FTS5 unicode61 tokenizer sees them; everything else
+# (quotes, operators, column syntax) is dropped before building a MATCH
+FTS_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+# Columns returned per book by /api/audiobooks, in SELECT order. Rows are
+# fetched as plain tuples and zipped against this instead of converting
+# each sqlite3.Row with dict(); the denormalized list columns follow these.
+LISTING_COLUMNS = (
+    "id", "title", "author", "narrator", "publisher", "series",
+    "series_sequence", "edition", "asin", "acquired_date", "published_year",
+    "author_last_name", "author_first_name",
+    "narrator_last_name", "narrator_first_name",
+    "duration_hours", "duration_formatted", "file_size_mb",
+    "file_path", "cover_path", "format", "quality", "description",
+)
+
+
+def split_name_list(value: Optional[str]) -> list[str]:
+    """Split a denormalized *_names column back into a list of names."""
+    return value.split(NAME_LIST_SEPARATOR) if value else []
+
+
+def fts_column_prefix_query(column: str, value: str) -> Optional[str]:
+    """
+    Build an FTS5 expression matching every word of value as a prefix
+    within a single column, e.g. 'king step' -> author : "king"* author : "step"*
+
+    Returns None if value contains no searchable words.
+    """
+    tokens = FTS_TOKEN_PATTERN.findall(value)
+    if not tokens:
+        return None
+    return " ".join(f'{column} : "{token}"*' for token in tokens)
+
+
+@audiobooks_bp.errorhandler(FileNotFoundError)
+def file_not_on_disk(error: FileNotFoundError) -> FlaskResponse:
+    """Catalogued audio file is missing (send_file stats it on each request)."""
+    return jsonify({"error": "File not found on disk"}), 404
+
 
 def init_audiobooks_routes(db_path, project_root, database_path):
     """Initialize routes with database path and project directories."""
@@ -194,17 +242,28 @@ def init_audiobooks_routes(db_path, project_root, database_path):
             )
             params.append(search)
 
-        if author:
-            where_clauses.append("author LIKE ?")
-            params.append(f"%{author}%")
-
-        if narrator:
-            where_clauses.append("narrator LIKE ?")
-            params.append(f"%{narrator}%")
+        # Name filters go through the FTS index as word-prefix matches
+        # rather than LIKE '%x%', which can never use an index
+        fts_terms = []
+        for column, value in (
+            ("author", author),
+            ("narrator", narrator),
+            ("publisher", publisher),
+        ):
+            if not value:
+                continue
+            term = fts_column_prefix_query(column, value)
+            if term:
+                fts_terms.append(term)
+            else:
+                where_clauses.append(f"{column} LIKE ?")
+                params.append(f"%{value}%")
 
-        if publisher:
-            where_clauses.append("publisher LIKE ?")
-            params.append(f"%{publisher}%")
+        if fts_terms:
+            where_clauses.append(
+                "id IN (SELECT rowid FROM audiobooks_fts WHERE audiobooks_fts MATCH ?)"
+            )
+            params.append(" ".join(fts_terms))
 
         if format_filter:
             where_clauses.append("format = ?")
@@ -241,67 +300,31 @@ def init_audiobooks_routes(db_path, project_root, database_path):
         # CodeQL: sort_sql is from sort_mappings allowlist (lines 148-165), sort_order validated (line 174)
         query = f"""
             SELECT
-                id, title, author, narrator, publisher, series,
-                series_sequence, edition, asin, acquired_date, published_year,
-                author_last_name, author_first_name,
-                narrator_last_name, narrator_first_name,
-                duration_hours, duration_formatted, file_size_mb,
-                file_path, cover_path, format, quality, description
+                {", ".join(LISTING_COLUMNS)},
+                genre_names, era_names, topic_names, supplement_count
             FROM audiobooks
             {where_sql}
             ORDER BY {sort_sql} {sort_order}
             LIMIT ? OFFSET ?
         """
 
-        cursor.execute(query, params + [per_page, offset])
-        rows = cursor.fetchall()
+        list_cursor = conn.cursor()
+        list_cursor.row_factory = None
+        list_cursor.execute(query, params + [per_page, offset])
+        rows = list_cursor.fetchall()
 
         # Convert to list of dicts
         audiobooks = []
         for row in rows:
-            book = dict(row)
+            book = dict(zip(LISTING_COLUMNS, row))
 
-            # Get genres, eras, topics
-            cursor.execute(
-                """
-                SELECT g.name FROM genres g
-                JOIN audiobook_genres ag ON g.id = ag.genre_id
-                WHERE ag.audiobook_id = ?
-            """,
-                (book["id"],),
-            )
-            book["genres"] = [r["name"] for r in cursor.fetchall()]
-
-            cursor.execute(
-                """
-                SELECT e.name FROM eras e
-                JOIN audiobook_eras ae ON e.id = ae.era_id
-                WHERE ae.audiobook_id = ?
-            """,
-                (book["id"],),
-            )
-            book["eras"] = [r["name"] for r in cursor.fetchall()]
-
-            cursor.execute(
-                """
-                SELECT t.name FROM topics t
-                JOIN audiobook_topics at ON t.id = at.topic_id
-                WHERE at.audiobook_id = ?
-            """,
-                (book["id"],),
-            )
-            book["topics"] = [r["name"] for r in cursor.fetchall()]
-
-            # Get supplement count for this audiobook
-            cursor.execute(
-                """
-                SELECT COUNT(*) as count FROM supplements
-                WHERE audiobook_id = ?
-            """,
-                (book["id"],),
-            )
-            result = cursor.fetchone()
-            book["supplement_count"] = result["count"] if result else 0
+            # Genres, eras, topics and supplement count are denormalized
+            # onto the row by triggers (see schema.sql)
+            genre_names, era_names, topic_names, supplement_count = row[-4:]
+            book["genres"] = split_name_list(genre_names)
+            book["eras"] = split_name_list(era_names)
+            book["topics"] = split_name_list(topic_names)
+            book["supplement_count"] = supplement_count or 0
 
             # Get edition count (only count if book has edition markers)
             base_title = normalize_base_title(book["title"])
@@ -510,7 +533,16 @@ def init_audiobooks_routes(db_path, project_root, database_path):
     @auth_if_enabled
     def serve_cover(filename: str) -> Response:
         """Serve cover images from configured COVER_DIR"""
-        return send_from_directory(COVER_DIR, filename)
+        response = send_from_directory(
+            COVER_DIR, filename, max_age=COVER_CACHE_MAX_AGE
+        )
+        response.cache_control.immutable = True
+        if current_app.config.get("AUTH_ENABLED", False):
+            # Covers sit behind login in multi-user mode - keep them out of
+            # shared caches
+            response.cache_control.public = False
+            response.cache_control.private = True
+        return response
 
     @audiobooks_bp.route("/api/stream/<int:audiobook_id>")
     @auth_if_enabled
@@ -520,7 +552,7 @@ def init_audiobooks_routes(db_path, project_root, database_path):
         cursor = conn.cursor()
 
         cursor.execute(
-            "SELECT file_path, format FROM audiobooks WHERE id = ?", (audiobook_id,)
+            "SELECT file_path, mime_type FROM audiobooks WHERE id = ?", (audiobook_id,)
         )
         row = cursor.fetchone()
         conn.close()
@@ -528,25 +560,12 @@ def init_audiobooks_routes(db_path, project_root, database_path):
         if not row:
             return jsonify({"error": "Audiobook not found"}), 404
 
-        file_path = Path(row["file_path"])
-        if not file_path.exists():
-            return jsonify({"error": "File not found on disk"}), 404
-
-        # Map file formats to MIME types
-        mime_types = {
-            "opus": "audio/ogg",
-            "m4b": "audio/mp4",
-            "m4a": "audio/mp4",
-            "mp3": "audio/mpeg",
-        }
-
-        file_format = row["format"] or file_path.suffix.lower().lstrip(".")
-        mimetype = mime_types.get(file_format, "application/octet-stream")
-
-        # Use send_file directly for better handling of special characters in paths
+        # Use send_file directly for better handling of special characters in paths.
+        # It stats the file itself; a missing file raises FileNotFoundError,
+        # answered by file_not_on_disk() below.
         return send_file(
-            file_path,
-            mimetype=mimetype,
+            row["file_path"],
+            mimetype=row["mime_type"],
             as_attachment=False,
             conditional=True,  # Enable range requests for seeking
         )
@@ -563,7 +582,7 @@ def init_audiobooks_routes(db_path, project_root, database_path):
         cursor = conn.cursor()
 
         cursor.execute(
-            "SELECT title, author, file_path, format FROM audiobooks WHERE id = ?",
+            "SELECT title, author, file_path, format, mime_type FROM audiobooks WHERE id = ?",
             (audiobook_id,),
         )
         row = cursor.fetchone()
@@ -572,14 +591,12 @@ def init_audiobooks_routes(db_path, project_root, database_path):
         if not row:
             return jsonify({"error": "Audiobook not found"}), 404
 
-        file_path = Path(row["file_path"])
-        if not file_path.exists():
-            return jsonify({"error": "File not found on disk"}), 404
+        file_path = row["file_path"]
 
         # Build a clean filename from title and author
         title = row["title"] or "audiobook"
         author = row["author"]
-        file_format = row["format"] or file_path.suffix.lower().lstrip(".")
+        file_format = row["format"] or Path(file_path).suffix.lower().lstrip(".")
 
         # Sanitize filename: remove/replace problematic characters
         def sanitize(s: str) -> str:
@@ -593,18 +610,9 @@ def init_audiobooks_routes(db_path, project_root, database_path):
         else:
             download_name = f"{sanitize(title)}.{file_format}"
 
-        # Map file formats to MIME types
-        mime_types = {
-            "opus": "audio/ogg",
-            "m4b": "audio/mp4",
-            "m4a": "audio/mp4",
-            "mp3": "audio/mpeg",
-        }
-        mimetype = mime_types.get(file_format, "application/octet-stream")
-
         return send_file(
             file_path,
-            mimetype=mimetype,
+            mimetype=row["mime_type"],
             as_attachment=True,
             download_name=download_name,
         )
@@ -10,17 +10,33 @@ Provides endpoints for:
 All authentication data is stored in the encrypted auth.db (SQLCipher).
 """
 
+import binascii
+import copy
+import hashlib
+import json
 import os
+import queue
+import re
+import secrets
 import smtplib
+import socket
 import sys
-from datetime import datetime
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from functools import wraps
+from email.policy import compat32
+from dataclasses import dataclass
+from functools import lru_cache, wraps
 from pathlib import Path
-from typing import Optional, Callable, Any
+from typing import Optional, Callable, Any, Iterator
 
-from flask import Blueprint, Response, jsonify, request, g, current_app
+from flask import Blueprint, Flask, Response, jsonify, request, g, current_app
+from webauthn.helpers import base64url_to_bytes, bytes_to_base64url
 
 # Add parent paths for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -44,6 +60,7 @@ from auth import (
     ReplyMethod,
     hash_token,
     generate_verification_token,
+    VERIFICATION_TOKEN_LENGTH,
     # Access Requests
     AccessRequestStatus,
     AccessRequestRepository,
@@ -76,6 +93,20 @@ _session_cookie_httponly = True
 _session_cookie_samesite = "Lax"
 
 
+def _session_cookie_attributes() -> str:
+    """Format the fixed Set-Cookie attributes for the session cookie."""
+    secure = "; Secure" if _session_cookie_secure else ""
+    httponly = "; HttpOnly" if _session_cookie_httponly else ""
+    return f"{secure}{httponly}; Path=/; SameSite={_session_cookie_samesite}"
+
+
+# Set-Cookie attributes, built once (and again when init changes them)
+_session_cookie_attrs = _session_cookie_attributes()
+_session_cookie_clear = (
+    f"{_session_cookie_name}=; Expires=Thu, 01 Jan 1970 00:00:00 GMT; Max-Age=0; Path=/"
+)
+
+
 def init_auth_routes(
     auth_db_path: Path,
     auth_key_path: Path,
@@ -89,7 +120,7 @@ def init_auth_routes(
         auth_key_path: Path to encryption key file
         is_dev: Development mode (relaxed security)
     """
-    global _auth_db, _session_cookie_secure
+    global _auth_db, _session_cookie_secure, _session_cookie_attrs
 
     _auth_db = AuthDatabase(
         db_path=str(auth_db_path),
@@ -101,12 +132,41 @@ def init_auth_routes(
     # In dev mode, allow non-secure cookies for localhost
     if is_dev:
         _session_cookie_secure = False
+    _session_cookie_attrs = _session_cookie_attributes()
 
     # Log WebAuthn configuration at startup
     rp_id, rp_name, origin = get_webauthn_config()
     print(f"WebAuthn config: rp_id={rp_id}, origin={origin}, rp_name={rp_name}")
 
 
+@auth_bp.after_request
+def no_store_auth_responses(response: Response) -> Response:
+    """
+    Keep auth responses out of browser and proxy caches.
+
+    These responses carry session state and credential material (TOTP
+    secrets and QR codes, backup codes), none of which may be replayed
+    from a cache. Handlers that set their own Cache-Control are left alone.
+    """
+    response.headers.setdefault("Cache-Control", "no-store")
+    return response
+
+
+@auth_bp.after_request
+def forget_cached_sessions(response: Response) -> Response:
+    """
+    Drop cached session lookups after any state-changing auth request.
+
+    Logouts, logins, permission changes and user deletions all go through
+    this blueprint, so they take effect on the very next request.
+    """
+    if (request.method not in ("GET", "HEAD", "OPTIONS")
+            and request.endpoint not in _READ_ONLY_POST_ENDPOINTS):
+        clear_session_cache()
+        clear_auth_type_cache()
+    return response
+
+
 def get_auth_db() -> AuthDatabase:
     """Get the auth database instance."""
     if _auth_db is None:
@@ -118,46 +178,124 @@ def get_auth_db() -> AuthDatabase:
 # Session Middleware
 # =============================================================================
 
+# Recent (user, session) lookups, keyed by a digest of the session token so
+# raw tokens are never held in memory. Entries expire after a few seconds,
+# which bounds how long another worker process can act on a revoked session.
+SESSION_CACHE_MAX = 4096
+SESSION_CACHE_TTL = 5.0
+
+# Minimum gap between last_seen writes for a session. Staleness is judged
+# against a 30-minute grace period, so per-request timestamps buy nothing.
+SESSION_TOUCH_INTERVAL = timedelta(seconds=60)
+
+_session_cache: "OrderedDict[bytes, tuple[float, User, Session]]" = OrderedDict()
+_session_cache_lock = threading.Lock()
+
+
+def _session_cache_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
+
+
+def clear_session_cache() -> None:
+    """Forget every cached session lookup."""
+    with _session_cache_lock:
+        _session_cache.clear()
+
+
+# Recent /login/auth-type answers, keyed by username. The login page asks on
+# every attempt; entries expire so changes made by another worker process
+# show up within the TTL.
+AUTH_TYPE_CACHE_MAX = 1024
+AUTH_TYPE_CACHE_TTL = 30.0
+
+_auth_type_cache: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+_auth_type_cache_lock = threading.Lock()
+
+# POST endpoints that change nothing (POST keeps usernames out of URLs), so
+# they don't need to flush the caches above
+_READ_ONLY_POST_ENDPOINTS = frozenset({"auth.get_auth_type"})
+
+
+def clear_auth_type_cache() -> None:
+    """Forget every cached auth type."""
+    with _auth_type_cache_lock:
+        _auth_type_cache.clear()
+
+
+# Marks g._current_user/_current_session as not yet looked up this request
+# (None is a resolved "not authenticated")
+_UNRESOLVED = object()
+
+
 def get_current_user() -> Optional[User]:
     """
     Get the currently authenticated user from the session cookie.
 
+    The result is memoized on g, so decorators and handlers can all call
+    this without repeating the lookup.
+
     Returns:
         User object if authenticated, None otherwise
     """
-    if hasattr(g, '_current_user'):
-        return g._current_user
+    user = g.get('_current_user', _UNRESOLVED)
+    if user is not _UNRESOLVED:
+        return user
 
     g._current_user = None
     g._current_session = None
 
+    # Anonymous requests usually send no cookies at all, or none of ours;
+    # check the raw header so they skip cookie parsing entirely
+    cookie_header = request.environ.get('HTTP_COOKIE')
+    if not cookie_header or _session_cookie_name not in cookie_header:
+        return None
+
     # Get session token from cookie
     token = request.cookies.get(_session_cookie_name)
     if not token:
         return None
 
-    db = get_auth_db()
-    session_repo = SessionRepository(db)
-    user_repo = UserRepository(db)
+    cache_key = _session_cache_key(token)
+    now = time.monotonic()
+    with _session_cache_lock:
+        cached = _session_cache.get(cache_key)
+        if cached is not None:
+            if now - cached[0] < SESSION_CACHE_TTL:
+                _session_cache.move_to_end(cache_key)
+            else:
+                del _session_cache[cache_key]
+                cached = None
+    if cached is not None:
+        # Copies, so a handler changing its user can't leak into other requests
+        g._current_user = copy.copy(cached[1])
+        g._current_session = copy.copy(cached[2])
+        return g._current_user
 
-    # Look up session
-    session = session_repo.get_by_token(token)
-    if session is None:
-        return None
+    db = get_auth_db()
 
-    # Check if session is stale (30 minute grace period)
-    if session.is_stale(grace_minutes=30):
-        session.invalidate(db)
+    # Look up session and its user together; stale sessions (30 minute
+    # grace period) are removed by the lookup and come back as None
+    found = SessionRepository(db).get_with_user(token, grace_minutes=30)
+    if found is None:
         return None
+    session, user = found
 
-    # Get user
-    user = user_repo.get_by_id(session.user_id)
     if user is None:
         session.invalidate(db)
         return None
 
-    # Update last seen
-    session.touch(db)
+    # Update last seen, unless it was recorded moments ago. A value in the
+    # future (a UTC default read as local time) is always rewritten.
+    last_seen = session.last_seen
+    if last_seen is None or not (
+        timedelta(0) <= datetime.now() - last_seen < SESSION_TOUCH_INTERVAL
+    ):
+        session.touch(db)
+
+    with _session_cache_lock:
+        _session_cache[cache_key] = (now, copy.copy(user), copy.copy(session))
+        if len(_session_cache) > SESSION_CACHE_MAX:
+            _session_cache.popitem(last=False)
 
     g._current_user = user
     g._current_session = session
@@ -165,10 +303,12 @@ def get_current_user() -> Optional[User]:
 
 
 def get_current_session() -> Optional[Session]:
-    """Get the current session (call get_current_user first)."""
-    if not hasattr(g, '_current_session'):
+    """Get the current session, resolving the current user if needed."""
+    session = g.get('_current_session', _UNRESOLVED)
+    if session is _UNRESOLVED:
         get_current_user()
-    return g._current_session
+        session = g._current_session
+    return session
 
 
 def login_required(f: Callable) -> Callable:
@@ -203,6 +343,9 @@ def admin_required(f: Callable) -> Callable:
     return decorated
 
 
+LOCALHOST_ADDRESSES = frozenset(("127.0.0.1", "::1", "localhost"))
+
+
 def localhost_only(f: Callable) -> Callable:
     """
     Decorator to restrict endpoint to localhost access only.
@@ -212,20 +355,38 @@ def localhost_only(f: Callable) -> Callable:
     @wraps(f)
     def decorated(*args: Any, **kwargs: Any) -> Any:
         # Check if request is from localhost
-        remote_addr = request.remote_addr
-        if remote_addr not in ('127.0.0.1', '::1', 'localhost'):
-            # Also check X-Forwarded-For if behind proxy
-            forwarded = request.headers.get('X-Forwarded-For', '')
-            if forwarded:
-                # Take the first address (client IP)
-                remote_addr = forwarded.split(',')[0].strip()
-
-            if remote_addr not in ('127.0.0.1', '::1', 'localhost'):
-                return jsonify({"error": "Access denied"}), 404  # Return 404 to hide existence
-        return f(*args, **kwargs)
+        if request.remote_addr in LOCALHOST_ADDRESSES:
+            return f(*args, **kwargs)
+
+        # Also check X-Forwarded-For if behind proxy
+        forwarded = request.headers.get('X-Forwarded-For')
+        # Take the first address (client IP)
+        if forwarded and forwarded.partition(',')[0].strip() in LOCALHOST_ADDRESSES:
+            return f(*args, **kwargs)
+        return jsonify({"error": "Access denied"}), 404  # Return 404 to hide existence
     return decorated
 
 
+# Wrappers made by the *_if_enabled decorators below. They only pass through
+# when auth is disabled, so single-user apps can call what they wrap directly.
+# Tracked by identity: functools.wraps would copy a marker attribute onto
+# any decorator stacked on top (e.g. localhost_only).
+_optional_auth_wrappers: set[Callable] = set()
+
+
+def strip_optional_auth(flask_app: Flask) -> None:
+    """
+    Route a single-user app's views straight to their undecorated functions.
+
+    Every app has its own view_functions, so apps with auth enabled keep
+    the checks. Views with another decorator outermost are left alone.
+    """
+    for endpoint, view in flask_app.view_functions.items():
+        while view in _optional_auth_wrappers:
+            view = view.__wrapped__  # type: ignore[attr-defined]
+        flask_app.view_functions[endpoint] = view
+
+
 def auth_if_enabled(f: Callable) -> Callable:
     """
     Decorator to require authentication only if auth is enabled.
@@ -245,6 +406,7 @@ def auth_if_enabled(f: Callable) -> Callable:
         if user is None:
             return jsonify({"error": "Authentication required"}), 401
         return f(*args, **kwargs)
+    _optional_auth_wrappers.add(decorated)
     return decorated
 
 
@@ -267,6 +429,7 @@ def download_permission_required(f: Callable) -> Callable:
         if not user.can_download:
             return jsonify({"error": "Download permission required"}), 403
         return f(*args, **kwargs)
+    _optional_auth_wrappers.add(decorated)
     return decorated
 
 
@@ -289,9 +452,28 @@ def admin_if_enabled(f: Callable) -> Callable:
         if not user.is_admin:
             return jsonify({"error": "Admin privileges required"}), 403
         return f(*args, **kwargs)
+    _optional_auth_wrappers.add(decorated)
     return decorated
 
 
+# Accepted recovery/invitation email addresses
+_EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# Characters never allowed in a username: angle brackets (HTML) and backslash
+_USERNAME_FORBIDDEN = frozenset('<>\\')
+
+
+def _valid_username_chars(name: str) -> bool:
+    """Check name is ASCII printable (32-126) without <, > or backslash."""
+    # str methods scan in C; for ASCII, isprintable() is exactly 32-126
+    return name.isascii() and name.isprintable() and _USERNAME_FORBIDDEN.isdisjoint(name)
+
+
+# Throwaway TOTP secret checked for unknown usernames, so a failed login
+# costs the same whether or not the user exists
+_DUMMY_TOTP_SECRET = secrets.token_bytes(20)
+
+
 # Session duration constants
 SESSION_DURATION_DEFAULT = None  # Session cookie (cleared on browser close)
 SESSION_DURATION_REMEMBER = 365 * 24 * 60 * 60  # 1 year in seconds (effectively permanent)
@@ -300,21 +482,17 @@ SESSION_DURATION_REMEMBER = 365 * 24 * 60 * 60  # 1 year in seconds (effectively
 def set_session_cookie(response: Response, token: str, remember_me: bool = False) -> Response:
     """Set the session cookie on a response."""
     max_age = SESSION_DURATION_REMEMBER if remember_me else SESSION_DURATION_DEFAULT
-    response.set_cookie(
-        _session_cookie_name,
-        token,
-        httponly=_session_cookie_httponly,
-        secure=_session_cookie_secure,
-        samesite=_session_cookie_samesite,
-        max_age=max_age,
-        path="/",
-    )
+    # Tokens are URL-safe base64, so the value needs no quoting
+    cookie = f"{_session_cookie_name}={token}{_session_cookie_attrs}"
+    if max_age is not None:
+        cookie += f"; Max-Age={max_age}"
+    response.headers.add("Set-Cookie", cookie)
     return response
 
 
 def clear_session_cookie(response: Response) -> Response:
     """Clear the session cookie."""
-    response.delete_cookie(_session_cookie_name, path="/")
+    response.headers.add("Set-Cookie", _session_cookie_clear)
     return response
 
 
@@ -339,7 +517,7 @@ def login():
         400: {"error": "Missing username or code"}
         401: {"error": "Invalid credentials"}
     """
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
         return jsonify({"error": "Request body required"}), 400
 
@@ -355,28 +533,27 @@ def login():
 
     # Find user
     user = user_repo.get_by_username(username)
-    if user is None:
-        # Don't reveal if user exists
-        return jsonify({"error": "Invalid credentials"}), 401
 
-    # Verify TOTP code
-    if user.auth_type == AuthType.TOTP:
-        if not verify_totp(user.auth_credential, code):
+    # Verify TOTP code; unknown users are checked against a dummy secret
+    # so the response time doesn't reveal whether the user exists
+    if user is None or user.auth_type == AuthType.TOTP:
+        secret = user.auth_credential if user is not None else _DUMMY_TOTP_SECRET
+        if not verify_totp(secret, code) or user is None:
             return jsonify({"error": "Invalid credentials"}), 401
     else:
         # Passkey/FIDO2 not implemented yet
         return jsonify({"error": "Authentication method not supported"}), 400
 
-    # Create session (invalidates any existing session)
-    session, token = Session.create_for_user(
-        db,
-        user.id,
-        user_agent=request.headers.get("User-Agent"),
-        ip_address=request.remote_addr,
-    )
-
-    # Update last login
-    user.update_last_login(db)
+    # Create session (invalidates any existing session) and update last
+    # login, committed together
+    with db.connection():
+        session, token = Session.create_for_user(
+            db,
+            user.id,
+            user_agent=request.headers.get("User-Agent"),
+            ip_address=request.remote_addr,
+        )
+        user.update_last_login(db)
 
     # Build response
     response = jsonify({
@@ -468,9 +645,8 @@ def update_current_user():
         400: {"error": "..."}
         409: {"error": "Username already taken"}
     """
-    import re
     user = get_current_user()
-    data = request.get_json() or {}
+    data = request.get_json(silent=True) or {}
     db = get_auth_db()
     user_repo = UserRepository(db)
 
@@ -482,7 +658,7 @@ def update_current_user():
         if len(new_username) > 32:
             return jsonify({"error": "Username must be at most 32 characters"}), 400
         # Allow ASCII printable (32-126) except angle brackets (HTML) and backslash
-        if not all(32 <= ord(c) <= 126 and c not in '<>\\' for c in new_username):
+        if not _valid_username_chars(new_username):
             return jsonify({"error": "Username contains invalid characters"}), 400
         # No leading/trailing whitespace
         if new_username != new_username.strip():
@@ -496,8 +672,7 @@ def update_current_user():
         new_email = data.get("email")
         if new_email is not None and new_email != "":
             # Validate email format
-            email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-            if not re.match(email_pattern, new_email):
+            if not _EMAIL_PATTERN.match(new_email):
                 return jsonify({"error": "Invalid email format"}), 400
         else:
             new_email = None  # Remove email
@@ -558,7 +733,7 @@ def start_registration():
         200: {"success": true, "claim_token": "...", "message": "..."}
         400: {"error": "..."}
     """
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
         return jsonify({"error": "Request body required"}), 400
 
@@ -571,16 +746,15 @@ def start_registration():
     if len(username) > 16:
         return jsonify({"error": "Username must be at most 16 characters"}), 400
     # Allow ASCII printable (32-126) except angle brackets (HTML) and backslash
-    if not all(32 <= ord(c) <= 126 and c not in '<>\\' for c in username):
+    if not _valid_username_chars(username):
         return jsonify({"error": "Username contains invalid characters"}), 400
     # No leading/trailing whitespace
     if username != username.strip():
         return jsonify({"error": "Username cannot have leading or trailing spaces"}), 400
 
     # Basic email validation if provided
-    if contact_email:
-        if "@" not in contact_email or "." not in contact_email:
-            return jsonify({"error": "Invalid email address format"}), 400
+    if contact_email and not _EMAIL_PATTERN.match(contact_email):
+        return jsonify({"error": "Invalid email address format"}), 400
 
     db = get_auth_db()
     user_repo = UserRepository(db)
@@ -600,8 +774,6 @@ def start_registration():
 
     # First-user-is-admin bootstrap: if no users exist, auto-approve as admin
     if user_repo.count() == 0:
-        import base64
-
         # Create the first user as admin directly
         totp_secret, totp_base32, totp_uri = setup_totp(username)
         new_user = User(
@@ -620,7 +792,7 @@ def start_registration():
 
         # Generate QR code (convert base32 string back to bytes)
         qr_png = generate_qr_code(base32_to_secret(totp_base32), username)
-        qr_base64 = base64.b64encode(qr_png).decode('ascii')
+        qr_base64 = binascii.b2a_base64(qr_png, newline=False).decode('ascii')
 
         return jsonify({
             "success": True,
@@ -683,7 +855,7 @@ def validate_claim_token():
         400: {"valid": false, "status": "pending|denied|already_claimed", "error": "..."}
         404: {"valid": false, "error": "Invalid username or claim token"}
     """
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
         return jsonify({"error": "Request body required"}), 400
 
@@ -767,9 +939,8 @@ def claim_credentials():
         400: {"error": "..."} - Invalid token or already claimed
         404: {"error": "..."} - Request not found
     """
-    import base64
 
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
         return jsonify({"error": "Request body required"}), 400
 
@@ -831,14 +1002,17 @@ def claim_credentials():
         recovery_phone=recovery_phone,
         recovery_enabled=recovery_enabled,
     )
-    new_user.save(db)
+    # Create the user, its backup codes and mark the request claimed in
+    # one transaction
+    with db.connection():
+        new_user.save(db)
 
-    # Generate backup codes
-    backup_repo = BackupCodeRepository(db)
-    backup_codes = backup_repo.create_codes_for_user(new_user.id)
+        # Generate backup codes
+        backup_repo = BackupCodeRepository(db)
+        backup_codes = backup_repo.create_codes_for_user(new_user.id)
 
-    # Mark as claimed
-    request_repo.mark_credentials_claimed(access_req.id)
+        # Mark as claimed
+        request_repo.mark_credentials_claimed(access_req.id)
 
     # Generate QR code (optional - gracefully degrade if qrcode not installed)
     response_data = {
@@ -860,7 +1034,7 @@ def claim_credentials():
 
     try:
         qr_png = generate_qr_code(base32_to_secret(totp_base32), username)
-        response_data["totp_qr"] = base64.b64encode(qr_png).decode('ascii')
+        response_data["totp_qr"] = binascii.b2a_base64(qr_png, newline=False).decode('ascii')
     except ImportError:
         pass  # QR code generation unavailable; user can enter secret manually
 
@@ -886,9 +1060,8 @@ def claim_webauthn_begin():
         }
         400: {"error": "..."}
     """
-    from webauthn.helpers import bytes_to_base64url
 
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
         return jsonify({"error": "Request body required"}), 400
 
@@ -967,10 +1140,8 @@ def claim_webauthn_complete():
         }
         400: {"error": "..."}
     """
-    from webauthn.helpers import base64url_to_bytes
-    import json
 
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
         return jsonify({"error": "Request body required"}), 400
 
@@ -1019,12 +1190,9 @@ def claim_webauthn_complete():
     except Exception:
         return jsonify({"error": "Invalid challenge format"}), 400
 
-    # Convert credential to JSON string if it's a dict
-    credential_json = json.dumps(credential) if isinstance(credential, dict) else credential
-
     # Verify registration
     webauthn_cred = webauthn_verify_registration(
-        credential_json=credential_json,
+        credential_json=credential,
         expected_challenge=challenge,
         expected_origin=origin,
         expected_rp_id=rp_id,
@@ -1044,23 +1212,26 @@ def claim_webauthn_complete():
         recovery_phone=recovery_phone,
         recovery_enabled=recovery_enabled,
     )
-    new_user.save(db)
+    # Create the user, its backup codes, mark the request claimed and log
+    # the user in, all in one transaction
+    with db.connection():
+        new_user.save(db)
 
-    # Generate backup codes
-    backup_repo = BackupCodeRepository(db)
-    backup_codes = backup_repo.create_codes_for_user(new_user.id)
+        # Generate backup codes
+        backup_repo = BackupCodeRepository(db)
+        backup_codes = backup_repo.create_codes_for_user(new_user.id)
 
-    # Mark as claimed
-    request_repo.mark_credentials_claimed(access_req.id)
+        # Mark as claimed
+        request_repo.mark_credentials_claimed(access_req.id)
 
-    # Create session so user is logged in immediately after claiming
-    session, token = Session.create_for_user(
-        db,
-        new_user.id,
-        user_agent=request.headers.get("User-Agent"),
-        ip_address=request.remote_addr,
-    )
-    new_user.update_last_login(db)
+        # Create session so user is logged in immediately after claiming
+        session, token = Session.create_for_user(
+            db,
+            new_user.id,
+            user_agent=request.headers.get("User-Agent"),
+            ip_address=request.remote_addr,
+        )
+        new_user.update_last_login(db)
 
     # Build response
     response_data = {
@@ -1102,7 +1273,7 @@ def check_request_status():
         200: {"status": "pending|approved|denied", "message": "..."}
         404: {"error": "No request found"}
     """
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
         return jsonify({"error": "Request body required"}), 400
 
@@ -1175,7 +1346,7 @@ def verify_registration():
         }
         400: {"error": "..."}
     """
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
         return jsonify({"error": "Request body required"}), 400
 
@@ -1220,14 +1391,17 @@ def verify_registration():
         recovery_phone=recovery_phone,
         recovery_enabled=recovery_enabled,
     )
-    user.save(db)
+    # Create the user, its backup codes and consume the registration in
+    # one transaction
+    with db.connection():
+        user.save(db)
 
-    # Generate backup codes (always, regardless of recovery settings)
-    backup_repo = BackupCodeRepository(db)
-    backup_codes = backup_repo.create_codes_for_user(user.id)
+        # Generate backup codes (always, regardless of recovery settings)
+        backup_repo = BackupCodeRepository(db)
+        backup_codes = backup_repo.create_codes_for_user(user.id)
 
-    # Consume (delete) the pending registration
-    reg.consume(db)
+        # Consume (delete) the pending registration
+        reg.consume(db)
 
     # Build response
     response_data = {
@@ -1255,9 +1429,8 @@ def verify_registration():
         )
 
     if include_qr:
-        import base64
         qr_png = generate_qr_code(secret, user.username)
-        response_data["totp_qr"] = base64.b64encode(qr_png).decode('ascii')
+        response_data["totp_qr"] = binascii.b2a_base64(qr_png, newline=False).decode('ascii')
 
     return jsonify(response_data)
 
@@ -1267,6 +1440,7 @@ def verify_registration():
 # =============================================================================
 
 
+@lru_cache(maxsize=1)
 def get_webauthn_config() -> tuple[str, str, str]:
     """Get WebAuthn configuration, deriving from deployment config if not explicit.
 
@@ -1274,9 +1448,10 @@ def get_webauthn_config() -> tuple[str, str, str]:
     1. Explicit WEBAUTHN_RP_ID / WEBAUTHN_ORIGIN (env or audiobooks.conf)
     2. Auto-derived from AUDIOBOOKS_HOSTNAME + AUDIOBOOKS_WEB_PORT + AUDIOBOOKS_HTTPS_ENABLED
     3. Fallback to localhost defaults (development)
+
+    The configuration is fixed for the life of the process, so it is
+    worked out once (the hostname fallback may need a DNS lookup).
     """
-    import socket
-    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
     from config import get_config
 
     # Explicit overrides take priority
@@ -1290,7 +1465,7 @@ def get_webauthn_config() -> tuple[str, str, str]:
         # Use "localhost" for loopback, local suffixes, and single-label hostnames
         # (no dots = not a real FQDN, e.g. "myserver" or "test-vm-cachyos")
         is_local = (
-            hostname in ("localhost", "127.0.0.1", "::1")
+            hostname in LOCALHOST_ADDRESSES
             or hostname.endswith((".local", ".localdomain", ".localhost"))
             or "." not in hostname
         )
@@ -1333,9 +1508,8 @@ def register_webauthn_begin():
         }
         400: {"error": "..."}
     """
-    from webauthn.helpers import bytes_to_base64url
 
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
         return jsonify({"error": "Request body required"}), 400
 
@@ -1405,9 +1579,8 @@ def register_webauthn_complete():
         }
         400: {"error": "..."}
     """
-    from webauthn.helpers import base64url_to_bytes
 
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
         return jsonify({"error": "Request body required"}), 400
 
@@ -1448,13 +1621,9 @@ def register_webauthn_complete():
     except Exception:
         return jsonify({"error": "Invalid challenge format"}), 400
 
-    # Convert credential to JSON string if it's a dict
-    import json
-    credential_json = json.dumps(credential) if isinstance(credential, dict) else credential
-
     # Verify registration
     webauthn_cred = webauthn_verify_registration(
-        credential_json=credential_json,
+        credential_json=credential,
         expected_challenge=challenge,
         expected_origin=origin,
         expected_rp_id=rp_id,
@@ -1474,14 +1643,17 @@ def register_webauthn_complete():
         recovery_phone=recovery_phone,
         recovery_enabled=recovery_enabled,
     )
-    user.save(db)
+    # Create the user, its backup codes and consume the registration in
+    # one transaction
+    with db.connection():
+        user.save(db)
 
-    # Generate backup codes
-    backup_repo = BackupCodeRepository(db)
-    backup_codes = backup_repo.create_codes_for_user(user.id)
+        # Generate backup codes
+        backup_repo = BackupCodeRepository(db)
+        backup_codes = backup_repo.create_codes_for_user(user.id)
 
-    # Consume the pending registration
-    reg.consume(db)
+        # Consume the pending registration
+        reg.consume(db)
 
     # Build response
     response_data = {
@@ -1530,9 +1702,8 @@ def login_webauthn_begin():
         }
         400: {"error": "..."} - User not found or not using WebAuthn
     """
-    from webauthn.helpers import bytes_to_base64url
 
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
         return jsonify({"error": "Request body required"}), 400
 
@@ -1595,9 +1766,8 @@ def login_webauthn_complete():
         200: {"success": true, "user": {...}}
         401: {"error": "Invalid credentials"}
     """
-    from webauthn.helpers import base64url_to_bytes
 
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
         return jsonify({"error": "Request body required"}), 400
 
@@ -1635,13 +1805,9 @@ def login_webauthn_complete():
     # Get WebAuthn configuration
     rp_id, _, origin = get_webauthn_config()
 
-    # Convert credential to JSON string if it's a dict
-    import json
-    credential_json = json.dumps(credential) if isinstance(credential, dict) else credential
-
     # Verify authentication
     new_sign_count = webauthn_verify_authentication(
-        credential_json=credential_json,
+        credential_json=credential,
         expected_challenge=challenge,
         credential_public_key=webauthn_cred.public_key,
         credential_current_sign_count=webauthn_cred.sign_count,
@@ -1652,21 +1818,22 @@ def login_webauthn_complete():
     if new_sign_count is None:
         return jsonify({"error": "Invalid credentials"}), 401
 
-    # Update sign count in stored credential
+    # Update sign count in stored credential, and last login with it
     webauthn_cred.sign_count = new_sign_count
     user.auth_credential = webauthn_cred.to_json().encode("utf-8")
-    user.save(db)
+    user.last_login = datetime.now()
 
-    # Create session
-    session, token = Session.create_for_user(
-        db,
-        user.id,
-        user_agent=request.headers.get("User-Agent"),
-        ip_address=request.remote_addr,
-    )
+    # One UPDATE for the user and one commit for it and the new session
+    with db.connection():
+        user.save(db)
 
-    # Update last login
-    user.update_last_login(db)
+        # Create session
+        session, token = Session.create_for_user(
+            db,
+            user.id,
+            user_agent=request.headers.get("User-Agent"),
+            ip_address=request.remote_addr,
+        )
 
     # Build response
     response = jsonify({
@@ -1696,7 +1863,7 @@ def get_auth_type():
         200: {"auth_type": "totp" | "passkey" | "fido2"}
         404: {"error": "User not found"}
     """
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
         return jsonify({"error": "Request body required"}), 400
 
@@ -1704,16 +1871,29 @@ def get_auth_type():
     if not username:
         return jsonify({"error": "Username required"}), 400
 
+    now = time.monotonic()
+    with _auth_type_cache_lock:
+        cached = _auth_type_cache.get(username)
+        if cached is not None:
+            if now - cached[0] < AUTH_TYPE_CACHE_TTL:
+                _auth_type_cache.move_to_end(username)
+                return jsonify({"auth_type": cached[1]})
+            del _auth_type_cache[username]
+
     db = get_auth_db()
     user_repo = UserRepository(db)
 
     user = user_repo.get_by_username(username)
-    if user is None:
-        # Don't reveal if user exists - return generic auth type
-        # This prevents username enumeration
-        return jsonify({"auth_type": "totp"}), 200
+    # Don't reveal if user exists - unknown users get the generic auth type
+    # This prevents username enumeration
+    auth_type = AuthType.TOTP.value if user is None else user.auth_type.value
+
+    with _auth_type_cache_lock:
+        _auth_type_cache[username] = (now, auth_type)
+        if len(_auth_type_cache) > AUTH_TYPE_CACHE_MAX:
+            _auth_type_cache.popitem(last=False)
 
-    return jsonify({"auth_type": user.auth_type.value})
+    return jsonify({"auth_type": auth_type})
 
 
 # =============================================================================
@@ -1748,7 +1928,7 @@ def recover_with_backup_code():
         400: {"error": "..."} - Missing fields
         401: {"error": "..."} - Invalid code
     """
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
         return jsonify({"error": "Request body required"}), 400
 
@@ -1764,11 +1944,12 @@ def recover_with_backup_code():
 
     # Find user (don't reveal if user exists)
     user = user_repo.get_by_username(username)
-    if user is None:
-        return jsonify({"error": "Invalid username or backup code"}), 401
 
-    # Verify and consume backup code
-    if not backup_repo.verify_and_consume(user.id, backup_code):
+    # Verify and consume backup code; unknown users run the same hash and
+    # lookup against user id 0 (never assigned) so the response time
+    # doesn't reveal whether the user exists
+    user_id = user.id if user is not None else 0
+    if not backup_repo.verify_and_consume(user_id, backup_code) or user is None:
         return jsonify({"error": "Invalid username or backup code"}), 401
 
     # Check remaining codes before we replace them
@@ -1879,7 +2060,7 @@ def update_recovery_contact():
     Returns:
         200: {"success": true, "recovery_enabled": bool}
     """
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
         return jsonify({"error": "Request body required"}), 400
 
@@ -1935,7 +2116,7 @@ def request_magic_link():
     even if the username doesn't exist or has no recovery email. The message
     is intentionally vague.
     """
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
         return jsonify({"error": "Request body required"}), 400
 
@@ -1969,28 +2150,28 @@ def request_magic_link():
 
     # Send email with magic link
     magic_link_url = f"/verify.html?token={raw_token}"
+    to_email, username, user_id = user.recovery_email, user.username, user.id
 
-    # Attempt to send email
-    email_sent = _send_magic_link_email(
-        to_email=user.recovery_email,
-        username=user.username,
-        magic_link=magic_link_url,
-        expires_minutes=15
-    )
+    def send_magic_link() -> None:
+        email_sent = _send_magic_link_email(
+            to_email=to_email,
+            username=username,
+            magic_link=magic_link_url,
+            expires_minutes=15
+        )
+        if not email_sent:
+            # Email failed, but the response is success either way for
+            # privacy; log the error internally
+            current_app.logger.error(f"Failed to send magic link email to user {user_id}")
 
-    if email_sent:
-        return jsonify({
-            "success": True,
-            "message": generic_message
-        })
-    else:
-        # Email failed, but still return success for privacy
-        # Log the error internally
-        current_app.logger.error(f"Failed to send magic link email to user {user.id}")
-        return jsonify({
-            "success": True,
-            "message": generic_message
-        })
+    # The response doesn't depend on the send, so don't wait on SMTP
+    # (this also keeps the timing the same for users without email)
+    _run_in_background(send_magic_link)
+
+    return jsonify({
+        "success": True,
+        "message": generic_message
+    })
 
 
 @auth_bp.route("/magic-link/verify", methods=["POST"])
@@ -2007,7 +2188,7 @@ def verify_magic_link():
         200: {"success": true, "message": "..."}
         400: {"error": "..."}
     """
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
         return jsonify({"error": "Request body required"}), 400
 
@@ -2015,6 +2196,10 @@ def verify_magic_link():
     if not token:
         return jsonify({"error": "Token is required"}), 400
 
+    # A token of the wrong length can't match; skip the hash and lookup
+    if len(token) != VERIFICATION_TOKEN_LENGTH:
+        return jsonify({"error": "Invalid or expired token"}), 400
+
     db = get_auth_db()
     recovery_repo = PendingRecoveryRepository(db)
 
@@ -2035,21 +2220,16 @@ def verify_magic_link():
     if user is None:
         return jsonify({"error": "User not found"}), 400
 
-    # Mark recovery as used
-    recovery.mark_used(db)
-
-    # Create a new session
-    session_repo = SessionRepository(db)
-    session_repo.invalidate_user_sessions(user.id)  # Single session enforcement
-
     user_agent = request.headers.get("User-Agent", "")
     ip_address = request.remote_addr or ""
-
-    session, raw_token = Session.create_for_user(db, user.id, user_agent, ip_address)
-
-    # Update last login
     user.last_login = datetime.now()
-    user.save(db)
+
+    # Consume the link, replace any existing session (single session
+    # enforcement) and record the login in one transaction
+    with db.connection():
+        recovery.mark_used(db)
+        session, raw_token = Session.create_for_user(db, user.id, user_agent, ip_address)
+        user.save(db)
 
     # Set session cookie
     response = jsonify({
@@ -2058,16 +2238,138 @@ def verify_magic_link():
         "username": user.username,
     })
 
-    response.set_cookie(
-        _session_cookie_name,
-        raw_token,
-        httponly=_session_cookie_httponly,
-        secure=_session_cookie_secure,
-        samesite=_session_cookie_samesite,
-        max_age=60 * 60 * 24 * 365,  # 1 year
+    return set_session_cookie(response, raw_token, remember_me=True)  # 1 year
+
+
+@dataclass(frozen=True, slots=True)
+class SmtpConfig:
+    """Outgoing email settings, from the SMTP_* environment variables."""
+
+    host: str
+    port: int
+    user: str
+    password: str
+    sender: str
+    admin_email: str
+    base_url: str
+
+
+@lru_cache(maxsize=1)
+def _smtp_config() -> SmtpConfig:
+    """Read the email settings once; the environment doesn't change at runtime."""
+    sender = os.environ.get("SMTP_FROM", "library@thebosco.club")
+    return SmtpConfig(
+        host=os.environ.get("SMTP_HOST", "localhost"),
+        port=int(os.environ.get("SMTP_PORT", "25")),
+        user=os.environ.get("SMTP_USER", ""),
+        password=os.environ.get("SMTP_PASS", ""),
+        sender=sender,
+        admin_email=os.environ.get("ADMIN_EMAIL", sender),
+        base_url=os.environ.get("BASE_URL", "https://audiobooks.thebosco.club"),
     )
 
-    return response
+
+# Workers for fire-and-forget sends; a fixed pool, so a burst of requests
+# on the unauthenticated magic-link endpoint queues instead of spawning
+# a thread (and SMTP connection) per request
+BACKGROUND_WORKERS = 4
+_background_executor = ThreadPoolExecutor(
+    max_workers=BACKGROUND_WORKERS, thread_name_prefix="auth-background"
+)
+
+
+def _run_in_background(task: Callable[[], Any]) -> None:
+    """
+    Run a fire-and-forget task (e.g. an email send) off the request thread.
+
+    The task runs inside the app context on a small shared worker pool.
+    In dev mode it runs inline, so its effects are visible as soon as the
+    request returns.
+    """
+    app = current_app._get_current_object()  # type: ignore[attr-defined]
+    if app.config.get("AUTH_DEV_MODE"):
+        task()
+        return
+
+    def run() -> None:
+        with app.app_context():
+            try:
+                task()
+            except Exception:
+                app.logger.exception("Background auth task failed")
+
+    _background_executor.submit(run)
+
+
+# Messages are rendered straight to CRLF-terminated bytes, which sendmail()
+# passes through as-is, instead of to a str it re-encodes and re-terminates
+_SMTP_POLICY = compat32.clone(linesep="\r\n")
+
+# Idle SMTP connections, one LIFO stack per server/login; a send reuses a
+# connection that has already done STARTTLS and AUTH instead of paying for
+# the handshakes again. At most one connection per background worker is kept.
+_smtp_pool: dict[tuple[str, int, str, bool], "queue.LifoQueue[smtplib.SMTP]"] = {}
+_smtp_pool_lock = threading.Lock()
+
+
+def _close_smtp(server: smtplib.SMTP) -> None:
+    """Close an SMTP connection, ignoring errors from a dead peer."""
+    try:
+        server.quit()
+    except (smtplib.SMTPException, OSError):
+        server.close()
+
+
+@contextmanager
+def _borrow_smtp(smtp: SmtpConfig, starttls: bool) -> Iterator[smtplib.SMTP]:
+    """
+    Borrow a ready-to-send SMTP connection from the pool.
+
+    Reused connections are checked with a NOOP first, since servers drop
+    idle sessions. A new connection runs STARTTLS when asked and logs in
+    when credentials are set. The connection goes back to the pool if the
+    block succeeds and is closed if it raises.
+    """
+    key = (smtp.host, smtp.port, smtp.user, starttls)
+    with _smtp_pool_lock:
+        pool = _smtp_pool.get(key)
+        if pool is None:
+            pool = _smtp_pool[key] = queue.LifoQueue(maxsize=BACKGROUND_WORKERS)
+
+    server: Optional[smtplib.SMTP] = None
+    while server is None:
+        try:
+            server = pool.get_nowait()
+        except queue.Empty:
+            break
+        try:
+            if server.noop()[0] != 250:
+                raise smtplib.SMTPServerDisconnected("NOOP refused")
+        except (smtplib.SMTPException, OSError):
+            server.close()
+            server = None
+
+    if server is None:
+        server = smtplib.SMTP(smtp.host, smtp.port)
+        try:
+            if starttls:
+                server.starttls()
+            if smtp.user and smtp.password:
+                server.login(smtp.user, smtp.password)
+        except BaseException:
+            server.close()
+            raise
+
+    try:
+        yield server
+    except BaseException:
+        server.close()
+        raise
+
+    try:
+        pool.put_nowait(server)
+    except queue.Full:
+        _close_smtp(server)
 
 
 def _send_magic_link_email(
@@ -2081,19 +2383,10 @@ def _send_magic_link_email(
 
     Returns True if email was sent successfully, False otherwise.
     """
-    import smtplib
-    from email.mime.text import MIMEText
-    from email.mime.multipart import MIMEMultipart
-
     # Email configuration - read from environment or config
-    smtp_host = os.environ.get("SMTP_HOST", "localhost")
-    smtp_port = int(os.environ.get("SMTP_PORT", "25"))
-    smtp_user = os.environ.get("SMTP_USER", "")
-    smtp_pass = os.environ.get("SMTP_PASS", "")
-    from_email = os.environ.get("SMTP_FROM", "library@thebosco.club")
-    base_url = os.environ.get("BASE_URL", "https://audiobooks.thebosco.club")
+    smtp = _smtp_config()
 
-    full_link = f"{base_url}{magic_link}"
+    full_link = f"{smtp.base_url}{magic_link}"
 
     subject = "Sign In to The Library"
     html_content = f"""
@@ -2162,17 +2455,14 @@ If you didn't request this link, you can safely ignore this email.
     try:
         msg = MIMEMultipart("alternative")
         msg["Subject"] = subject
-        msg["From"] = from_email
+        msg["From"] = smtp.sender
         msg["To"] = to_email
 
         msg.attach(MIMEText(text_content, "plain"))
         msg.attach(MIMEText(html_content, "html"))
 
-        with smtplib.SMTP(smtp_host, smtp_port) as server:
-            if smtp_user and smtp_pass:
-                server.starttls()
-                server.login(smtp_user, smtp_pass)
-            server.sendmail(from_email, to_email, msg.as_string())
+        with _borrow_smtp(smtp, starttls=bool(smtp.user and smtp.password)) as server:
+            server.sendmail(smtp.sender, to_email, msg.as_bytes(policy=_SMTP_POLICY))
 
         return True
 
@@ -2192,14 +2482,9 @@ def _send_approval_email(to_email: str, username: str) -> bool:
     Returns True if email was sent successfully, False otherwise.
     """
     # Email configuration
-    smtp_host = os.environ.get("SMTP_HOST", "localhost")
-    smtp_port = int(os.environ.get("SMTP_PORT", "25"))
-    smtp_user = os.environ.get("SMTP_USER", "")
-    smtp_pass = os.environ.get("SMTP_PASS", "")
-    from_email = os.environ.get("SMTP_FROM", "library@thebosco.club")
-    base_url = os.environ.get("BASE_URL", "https://audiobooks.thebosco.club")
+    smtp = _smtp_config()
 
-    claim_url = f"{base_url}/claim.html"
+    claim_url = f"{smtp.base_url}/claim.html"
 
     subject = "Your Access to The Library Has Been Approved!"
 
@@ -2336,17 +2621,14 @@ Can't find your claim token? Contact the administrator.
     try:
         msg = MIMEMultipart("alternative")
         msg["Subject"] = subject
-        msg["From"] = from_email
+        msg["From"] = smtp.sender
         msg["To"] = to_email
 
         msg.attach(MIMEText(text_content, "plain"))
         msg.attach(MIMEText(html_content, "html"))
 
-        with smtplib.SMTP(smtp_host, smtp_port) as server:
-            if smtp_user and smtp_pass:
-                server.starttls()
-                server.login(smtp_user, smtp_pass)
-            server.sendmail(from_email, to_email, msg.as_string())
+        with _borrow_smtp(smtp, starttls=bool(smtp.user and smtp.password)) as server:
+            server.sendmail(smtp.sender, to_email, msg.as_bytes(policy=_SMTP_POLICY))
 
         return True
 
@@ -2361,11 +2643,7 @@ def _send_denial_email(to_email: str, username: str, reason: Optional[str] = Non
 
     Returns True if email was sent successfully, False otherwise.
     """
-    smtp_host = os.environ.get("SMTP_HOST", "localhost")
-    smtp_port = int(os.environ.get("SMTP_PORT", "25"))
-    smtp_user = os.environ.get("SMTP_USER", "")
-    smtp_pass = os.environ.get("SMTP_PASS", "")
-    from_email = os.environ.get("SMTP_FROM", "library@thebosco.club")
+    smtp = _smtp_config()
 
     subject = "Update on Your Access Request - The Library"
 
@@ -2422,17 +2700,14 @@ If you believe this was in error, you may submit a new request.
     try:
         msg = MIMEMultipart("alternative")
         msg["Subject"] = subject
-        msg["From"] = from_email
+        msg["From"] = smtp.sender
         msg["To"] = to_email
 
         msg.attach(MIMEText(text_content, "plain"))
         msg.attach(MIMEText(html_content, "html"))
 
-        with smtplib.SMTP(smtp_host, smtp_port) as server:
-            if smtp_user and smtp_pass:
-                server.starttls()
-                server.login(smtp_user, smtp_pass)
-            server.sendmail(from_email, to_email, msg.as_string())
+        with _borrow_smtp(smtp, starttls=bool(smtp.user and smtp.password)) as server:
+            server.sendmail(smtp.sender, to_email, msg.as_bytes(policy=_SMTP_POLICY))
 
         return True
 
@@ -2515,7 +2790,7 @@ def send_contact_message():
         400: {"error": "..."}
     """
     user = get_current_user()
-    data = request.get_json()
+    data = request.get_json(silent=True)
 
     if not data:
         return jsonify({"error": "Request body required"}), 400
@@ -2548,8 +2823,9 @@ def send_contact_message():
     )
     inbox_msg.save(db)
 
-    # Send admin alert email
-    _send_admin_alert(user.username, message[:100])
+    # Send admin alert email (the response doesn't depend on it)
+    username, preview = user.username, message[:100]
+    _run_in_background(lambda: _send_admin_alert(username, preview))
 
     return jsonify({
         "success": True,
@@ -2560,14 +2836,9 @@ def send_contact_message():
 
 def _send_admin_alert(username: str, message_preview: str) -> bool:
     """Send email alert to admin about new contact message."""
-    smtp_host = os.environ.get("SMTP_HOST", "localhost")
-    smtp_port = int(os.environ.get("SMTP_PORT", "25"))
-    smtp_user = os.environ.get("SMTP_USER", "")
-    smtp_pass = os.environ.get("SMTP_PASS", "")
-    smtp_from = os.environ.get("SMTP_FROM", "library@thebosco.club")
-    admin_email = os.environ.get("ADMIN_EMAIL", smtp_from)
-
-    if not smtp_user:
+    smtp = _smtp_config()
+
+    if not smtp.user:
         # SMTP not configured, skip alert
         return False
 
@@ -2582,18 +2853,14 @@ View all messages:
 """
 
     try:
-        msg = MIMEMultipart("alternative")
+        # Plain text only, so no multipart/alternative wrapper is needed
+        msg = MIMEText(body, "plain")
         msg["Subject"] = subject
-        msg["From"] = smtp_from
-        msg["To"] = admin_email
+        msg["From"] = smtp.sender
+        msg["To"] = smtp.admin_email
 
-        msg.attach(MIMEText(body, "plain"))
-
-        with smtplib.SMTP(smtp_host, smtp_port) as server:
-            server.starttls()
-            if smtp_user and smtp_pass:
-                server.login(smtp_user, smtp_pass)
-            server.sendmail(smtp_from, admin_email, msg.as_string())
+        with _borrow_smtp(smtp, starttls=True) as server:
+            server.sendmail(smtp.sender, smtp.admin_email, msg.as_bytes(policy=_SMTP_POLICY))
 
         return True
     except Exception as e:
@@ -2610,16 +2877,24 @@ View all messages:
 @admin_required
 def list_notifications():
     """
-    List all notifications (admin only).
+    List notifications (admin only), newest first.
+
+    Query params:
+        limit: Maximum number to return (default 100, at most 500)
+        offset: Number to skip (default 0)
 
     Returns:
-        200: {"notifications": [...]}
+        200: {"notifications": [...], "total": int}
     """
+    limit = max(0, min(request.args.get("limit", 100, type=int), 500))
+    offset = max(0, request.args.get("offset", 0, type=int))
+
     db = get_auth_db()
     notif_repo = NotificationRepository(db)
-    notifications = notif_repo.list_all()
+    notifications = notif_repo.list_all(limit=limit, offset=offset)
 
     return jsonify({
+        "total": notif_repo.count_all(),
         "notifications": [
             {
                 "id": n.id,
@@ -2638,6 +2913,10 @@ def list_notifications():
     })
 
 
+# Accepted "type" values, straight from the enum so the two can't drift
+_NOTIFICATION_TYPES = {t.value: t for t in NotificationType}
+
+
 @auth_bp.route("/admin/notifications", methods=["POST"])
 @admin_required
 def create_notification():
@@ -2659,7 +2938,7 @@ def create_notification():
         200: {"success": true, "notification_id": int}
         400: {"error": "..."}
     """
-    data = request.get_json()
+    data = request.get_json(silent=True)
 
     if not data:
         return jsonify({"error": "Request body required"}), 400
@@ -2668,12 +2947,12 @@ def create_notification():
     if not message:
         return jsonify({"error": "Message is required"}), 400
 
-    notif_type = data.get("type", "info")
-    if notif_type not in ("info", "maintenance", "outage", "personal"):
+    notif_type = _NOTIFICATION_TYPES.get(str(data.get("type", "info")))
+    if notif_type is None:
         return jsonify({"error": "Invalid notification type"}), 400
 
     # Personal notifications require a target user
-    if notif_type == "personal" and not data.get("target_user_id"):
+    if notif_type is NotificationType.PERSONAL and not data.get("target_user_id"):
         return jsonify({"error": "Personal notifications require target_user_id"}), 400
 
     db = get_auth_db()
@@ -2696,7 +2975,7 @@ def create_notification():
 
     notification = Notification(
         message=message,
-        type=NotificationType(notif_type),
+        type=notif_type,
         target_user_id=data.get("target_user_id"),
         starts_at=starts_at,
         expires_at=expires_at,
@@ -2725,14 +3004,9 @@ def delete_notification(notification_id: int):
     db = get_auth_db()
     notif_repo = NotificationRepository(db)
 
-    # Check if notification exists
-    notifications = notif_repo.list_all()
-    notif = next((n for n in notifications if n.id == notification_id), None)
-
-    if not notif:
+    if not notif_repo.delete(notification_id):
         return jsonify({"error": "Notification not found"}), 404
 
-    notif.delete(db)
     return jsonify({"success": True})
 
 
@@ -2740,27 +3014,34 @@ def delete_notification(notification_id: int):
 @admin_required
 def list_inbox():
     """
-    List inbox messages (admin only).
+    List inbox messages (admin only), newest first.
 
     Query params:
         include_archived: bool (default false)
+        limit: Maximum number to return (default 100, at most 500)
+        offset: Number to skip (default 0)
 
     Returns:
-        200: {"messages": [...], "unread_count": int}
+        200: {"messages": [...], "unread_count": int, "total": int}
     """
     include_archived = request.args.get("include_archived", "false").lower() == "true"
+    limit = max(0, min(request.args.get("limit", 100, type=int), 500))
+    offset = max(0, request.args.get("offset", 0, type=int))
 
     db = get_auth_db()
     inbox_repo = InboxRepository(db)
     user_repo = UserRepository(db)
 
-    messages = inbox_repo.list_all(include_archived=include_archived)
-    unread_count = inbox_repo.count_unread()
+    messages = inbox_repo.list_all(
+        include_archived=include_archived, limit=limit, offset=offset
+    )
+    total, unread_count = inbox_repo.count_all_and_unread(include_archived=include_archived)
 
     # Get usernames for messages
+    users = user_repo.get_by_ids(m.from_user_id for m in messages)
     result = []
     for m in messages:
-        user = user_repo.get_by_id(m.from_user_id)
+        user = users.get(m.from_user_id)
         result.append({
             "id": m.id,
             "from_user_id": m.from_user_id,
@@ -2776,7 +3057,8 @@ def list_inbox():
 
     return jsonify({
         "messages": result,
-        "unread_count": unread_count
+        "unread_count": unread_count,
+        "total": total,
     })
 
 
@@ -2844,7 +3126,7 @@ def reply_to_message(message_id: int):
     if not message:
         return jsonify({"error": "Message not found"}), 404
 
-    data = request.get_json()
+    data = request.get_json(silent=True)
     if not data:
         return jsonify({"error": "Request body required"}), 400
 
@@ -2886,11 +3168,7 @@ def reply_to_message(message_id: int):
 
 def _send_reply_email(to_email: str, username: str, reply_text: str) -> bool:
     """Send email reply to user."""
-    smtp_host = os.environ.get("SMTP_HOST", "localhost")
-    smtp_port = int(os.environ.get("SMTP_PORT", "25"))
-    smtp_user = os.environ.get("SMTP_USER", "")
-    smtp_pass = os.environ.get("SMTP_PASS", "")
-    smtp_from = os.environ.get("SMTP_FROM", "library@thebosco.club")
+    smtp = _smtp_config()
 
     subject = "Reply from The Library"
     body = f"""Hi {username},
@@ -2902,18 +3180,14 @@ This is a reply to your message to The Library.
 """
 
     try:
-        msg = MIMEMultipart("alternative")
+        # Plain text only, so no multipart/alternative wrapper is needed
+        msg = MIMEText(body, "plain")
         msg["Subject"] = subject
-        msg["From"] = smtp_from
+        msg["From"] = smtp.sender
         msg["To"] = to_email
 
-        msg.attach(MIMEText(body, "plain"))
-
-        with smtplib.SMTP(smtp_host, smtp_port) as server:
-            server.starttls()
-            if smtp_user and smtp_pass:
-                server.login(smtp_user, smtp_pass)
-            server.sendmail(smtp_from, to_email, msg.as_string())
+        with _borrow_smtp(smtp, starttls=True) as server:
+            server.sendmail(smtp.sender, to_email, msg.as_bytes(policy=_SMTP_POLICY))
 
         return True
     except Exception as e:
@@ -3059,7 +3333,7 @@ def deny_access_request(request_id: int):
         200: {"success": true, "email_sent": bool}
         404: {"error": "Request not found"}
     """
-    data = request.get_json() or {}
+    data = request.get_json(silent=True) or {}
     reason = data.get("reason")
 
     db = get_auth_db()
@@ -3155,10 +3429,7 @@ def invite_user():
         400: {"error": "..."}
         409: {"error": "Username already taken"}
     """
-    import re
-    import json as json_module
-
-    data = request.get_json() or {}
+    data = request.get_json(silent=True) or {}
 
     username = data.get("username", "").strip()
     email = data.get("email", "").strip()
@@ -3172,7 +3443,7 @@ def invite_user():
     if len(username) > 16:
         return jsonify({"error": "Username must be at most 16 characters"}), 400
     # Allow ASCII printable (32-126) except angle brackets (HTML) and backslash
-    if not all(32 <= ord(c) <= 126 and c not in '<>\\' for c in username):
+    if not _valid_username_chars(username):
         return jsonify({"error": "Username contains invalid characters"}), 400
     # No leading/trailing whitespace
     if username != username.strip():
@@ -3181,8 +3452,7 @@ def invite_user():
     # Validate email (required for invitations)
     if not email:
         return jsonify({"error": "Email is required for invitations"}), 400
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    if not re.match(email_pattern, email):
+    if not _EMAIL_PATTERN.match(email):
         return jsonify({"error": "Invalid email format"}), 400
 
     db = get_auth_db()
@@ -3235,7 +3505,7 @@ def invite_user():
         access_request.id,
         totp_base32,
         totp_uri,
-        json_module.dumps(format_codes_for_display(codes))
+        json.dumps(format_codes_for_display(codes))
     )
 
     # Mark as approved
@@ -3272,14 +3542,9 @@ def _send_invitation_email(to_email: str, username: str, claim_token: str) -> bo
 
     Returns True if email was sent successfully, False otherwise.
     """
-    smtp_host = os.environ.get("SMTP_HOST", "localhost")
-    smtp_port = int(os.environ.get("SMTP_PORT", "25"))
-    smtp_user = os.environ.get("SMTP_USER", "")
-    smtp_pass = os.environ.get("SMTP_PASS", "")
-    from_email = os.environ.get("SMTP_FROM", "library@thebosco.club")
-    base_url = os.environ.get("BASE_URL", "https://audiobooks.thebosco.club")
+    smtp = _smtp_config()
 
-    claim_url = f"{base_url}/claim.html"
+    claim_url = f"{smtp.base_url}/claim.html"
 
     subject = "You've Been Invited to The Library!"
 
@@ -3385,17 +3650,14 @@ HOW TO SET UP YOUR ACCOUNT:
     try:
         msg = MIMEMultipart("alternative")
         msg["Subject"] = subject
-        msg["From"] = from_email
+        msg["From"] = smtp.sender
         msg["To"] = to_email
 
         msg.attach(MIMEText(text_content, "plain"))
         msg.attach(MIMEText(html_content, "html"))
 
-        with smtplib.SMTP(smtp_host, smtp_port) as server:
-            if smtp_user and smtp_pass:
-                server.starttls()
-                server.login(smtp_user, smtp_pass)
-            server.sendmail(from_email, to_email, msg.as_string())
+        with _borrow_smtp(smtp, starttls=bool(smtp.user and smtp.password)) as server:
+            server.sendmail(smtp.sender, to_email, msg.as_bytes(policy=_SMTP_POLICY))
 
         return True
 
@@ -3484,7 +3746,6 @@ def update_user(user_id: int):
         404: {"error": "User not found"}
         409: {"error": "Username already taken"}
     """
-    import re
     db = get_auth_db()
     user_repo = UserRepository(db)
 
@@ -3492,7 +3753,7 @@ def update_user(user_id: int):
     if not target_user:
         return jsonify({"error": "User not found"}), 404
 
-    data = request.get_json() or {}
+    data = request.get_json(silent=True) or {}
 
     new_username = data.get("username")
     if new_username is not None:
@@ -3502,7 +3763,7 @@ def update_user(user_id: int):
         if len(new_username) > 32:
             return jsonify({"error": "Username must be at most 32 characters"}), 400
         # Allow ASCII printable (32-126) except angle brackets (HTML) and backslash
-        if not all(32 <= ord(c) <= 126 and c not in '<>\\' for c in new_username):
+        if not _valid_username_chars(new_username):
             return jsonify({"error": "Username contains invalid characters"}), 400
         # No leading/trailing whitespace
         if new_username != new_username.strip():
@@ -3517,8 +3778,7 @@ def update_user(user_id: int):
         new_email = data.get("email")
         if new_email is not None and new_email != "":
             # Validate email format
-            email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-            if not re.match(email_pattern, new_email):
+            if not _EMAIL_PATTERN.match(new_email):
                 return jsonify({"error": "Invalid email format"}), 400
         else:
             new_email = None  # Remove email
@@ -2,23 +2,145 @@
 Core API utilities - Database connection, CORS, and shared helpers.
 """
 
+import json
 import sqlite3
 from pathlib import Path
-from typing import Union
+from typing import Any, Callable, Iterable, Union
 
 from flask import Response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; the stdlib encoder is used without it
+    orjson = None
 
 # Type alias for Flask route return types
 FlaskResponse = Union[Response, tuple[Response, int], tuple[str, int]]
 
+SCHEMA_PATH = Path(__file__).parent.parent / "schema.sql"
+
+# Separator used by the denormalized *_names columns (see schema.sql)
+NAME_LIST_SEPARATOR = "|||"
+
+# Columns added to audiobooks after the initial schema, with their column
+# definitions as written in schema.sql. schema.sql's triggers and indices
+# reference them, so they must exist before it is replayed.
+AUDIOBOOK_COLUMN_UPGRADES = {
+    "genre_names": "TEXT",
+    "era_names": "TEXT",
+    "topic_names": "TEXT",
+    "supplement_count": "INTEGER DEFAULT 0",
+    "mime_type": """TEXT GENERATED ALWAYS AS (
+        CASE
+            WHEN format = 'opus' OR (format IS NULL AND file_path LIKE '%.opus') THEN 'audio/ogg'
+            WHEN format IN ('m4b', 'm4a')
+                OR (format IS NULL AND (file_path LIKE '%.m4b' OR file_path LIKE '%.m4a')) THEN 'audio/mp4'
+            WHEN format = 'mp3' OR (format IS NULL AND file_path LIKE '%.mp3') THEN 'audio/mpeg'
+            ELSE 'application/octet-stream'
+        END
+    ) VIRTUAL""",
+    "norm_title": """TEXT GENERATED ALWAYS AS (
+        LOWER(TRIM(REPLACE(REPLACE(REPLACE(title, ':', ''), '-', ''), '  ', ' ')))
+    ) VIRTUAL""",
+    "norm_author": "TEXT GENERATED ALWAYS AS (LOWER(TRIM(author))) VIRTUAL",
+    "format_rank": """INTEGER GENERATED ALWAYS AS (
+        CASE format
+            WHEN 'opus' THEN 1
+            WHEN 'm4b' THEN 2
+            WHEN 'm4a' THEN 3
+            WHEN 'mp3' THEN 4
+            ELSE 5
+        END
+    ) VIRTUAL""",
+}
+
+# One-time fill of the denormalized columns for rows that predate them
+_BACKFILL_DENORMALIZED_SQL = """
+    UPDATE audiobooks SET
+        genre_names = (
+            SELECT GROUP_CONCAT(g.name, '|||') FROM audiobook_genres ag
+            JOIN genres g ON ag.genre_id = g.id
+            WHERE ag.audiobook_id = audiobooks.id
+        ),
+        era_names = (
+            SELECT GROUP_CONCAT(e.name, '|||') FROM audiobook_eras ae
+            JOIN eras e ON ae.era_id = e.id
+            WHERE ae.audiobook_id = audiobooks.id
+        ),
+        topic_names = (
+            SELECT GROUP_CONCAT(t.name, '|||') FROM audiobook_topics at
+            JOIN topics t ON at.topic_id = t.id
+            WHERE at.audiobook_id = audiobooks.id
+        ),
+        supplement_count = (
+            SELECT COUNT(*) FROM supplements WHERE audiobook_id = audiobooks.id
+        )
+"""
+
 
 def get_db(db_path: Path) -> sqlite3.Connection:
     """Get database connection with Row factory."""
     conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
+    # NORMAL is only safe in WAL mode, where a power loss can drop the last
+    # commits but not corrupt the database. Databases that ensure_schema()
+    # has not switched yet (created later, or rebuilt by import_to_db.py)
+    # keep the default FULL.
+    if conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal":
+        conn.execute("PRAGMA synchronous = NORMAL")
     return conn
 
 
+def ensure_schema(db_path: Path) -> None:
+    """
+    Bring an existing library database up to date with schema.sql.
+
+    Adds any audiobooks columns introduced since the database was created,
+    then replays schema.sql (every statement is IF NOT EXISTS) so new
+    triggers and indices appear. Newly added columns are backfilled once,
+    and the full-text index is rebuilt once when its triggers are replaced.
+    Databases that don't exist yet are left for import_to_db.py to create.
+    """
+    if not Path(db_path).exists():
+        return
+
+    conn = sqlite3.connect(db_path)
+    try:
+        # table_xinfo (unlike table_info) also lists generated columns
+        columns = {row[1] for row in conn.execute("PRAGMA table_xinfo(audiobooks)")}
+        if not columns:
+            return
+
+        added = [name for name in AUDIOBOOK_COLUMN_UPGRADES if name not in columns]
+        for name in added:
+            conn.execute(
+                f"ALTER TABLE audiobooks ADD COLUMN {name} {AUDIOBOOK_COLUMN_UPGRADES[name]}"
+            )
+
+        # The original FTS triggers left stale tokens behind on every edit and
+        # delete; once they are replaced, rebuild the index from the table
+        fts_triggers = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'trigger' "
+            "AND name IN ('audiobooks_au', 'audiobooks_ad')"
+        ).fetchall()
+        rebuild_fts = any("'delete'" not in sql for (sql,) in fts_triggers)
+
+        conn.executescript(SCHEMA_PATH.read_text())
+        if rebuild_fts:
+            conn.execute("INSERT INTO audiobooks_fts(audiobooks_fts) VALUES ('rebuild')")
+
+        # Readers no longer block behind writers (scans, imports, deletes).
+        # journal_mode is persistent, so this only changes the file once.
+        conn.execute("PRAGMA journal_mode = WAL")
+
+        if {"genre_names", "era_names", "topic_names", "supplement_count"} & set(added):
+            conn.execute(_BACKFILL_DENORMALIZED_SQL)
+        conn.commit()
+    finally:
+        conn.close()
+
+
 def add_cors_headers(response: Response) -> Response:
     """
     Add CORS headers to all responses.
@@ -32,3 +154,56 @@ def add_cors_headers(response: Response) -> Response:
         "Content-Range, Accept-Ranges, Content-Length"
     )
     return response
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Serialize obj to compact JSON bytes, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider that encodes jsonify() responses with orjson.
+
+    Output matches the default provider: keys follow sort_keys, datetimes
+    still go through default() as HTTP dates, and debug responses are
+    indented. Request bodies are parsed with orjson too.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+
+def stream_json_list(
+    key: str, items: Iterable[Any], trailer: Callable[[], dict[str, Any]]
+) -> Response:
+    """
+    Stream {"<key>": [items...], **trailer()} as a chunked JSON response.
+
+    Items are encoded one at a time as they are produced, so the full body
+    is never held in memory. trailer is called after items is exhausted and
+    may report totals gathered while iterating.
+    """
+
+    def generate():
+        yield b"{" + json_dumps(key) + b":["
+        for i, item in enumerate(items):
+            yield (b"," if i else b"") + json_dumps(item)
+        yield b"]"
+        for name, value in trailer().items():
+            yield b"," + json_dumps(name) + b":" + json_dumps(value)
+        yield b"}"
+
+    return Response(generate(), mimetype="application/json")
@@ -2,14 +2,17 @@
 Duplicate detection endpoints - hash-based and title-based duplicate finding.
 """
 
+import json
 import os
+from itertools import groupby
+from operator import itemgetter
 from pathlib import Path
 from typing import Any
 
 from flask import Blueprint, Response, jsonify, request
 
 from .auth import admin_if_enabled, auth_if_enabled
-from .core import FlaskResponse, get_db
+from .core import FlaskResponse, get_db, stream_json_list
 
 duplicates_bp = Blueprint("duplicates", __name__)
 
@@ -56,6 +59,77 @@ def _is_safe_path(filepath: Path, allowed_bases: list[Path]) -> bool:
         return False
 
 
+# Column names per (database, table), so the hash endpoints don't run
+# PRAGMA table_info on every request. Columns are only ever added, so a
+# cached set is refreshed only when it is missing the requested column.
+_columns_cache: dict[tuple[str, str], frozenset[str]] = {}
+
+
+def _has_column(conn, db_path, table: str, column: str) -> bool:
+    """Check whether table has column, using the per-process column cache."""
+    key = (str(db_path), table)
+    columns = _columns_cache.get(key)
+    if columns is None or column not in columns:
+        columns = frozenset(
+            row["name"] for row in conn.execute(f"PRAGMA table_info({table})")
+        )
+        _columns_cache[key] = columns
+    return column in columns
+
+
+# Largest ID list accepted per request, and IDs bound per IN (...) clause
+# (older SQLite builds cap a statement at 999 host parameters)
+MAX_AUDIOBOOK_IDS = 10000
+IN_CHUNK_SIZE = 900
+
+
+def _validate_audiobook_ids(ids) -> str | None:
+    """Return an error message if ids is not a usable list of audiobook IDs."""
+    if not isinstance(ids, list):
+        return "audiobook_ids must be a list"
+    if len(ids) > MAX_AUDIOBOOK_IDS:
+        return f"Too many audiobook IDs (max {MAX_AUDIOBOOK_IDS})"
+    if not all(type(i) is int for i in ids):
+        return "audiobook_ids must be integers"
+    return None
+
+
+def _in_chunks(cursor, sql_fmt: str, values: list, extra: tuple = ()) -> list:
+    """Run sql_fmt once per chunk of values and return all fetched rows.
+
+    sql_fmt contains a single {} where the IN (...) placeholders go; extra
+    parameters are bound ahead of each chunk.
+    """
+    rows = []
+    for i in range(0, len(values), IN_CHUNK_SIZE):
+        chunk = values[i : i + IN_CHUNK_SIZE]
+        cursor.execute(sql_fmt.format(",".join("?" * len(chunk))), (*extra, *chunk))
+        rows.extend(cursor.fetchall())
+    return rows
+
+
+def _page_args() -> tuple[int, int] | None:
+    """Return (page, per_page) if the request asked for a page, else None."""
+    if "page" not in request.args and "per_page" not in request.args:
+        return None
+    page = max(1, int(request.args.get("page", 1)))
+    per_page = min(200, max(1, int(request.args.get("per_page", 50))))
+    return page, per_page
+
+
+def _pagination(page: int, per_page: int, total_count: int) -> dict[str, Any]:
+    """Pagination metadata in the same shape as /api/audiobooks."""
+    total_pages = (total_count + per_page - 1) // per_page
+    return {
+        "page": page,
+        "per_page": per_page,
+        "total_count": total_count,
+        "total_pages": total_pages,
+        "has_next": page < total_pages,
+        "has_prev": page > 1,
+    }
+
+
 def remove_from_indexes(filepath: Path) -> dict:
     """
     Remove a file path from all checksum index files.
@@ -110,10 +184,7 @@ def init_duplicates_routes(db_path):
         cursor = conn.cursor()
 
         # Check if sha256_hash column exists
-        cursor.execute("PRAGMA table_info(audiobooks)")
-        columns = [row["name"] for row in cursor.fetchall()]
-
-        if "sha256_hash" not in columns:
+        if not _has_column(conn, db_path, "audiobooks", "sha256_hash"):
             conn.close()
             return jsonify(
                 {
@@ -125,25 +196,27 @@ def init_duplicates_routes(db_path):
                 }
             )
 
-        cursor.execute("SELECT COUNT(*) as total FROM audiobooks")
-        total = cursor.fetchone()["total"]
-
-        cursor.execute(
-            "SELECT COUNT(*) as count FROM audiobooks WHERE sha256_hash IS NOT NULL"
-        )
-        hashed = cursor.fetchone()["count"]
-
+        # COUNT(sha256_hash) skips NULLs, so one pass gives total and hashed
         cursor.execute(
             """
-            SELECT COUNT(*) as count FROM (
-                SELECT sha256_hash FROM audiobooks
-                WHERE sha256_hash IS NOT NULL
-                GROUP BY sha256_hash
-                HAVING COUNT(*) > 1
-            )
+            SELECT
+                COUNT(*) as total,
+                COUNT(sha256_hash) as hashed,
+                (
+                    SELECT COUNT(*) FROM (
+                        SELECT sha256_hash FROM audiobooks
+                        WHERE sha256_hash IS NOT NULL
+                        GROUP BY sha256_hash
+                        HAVING COUNT(*) > 1
+                    )
+                ) as duplicate_groups
+            FROM audiobooks
         """
         )
-        duplicate_groups = cursor.fetchone()["count"]
+        row = cursor.fetchone()
+        total = row["total"]
+        hashed = row["hashed"]
+        duplicate_groups = row["duplicate_groups"]
 
         conn.close()
 
@@ -161,84 +234,120 @@ def init_duplicates_routes(db_path):
     @duplicates_bp.route("/api/duplicates", methods=["GET"])
     @auth_if_enabled
     def get_duplicates() -> FlaskResponse:
-        """Get all duplicate audiobook groups"""
+        """
+        Get all duplicate audiobook groups.
+
+        Query params (optional; without them every group is returned):
+            page: Page number (default: 1)
+            per_page: Groups per page (default: 50, max: 200)
+        """
+        page_args = _page_args()
         conn = get_db(db_path)
         cursor = conn.cursor()
 
         # Check if sha256_hash column exists
-        cursor.execute("PRAGMA table_info(audiobooks)")
-        columns = [row["name"] for row in cursor.fetchall()]
-
-        if "sha256_hash" not in columns:
+        if not _has_column(conn, db_path, "audiobooks", "sha256_hash"):
             conn.close()
             return (
                 jsonify({"error": "Hash column not found. Run hash generation first."}),
                 400,
             )
 
-        # Get all duplicate groups
-        cursor.execute(
+        page_clause = ""
+        page_params: tuple[int, ...] = ()
+        group_totals: dict[str, Any] = {}
+        if page_args:
+            page, per_page = page_args
+            page_clause = "ORDER BY count DESC, sha256_hash LIMIT ? OFFSET ?"
+            page_params = (per_page, (page - 1) * per_page)
+            # Library-wide totals; MIN(id) makes file_size_mb the keeper's
+            cursor.execute(
+                """
+                SELECT COUNT(*) as groups,
+                       COALESCE(SUM(count - 1), 0) as duplicate_files,
+                       COALESCE(SUM((count - 1) * COALESCE(keeper_mb, 0)), 0)
+                           as wasted_mb
+                FROM (
+                    SELECT COUNT(*) as count, MIN(id), file_size_mb as keeper_mb
+                    FROM audiobooks
+                    WHERE sha256_hash IS NOT NULL
+                    GROUP BY sha256_hash
+                    HAVING count > 1
+                )
             """
-            SELECT sha256_hash, COUNT(*) as count
-            FROM audiobooks
-            WHERE sha256_hash IS NOT NULL
-            GROUP BY sha256_hash
-            HAVING count > 1
-            ORDER BY count DESC
-        """
-        )
-        groups = cursor.fetchall()
+            )
+            group_totals = dict(cursor.fetchone())
 
-        duplicate_groups = []
-        total_wasted_space = 0
+        # Get every file in a duplicate group in one query, largest groups
+        # first and each group's files by ID. Wasted space is the keeper's
+        # (first by ID) size times the number of extra copies.
+        cursor.execute(
+            f"""
+            SELECT a.id, a.title, a.author, a.narrator, a.file_path,
+                   a.file_size_mb, a.format, a.duration_formatted, a.cover_path,
+                   d.sha256_hash, d.count,
+                   (d.count - 1) * COALESCE(FIRST_VALUE(a.file_size_mb) OVER (
+                       PARTITION BY d.sha256_hash ORDER BY a.id
+                   ), 0) as group_wasted_mb
+            FROM audiobooks a
+            JOIN (
+                SELECT sha256_hash, COUNT(*) as count
+                FROM audiobooks
+                WHERE sha256_hash IS NOT NULL
+                GROUP BY sha256_hash
+                HAVING count > 1
+                {page_clause}
+            ) d ON a.sha256_hash = d.sha256_hash
+            ORDER BY d.count DESC, d.sha256_hash, a.id ASC
+        """,
+            page_params,
+        )
+        rows = cursor.fetchall()
 
-        for group in groups:
-            hash_val = group["sha256_hash"]
-            count = group["count"]
+        conn.close()
 
-            # Get all files in this group
-            cursor.execute(
-                """
-                SELECT id, title, author, narrator, file_path, file_size_mb,
-                       format, duration_formatted, cover_path
-                FROM audiobooks
-                WHERE sha256_hash = ?
-                ORDER BY id ASC
-            """,
-                (hash_val,),
-            )
+        totals = {"groups": 0, "wasted_mb": 0, "duplicate_files": 0}
 
-            files = [dict(row) for row in cursor.fetchall()]
+        def hash_groups():
+            for hash_val, group_rows in groupby(rows, key=itemgetter("sha256_hash")):
+                files = [dict(row) for row in group_rows]
+                count = files[0]["count"]
+                wasted = files[0]["group_wasted_mb"]
 
-            # First file (by ID) is the "keeper"
-            for i, f in enumerate(files):
-                f["is_keeper"] = i == 0
-                f["is_duplicate"] = i > 0
+                # First file (by ID) is the "keeper"
+                for i, f in enumerate(files):
+                    del f["sha256_hash"], f["count"], f["group_wasted_mb"]
+                    f["is_keeper"] = i == 0
+                    f["is_duplicate"] = i > 0
 
-            file_size = files[0]["file_size_mb"] if files else 0
-            wasted = file_size * (count - 1)
-            total_wasted_space += wasted
+                totals["groups"] += 1
+                totals["wasted_mb"] += wasted
+                totals["duplicate_files"] += count - 1
 
-            duplicate_groups.append(
-                {
+                yield {
                     "hash": hash_val,
                     "count": count,
-                    "file_size_mb": file_size,
+                    "file_size_mb": files[0]["file_size_mb"],
                     "wasted_mb": round(wasted, 2),
                     "files": files,
                 }
-            )
 
-        conn.close()
-
-        return jsonify(
-            {
-                "duplicate_groups": duplicate_groups,
-                "total_groups": len(duplicate_groups),
-                "total_wasted_mb": round(total_wasted_space, 2),
-                "total_duplicate_files": sum(g["count"] - 1 for g in duplicate_groups),
+        def trailer():
+            if not page_args:
+                return {
+                    "total_groups": totals["groups"],
+                    "total_wasted_mb": round(totals["wasted_mb"], 2),
+                    "total_duplicate_files": totals["duplicate_files"],
+                }
+            return {
+                "total_groups": group_totals["groups"],
+                "total_wasted_mb": round(group_totals["wasted_mb"], 2),
+                "total_duplicate_files": group_totals["duplicate_files"],
+                "pagination": _pagination(*page_args, group_totals["groups"]),
             }
-        )
+
+        # Streamed group by group; totals are appended once all are written
+        return stream_json_list("duplicate_groups", hash_groups(), trailer)
 
     @duplicates_bp.route("/api/duplicates/by-title", methods=["GET"])
     @auth_if_enabled
@@ -251,108 +360,164 @@ def init_duplicates_routes(db_path):
         - Excludes "Audiobook" as a valid author for grouping
         - Groups by title + real author + similar duration (within 10%)
         - Prevents flagging different books with same title as duplicates
+
+        Query params (optional; without them every group is returned):
+            page: Page number (default: 1)
+            per_page: Groups per page (default: 50, max: 200)
         """
+        page_args = _page_args()
         conn = get_db(db_path)
         cursor = conn.cursor()
 
         # Find duplicates by normalized title + real author (excluding "Audiobook")
-        # Also require similar duration to avoid grouping different books
-        cursor.execute(
-            """
-            SELECT
-                LOWER(TRIM(REPLACE(REPLACE(REPLACE(title, ':', ''), '-', ''), '  ', ' '))) as norm_title,
-                LOWER(TRIM(author)) as norm_author,
-                ROUND(duration_hours, 1) as duration_group,
-                COUNT(*) as count
-            FROM audiobooks
-            WHERE title IS NOT NULL
-              AND author IS NOT NULL
-              AND LOWER(TRIM(author)) != 'audiobook'
-              AND LOWER(TRIM(author)) != 'unknown author'
-            GROUP BY norm_title, norm_author, duration_group
-            HAVING count > 1
-            ORDER BY count DESC, norm_title
+        # Also require similar duration to avoid grouping different books.
+        # norm_title/norm_author are indexed generated columns (see schema.sql);
+        # each group picks up its files (including any with "Audiobook" author
+        # that match) in the same query instead of re-scanning the table per group.
+        title_groups_cte = """
+            WITH normalized AS (
+                SELECT id, title, author, narrator, file_path, file_size_mb,
+                       format, duration_formatted, duration_hours, cover_path,
+                       sha256_hash, norm_title, norm_author, format_rank,
+                       ROUND(duration_hours, 1) as duration_group
+                FROM audiobooks
+                WHERE title IS NOT NULL
+                  AND author IS NOT NULL
+                  AND duration_hours IS NOT NULL
+            ),
+            title_groups AS (
+                SELECT norm_title, norm_author, duration_group, COUNT(*) as count
+                FROM normalized
+                WHERE norm_author != 'audiobook'
+                  AND norm_author != 'unknown author'
+                GROUP BY norm_title, norm_author, duration_group
+                HAVING count > 1
+                {page_clause}
+            )
+        """
+        group_join = """
+            FROM title_groups g
+            JOIN normalized n
+              ON n.norm_title = g.norm_title
+             AND n.duration_group = g.duration_group
+             AND (n.norm_author = g.norm_author OR n.norm_author = 'audiobook')
         """
-        )
-        groups = cursor.fetchall()
-
-        duplicate_groups = []
-        total_potential_savings = 0
-
-        for group in groups:
-            norm_title = group["norm_title"]
-            norm_author = group["norm_author"]
-            duration_group = group["duration_group"]
 
-            # Get all files in this group (including any with "Audiobook" author that match)
+        page_clause = ""
+        page_params: tuple[int, ...] = ()
+        group_totals: dict[str, Any] = {}
+        if page_args:
+            page, per_page = page_args
+            page_clause = (
+                "ORDER BY count DESC, norm_title, norm_author, duration_group "
+                "LIMIT ? OFFSET ?"
+            )
+            page_params = (per_page, (page - 1) * per_page)
+            # Library-wide totals, aggregated without fetching any files
             cursor.execute(
-                """
-                SELECT id, title, author, narrator, file_path, file_size_mb,
-                       format, duration_formatted, duration_hours, cover_path, sha256_hash
-                FROM audiobooks
-                WHERE LOWER(TRIM(REPLACE(REPLACE(REPLACE(title, ':', ''), '-', ''), '  ', ' '))) = ?
-                  AND (LOWER(TRIM(author)) = ? OR LOWER(TRIM(author)) = 'audiobook')
-                  AND ROUND(duration_hours, 1) = ?
-                ORDER BY
-                    -- Prefer entries with real author over "Audiobook"
-                    CASE WHEN LOWER(TRIM(author)) = 'audiobook' THEN 1 ELSE 0 END,
-                    CASE format
-                        WHEN 'opus' THEN 1
-                        WHEN 'm4b' THEN 2
-                        WHEN 'm4a' THEN 3
-                        WHEN 'mp3' THEN 4
-                        ELSE 5
-                    END,
-                    file_size_mb DESC,
-                    id ASC
-            """,
-                (norm_title, norm_author, duration_group),
+                title_groups_cte.format(page_clause="")
+                + f"""
+                SELECT COUNT(*) as groups,
+                       COALESCE(SUM(files - 1), 0) as duplicate_files,
+                       COALESCE(SUM(savings_mb), 0) as savings_mb
+                FROM (
+                    SELECT COUNT(*) as files,
+                           COALESCE(SUM(n.file_size_mb) - MAX(n.file_size_mb), 0)
+                               as savings_mb
+                    {group_join}
+                    GROUP BY g.norm_title, g.norm_author, g.duration_group
+                )
+            """
             )
+            group_totals = dict(cursor.fetchone())
 
-            files = [dict(row) for row in cursor.fetchall()]
+        cursor.execute(
+            title_groups_cte.format(page_clause=page_clause)
+            + f"""
+            SELECT
+                n.id, n.title, n.author, n.narrator, n.file_path, n.file_size_mb,
+                n.format, n.duration_formatted, n.duration_hours, n.cover_path,
+                n.sha256_hash,
+                g.norm_title as group_title,
+                g.norm_author as group_author,
+                g.duration_group as group_duration,
+                g.count as group_count,
+                -- Potential savings: everything except the largest file
+                COALESCE(
+                    SUM(n.file_size_mb) OVER group_files
+                    - MAX(n.file_size_mb) OVER group_files,
+                    0
+                ) as group_savings_mb
+            {group_join}
+            WINDOW group_files AS (
+                PARTITION BY g.norm_title, g.norm_author, g.duration_group
+            )
+            ORDER BY
+                g.count DESC, g.norm_title, g.norm_author, g.duration_group,
+                -- Prefer entries with real author over "Audiobook"
+                CASE WHEN n.norm_author = 'audiobook' THEN 1 ELSE 0 END,
+                n.format_rank,
+                n.file_size_mb DESC,
+                n.id ASC
+        """,
+            page_params,
+        )
+        rows = cursor.fetchall()
 
-            if len(files) < 2:
-                continue
+        conn.close()
 
-            # First file (with real author, preferred format) is the "keeper"
-            for i, f in enumerate(files):
-                f["is_keeper"] = i == 0
-                f["is_duplicate"] = i > 0
-
-            # Calculate potential savings (sum of all but the largest file)
-            sizes = sorted([f["file_size_mb"] for f in files], reverse=True)
-            potential_savings = sum(sizes[1:])  # All except the largest
-            total_potential_savings += potential_savings
-
-            # Use the real author (first file has real author due to ORDER BY)
-            display_author = files[0]["author"]
-            if display_author.lower() == "audiobook":
-                # Fallback: find real author from the group
-                for f in files:
-                    if f["author"].lower() != "audiobook":
-                        display_author = f["author"]
-                        break
-
-            duplicate_groups.append(
-                {
+        totals = {"groups": 0, "savings_mb": 0, "duplicate_files": 0}
+
+        def title_groups():
+            group_key = itemgetter("group_title", "group_author", "group_duration")
+            for _, group_rows in groupby(rows, key=group_key):
+                files = [dict(row) for row in group_rows]
+                potential_savings = files[0]["group_savings_mb"]
+
+                # First file (with real author, preferred format) is the "keeper"
+                for i, f in enumerate(files):
+                    del f["group_title"], f["group_author"], f["group_duration"]
+                    del f["group_count"], f["group_savings_mb"]
+                    f["is_keeper"] = i == 0
+                    f["is_duplicate"] = i > 0
+
+                # Use the real author (first file has real author due to ORDER BY)
+                display_author = files[0]["author"]
+                if display_author.lower() == "audiobook":
+                    # Fallback: find real author from the group
+                    for f in files:
+                        if f["author"].lower() != "audiobook":
+                            display_author = f["author"]
+                            break
+
+                totals["groups"] += 1
+                totals["savings_mb"] += potential_savings
+                totals["duplicate_files"] += len(files) - 1
+
+                yield {
                     "title": files[0]["title"],
                     "author": display_author,
                     "count": len(files),
                     "potential_savings_mb": round(potential_savings, 2),
                     "files": files,
                 }
-            )
-
-        conn.close()
 
-        return jsonify(
-            {
-                "duplicate_groups": duplicate_groups,
-                "total_groups": len(duplicate_groups),
-                "total_potential_savings_mb": round(total_potential_savings, 2),
-                "total_duplicate_files": sum(g["count"] - 1 for g in duplicate_groups),
+        def trailer():
+            if not page_args:
+                return {
+                    "total_groups": totals["groups"],
+                    "total_potential_savings_mb": round(totals["savings_mb"], 2),
+                    "total_duplicate_files": totals["duplicate_files"],
+                }
+            return {
+                "total_groups": group_totals["groups"],
+                "total_potential_savings_mb": round(group_totals["savings_mb"], 2),
+                "total_duplicate_files": group_totals["duplicate_files"],
+                "pagination": _pagination(*page_args, group_totals["groups"]),
             }
-        )
+
+        # Streamed group by group; totals are appended once all are written
+        return stream_json_list("duplicate_groups", title_groups(), trailer)
 
     @duplicates_bp.route("/api/duplicates/delete", methods=["POST"])
     @admin_if_enabled
@@ -379,110 +544,80 @@ def init_duplicates_routes(db_path):
         ids_to_delete = data["audiobook_ids"]
         if not ids_to_delete:
             return jsonify({"error": "No audiobook IDs provided"}), 400
+        error = _validate_audiobook_ids(ids_to_delete)
+        if error:
+            return jsonify({"error": error}), 400
 
         mode = data.get("mode", "title")  # Default to title mode
 
         conn = get_db(db_path)
         cursor = conn.cursor()
 
-        # Get all audiobooks to be deleted with their grouping keys
-        placeholders = ",".join("?" * len(ids_to_delete))
+        # Decide which requested rows are safe in one query: within each
+        # duplicate group, if the request covers every copy, the group's
+        # keeper (first row in keeper order) is blocked instead of deleted.
+        if mode == "title":
+            # Group by normalized title + duration (duration distinguishes
+            # different books with same title); keep a real author, then the
+            # preferred format, then the lowest ID
+            candidates = (
+                "a.norm_title IN (SELECT norm_title FROM audiobooks WHERE id IN tgt)"
+            )
+            partition = "a.norm_title, ROUND(a.duration_hours, 1)"
+            keeper_order = "a.norm_author = 'audiobook', a.format_rank, a.id"
+            always_blocked = "0"
+        else:
+            # Hash-based mode: keep the lowest ID; never delete unhashed rows
+            candidates = (
+                "a.id IN tgt OR a.sha256_hash IN "
+                "(SELECT sha256_hash FROM audiobooks WHERE id IN tgt)"
+            )
+            partition = "a.sha256_hash"
+            keeper_order = "a.id"
+            always_blocked = "sha256_hash IS NULL"
+
+        # The whole ID set is needed at once, so bind it as one JSON array
+        # rather than one parameter per ID
         cursor.execute(
             f"""
-            SELECT id, sha256_hash, title, author, file_path, duration_hours, file_size_mb,
-                   LOWER(TRIM(REPLACE(REPLACE(REPLACE(title, ':', ''), '-', ''), '  ', ' '))) as norm_title,
-                   LOWER(TRIM(author)) as norm_author,
-                   ROUND(duration_hours, 1) as duration_group
-            FROM audiobooks
-            WHERE id IN ({placeholders})
+            WITH tgt(id) AS (SELECT value FROM json_each(?)),
+            grp AS (
+                SELECT a.id, a.sha256_hash,
+                       a.id IN tgt as marked,
+                       COUNT(*) OVER w as total,
+                       SUM(a.id IN tgt) OVER w as marked_count,
+                       ROW_NUMBER() OVER (w ORDER BY {keeper_order}) as rn
+                FROM audiobooks a
+                WHERE {candidates}
+                WINDOW w AS (PARTITION BY {partition})
+            )
+            SELECT id,
+                   {always_blocked} OR (marked_count >= total AND rn = 1) as blocked
+            FROM grp
+            WHERE marked
+            ORDER BY id
         """,
-            ids_to_delete,
+            (json.dumps(ids_to_delete),),
         )
 
-        to_delete = [dict(row) for row in cursor.fetchall()]
-
         blocked_ids = []
         safe_to_delete = []
-
-        if mode == "title":
-            # Group by normalized title + duration (duration distinguishes different books with same title)
-            title_groups: dict[tuple[Any, Any], list[dict[str, Any]]] = {}
-            for item in to_delete:
-                key = (item["norm_title"], item["duration_group"])
-                if key not in title_groups:
-                    title_groups[key] = []
-                title_groups[key].append(item)
-
-            # For each title group, verify at least one copy will remain
-            for (norm_title, duration_group), items in title_groups.items():
-                # Count total copies with this title + similar duration
-                cursor.execute(
-                    """
-                    SELECT COUNT(*) as count FROM audiobooks
-                    WHERE LOWER(TRIM(REPLACE(REPLACE(REPLACE(title, ':', ''), '-', ''), '  ', ' '))) = ?
-                      AND ROUND(duration_hours, 1) = ?
-                """,
-                    (norm_title, duration_group),
-                )
-                total_copies = cursor.fetchone()["count"]
-
-                deleting_count = len(items)
-
-                if deleting_count >= total_copies:
-                    # Would delete all copies - block the best one (keeper)
-                    # Sort: prefer real author, then preferred format, then by ID
-                    def sort_key(x):
-                        # Prefer real author over "Audiobook"
-                        author_priority = 1 if x["norm_author"] == "audiobook" else 0
-                        fmt_order = {"opus": 1, "m4b": 2, "m4a": 3, "mp3": 4}
-                        ext = Path(x["file_path"]).suffix.lower().lstrip(".")
-                        return (author_priority, fmt_order.get(ext, 5), x["id"])
-
-                    items_sorted = sorted(items, key=sort_key)
-                    blocked_ids.append(items_sorted[0]["id"])
-                    safe_to_delete.extend([i["id"] for i in items_sorted[1:]])
-                else:
-                    safe_to_delete.extend([i["id"] for i in items])
-        else:
-            # Hash-based mode (original logic)
-            hash_groups: dict[str | None, list[dict[str, Any]]] = {}
-            for item in to_delete:
-                h = item["sha256_hash"]
-                if h not in hash_groups:
-                    hash_groups[h] = []
-                hash_groups[h].append(item)
-
-            for hash_val, items in hash_groups.items():
-                if hash_val is None:
-                    blocked_ids.extend([i["id"] for i in items])
-                    continue
-
-                cursor.execute(
-                    """
-                    SELECT COUNT(*) as count FROM audiobooks WHERE sha256_hash = ?
-                """,
-                    (hash_val,),
-                )
-                total_copies = cursor.fetchone()["count"]
-
-                deleting_count = len(items)
-
-                if deleting_count >= total_copies:
-                    items_sorted = sorted(items, key=lambda x: x["id"])
-                    blocked_ids.append(items_sorted[0]["id"])
-                    safe_to_delete.extend([i["id"] for i in items_sorted[1:]])
-                else:
-                    safe_to_delete.extend([i["id"] for i in items])
+        for row in cursor.fetchall():
+            (blocked_ids if row["blocked"] else safe_to_delete).append(row["id"])
 
         # Now perform the actual deletions
         deleted_files = []
         errors = []
 
+        rows = _in_chunks(
+            cursor,
+            "SELECT id, file_path, title FROM audiobooks WHERE id IN ({})",
+            safe_to_delete,
+        )
+        rows_by_id = {row["id"]: row for row in rows}
+
         for audiobook_id in safe_to_delete:
-            cursor.execute(
-                "SELECT file_path, title FROM audiobooks WHERE id = ?", (audiobook_id,)
-            )
-            row = cursor.fetchone()
+            row = rows_by_id.get(audiobook_id)
 
             if not row:
                 continue
@@ -498,20 +633,6 @@ def init_duplicates_routes(db_path):
                     # Remove from checksum indexes to keep them clean
                     remove_from_indexes(file_path)
 
-                # Delete from database
-                cursor.execute(
-                    "DELETE FROM audiobook_topics WHERE audiobook_id = ?",
-                    (audiobook_id,),
-                )
-                cursor.execute(
-                    "DELETE FROM audiobook_eras WHERE audiobook_id = ?", (audiobook_id,)
-                )
-                cursor.execute(
-                    "DELETE FROM audiobook_genres WHERE audiobook_id = ?",
-                    (audiobook_id,),
-                )
-                cursor.execute("DELETE FROM audiobooks WHERE id = ?", (audiobook_id,))
-
                 deleted_files.append(
                     {"id": audiobook_id, "title": title, "path": str(file_path)}
                 )
@@ -524,7 +645,19 @@ def init_duplicates_routes(db_path):
                     {"id": audiobook_id, "title": title, "error": "Deletion failed"}
                 )
 
-        conn.commit()
+        # Delete from database - one statement per table, one transaction
+        deleted_ids = [(f["id"],) for f in deleted_files]
+        with conn:
+            cursor.executemany(
+                "DELETE FROM audiobook_topics WHERE audiobook_id = ?", deleted_ids
+            )
+            cursor.executemany(
+                "DELETE FROM audiobook_eras WHERE audiobook_id = ?", deleted_ids
+            )
+            cursor.executemany(
+                "DELETE FROM audiobook_genres WHERE audiobook_id = ?", deleted_ids
+            )
+            cursor.executemany("DELETE FROM audiobooks WHERE id = ?", deleted_ids)
         conn.close()
 
         return jsonify(
@@ -926,21 +1059,21 @@ def init_duplicates_routes(db_path):
             return jsonify({"error": "Missing audiobook_ids"}), 400
 
         ids_to_check = data["audiobook_ids"]
+        error = _validate_audiobook_ids(ids_to_check)
+        if error:
+            return jsonify({"error": error}), 400
 
         conn = get_db(db_path)
         cursor = conn.cursor()
 
-        placeholders = ",".join("?" * len(ids_to_check))
-        cursor.execute(
-            f"""
-            SELECT id, sha256_hash, title
-            FROM audiobooks
-            WHERE id IN ({placeholders})
-        """,
-            ids_to_check,
-        )
-
-        items = [dict(row) for row in cursor.fetchall()]
+        items = [
+            dict(row)
+            for row in _in_chunks(
+                cursor,
+                "SELECT id, sha256_hash, title FROM audiobooks WHERE id IN ({})",
+                ids_to_check,
+            )
+        ]
 
         # Group by hash
         hash_groups: dict[str | None, list[dict[str, Any]]] = {}
@@ -950,6 +1083,20 @@ def init_duplicates_routes(db_path):
                 hash_groups[h] = []
             hash_groups[h].append(item)
 
+        # Count total copies of every affected hash in one query
+        hashes = [h for h in hash_groups if h is not None]
+        rows = _in_chunks(
+            cursor,
+            """
+            SELECT sha256_hash, COUNT(*) as count FROM audiobooks
+            WHERE sha256_hash IN ({})
+            GROUP BY sha256_hash
+        """,
+            hashes,
+        )
+        copy_counts = {row["sha256_hash"]: row["count"] for row in rows}
+        conn.close()
+
         safe_ids = []
         unsafe_ids = []
 
@@ -968,11 +1115,7 @@ def init_duplicates_routes(db_path):
                 )
                 continue
 
-            cursor.execute(
-                "SELECT COUNT(*) as count FROM audiobooks WHERE sha256_hash = ?",
-                (hash_val,),
-            )
-            total_copies = cursor.fetchone()["count"]
+            total_copies = copy_counts.get(hash_val, 0)
 
             if len(group_items) >= total_copies:
                 # Would delete all - block the first one (keeper)
@@ -988,8 +1131,6 @@ def init_duplicates_routes(db_path):
             else:
                 safe_ids.extend([i["id"] for i in group_items])
 
-        conn.close()
-
         return jsonify(
             {
                 "safe_ids": safe_ids,
@@ -2,7 +2,7 @@
 Supplement endpoints - PDF, ebook, and other companion files for audiobooks.
 """
 
-from pathlib import Path
+import os
 
 from flask import Blueprint, Response, jsonify, send_file
 
@@ -11,6 +11,37 @@ from .auth import auth_if_enabled, download_permission_required, admin_if_enable
 
 supplements_bp = Blueprint("supplements", __name__)
 
+# Filename separators treated as spaces when matching supplements to titles
+FILENAME_SEPARATORS = str.maketrans("_-", "  ")
+
+# Supplement type by file extension
+SUPPLEMENT_TYPES = {
+    "pdf": "pdf",
+    "epub": "ebook",
+    "mobi": "ebook",
+    "jpg": "image",
+    "jpeg": "image",
+    "png": "image",
+    "mp3": "audio",
+    "wav": "audio",
+}
+
+# Map file types to MIME types
+SUPPLEMENT_MIME_TYPES = {
+    "pdf": "application/pdf",
+    "epub": "application/epub+zip",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+    "mp3": "audio/mpeg",
+}
+
+
+@supplements_bp.errorhandler(FileNotFoundError)
+def file_not_on_disk(error: FileNotFoundError) -> FlaskResponse:
+    """Catalogued supplement file is missing (send_file stats it on each request)."""
+    return jsonify({"error": "File not found on disk"}), 404
+
 
 def init_supplements_routes(db_path, supplements_dir):
     """Initialize routes with database path and supplements directory."""
@@ -106,35 +137,28 @@ def init_supplements_routes(db_path, supplements_dir):
         conn = get_db(db_path)
         cursor = conn.cursor()
 
-        cursor.execute("SELECT * FROM supplements WHERE id = ?", (supplement_id,))
+        cursor.execute(
+            "SELECT file_path, filename FROM supplements WHERE id = ?",
+            (supplement_id,),
+        )
         row = cursor.fetchone()
         conn.close()
 
         if not row:
             return jsonify({"error": "Supplement not found"}), 404
 
-        file_path = Path(row["file_path"])
-        if not file_path.exists():
-            return jsonify({"error": "File not found on disk"}), 404
-
-        # Map file types to MIME types
-        mime_types = {
-            "pdf": "application/pdf",
-            "epub": "application/epub+zip",
-            "jpg": "image/jpeg",
-            "jpeg": "image/jpeg",
-            "png": "image/png",
-            "mp3": "audio/mpeg",
-        }
-
-        ext = file_path.suffix.lower().lstrip(".")
-        mimetype = mime_types.get(ext, "application/octet-stream")
+        file_path = row["file_path"]
+        ext = os.path.splitext(file_path)[1].lower().lstrip(".")
+        mimetype = SUPPLEMENT_MIME_TYPES.get(ext, "application/octet-stream")
 
+        # send_file stats the file itself; a missing file raises
+        # FileNotFoundError, answered by file_not_on_disk() above
         return send_file(
             file_path,
             mimetype=mimetype,
             as_attachment=False,
             download_name=row["filename"],
+            conditional=True,  # ETag/Last-Modified revalidation and ranges
         )
 
     @supplements_bp.route("/api/supplements/scan", methods=["POST"])
@@ -154,69 +178,81 @@ def init_supplements_routes(db_path, supplements_dir):
         cursor.execute("SELECT file_path FROM supplements")
         existing_paths = {row["file_path"] for row in cursor.fetchall()}
 
+        # Load match keys for every title once (lowercased, and lowercased
+        # with ':' and '-' removed) instead of a LIKE scan per file
+        cursor.execute("SELECT id, title FROM audiobooks ORDER BY id")
+        title_keys = []
+        for row in cursor.fetchall():
+            title = row["title"].lower()
+            title_keys.append(
+                (row["id"], title, title.replace(":", "").replace("-", ""))
+            )
+
         added = []
         updated = []
-
-        for file_path in supplements_dir.iterdir():
-            if file_path.is_file():
-                path_str = str(file_path)
-                filename = file_path.name
-                ext = file_path.suffix.lower().lstrip(".")
-                file_size = file_path.stat().st_size / (1024 * 1024)  # MB
+        to_insert = []
+        to_update = []
+
+        # scandir entries carry the file type from the directory read, so
+        # only the size lookup costs a stat() per file
+        with os.scandir(supplements_dir) as entries:
+            for entry in entries:
+                if not entry.is_file():
+                    continue
+
+                path_str = entry.path
+                filename = entry.name
+                stem, ext = os.path.splitext(filename)
+                ext = ext.lower().lstrip(".")
+                file_size = entry.stat().st_size / (1024 * 1024)  # MB
 
                 # Determine type
-                type_map = {
-                    "pdf": "pdf",
-                    "epub": "ebook",
-                    "mobi": "ebook",
-                    "jpg": "image",
-                    "jpeg": "image",
-                    "png": "image",
-                    "mp3": "audio",
-                    "wav": "audio",
-                }
-                supplement_type = type_map.get(ext, "other")
+                supplement_type = SUPPLEMENT_TYPES.get(ext, "other")
 
                 # Try to match to an audiobook by title
                 # Clean filename for matching (remove extension, replace underscores)
-                clean_name = file_path.stem.replace("_", " ").replace("-", " ")
-
-                cursor.execute(
-                    """
-                    SELECT id, title FROM audiobooks
-                    WHERE LOWER(title) LIKE ?
-                    OR LOWER(REPLACE(REPLACE(title, ':', ''), '-', '')) LIKE ?
-                    LIMIT 1
-                """,
-                    (f"%{clean_name[:30].lower()}%", f"%{clean_name[:30].lower()}%"),
+                clean_name = stem.translate(FILENAME_SEPARATORS)
+                needle = clean_name[:30].lower()
+
+                audiobook_id = next(
+                    (
+                        book_id
+                        for book_id, title, stripped in title_keys
+                        if needle in title or needle in stripped
+                    ),
+                    None,
                 )
 
-                match = cursor.fetchone()
-                audiobook_id = match["id"] if match else None
-
                 if path_str in existing_paths:
                     # Update existing record
-                    cursor.execute(
-                        """
-                        UPDATE supplements
-                        SET audiobook_id = ?, file_size_mb = ?, type = ?
-                        WHERE file_path = ?
-                    """,
-                        (audiobook_id, file_size, supplement_type, path_str),
+                    to_update.append(
+                        (audiobook_id, file_size, supplement_type, path_str)
                     )
                     updated.append(filename)
                 else:
                     # Insert new record
-                    cursor.execute(
-                        """
-                        INSERT INTO supplements (audiobook_id, type, filename, file_path, file_size_mb)
-                        VALUES (?, ?, ?, ?, ?)
-                    """,
-                        (audiobook_id, supplement_type, filename, path_str, file_size),
+                    to_insert.append(
+                        (audiobook_id, supplement_type, filename, path_str, file_size)
                     )
                     added.append(filename)
 
-        conn.commit()
+        # Write all changes in one transaction
+        with conn:
+            cursor.executemany(
+                """
+                UPDATE supplements
+                SET audiobook_id = ?, file_size_mb = ?, type = ?
+                WHERE file_path = ?
+            """,
+                to_update,
+            )
+            cursor.executemany(
+                """
+                INSERT INTO supplements (audiobook_id, type, filename, file_path, file_size_mb)
+                VALUES (?, ?, ?, ?, ?)
+            """,
+                to_insert,
+            )
         conn.close()
 
         return jsonify(
@@ -25,6 +25,18 @@ CREATE TABLE IF NOT EXISTS audiobooks (
     file_path TEXT UNIQUE NOT NULL,
     cover_path TEXT,
     format TEXT,
+    -- Streaming Content-Type derived from format (or the file extension for
+    -- rows without one). Keep in sync with AUDIOBOOK_COLUMN_UPGRADES in
+    -- backend/api_modular/core.py.
+    mime_type TEXT GENERATED ALWAYS AS (
+        CASE
+            WHEN format = 'opus' OR (format IS NULL AND file_path LIKE '%.opus') THEN 'audio/ogg'
+            WHEN format IN ('m4b', 'm4a')
+                OR (format IS NULL AND (file_path LIKE '%.m4b' OR file_path LIKE '%.m4a')) THEN 'audio/mp4'
+            WHEN format = 'mp3' OR (format IS NULL AND file_path LIKE '%.mp3') THEN 'audio/mpeg'
+            ELSE 'application/octet-stream'
+        END
+    ) VIRTUAL,
     quality TEXT,
     published_year INTEGER,
     published_date TEXT,          -- Full publish date if available (YYYY-MM-DD)
@@ -38,6 +50,27 @@ CREATE TABLE IF NOT EXISTS audiobooks (
     audible_position_ms INTEGER,
     audible_position_updated TIMESTAMP,
     position_synced_at TIMESTAMP,
+    -- Denormalized related data for list views (maintained by triggers below)
+    genre_names TEXT,             -- Genre names joined with '|||'
+    era_names TEXT,               -- Era names joined with '|||'
+    topic_names TEXT,             -- Topic names joined with '|||'
+    supplement_count INTEGER DEFAULT 0,
+    -- Normalized grouping keys for title-based duplicate detection. Keep in
+    -- sync with AUDIOBOOK_COLUMN_UPGRADES in backend/api_modular/core.py.
+    norm_title TEXT GENERATED ALWAYS AS (
+        LOWER(TRIM(REPLACE(REPLACE(REPLACE(title, ':', ''), '-', ''), '  ', ' ')))
+    ) VIRTUAL,
+    norm_author TEXT GENERATED ALWAYS AS (LOWER(TRIM(author))) VIRTUAL,
+    -- Keeper preference among duplicate formats (lower is better)
+    format_rank INTEGER GENERATED ALWAYS AS (
+        CASE format
+            WHEN 'opus' THEN 1
+            WHEN 'm4b' THEN 2
+            WHEN 'm4a' THEN 3
+            WHEN 'mp3' THEN 4
+            ELSE 5
+        END
+    ) VIRTUAL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -113,19 +146,157 @@ CREATE TRIGGER IF NOT EXISTS audiobooks_ai AFTER INSERT ON audiobooks BEGIN
     VALUES (new.id, new.title, new.author, new.narrator, new.publisher, new.series, new.description);
 END;
 
+-- Replaces the original trigger, whose DELETE FROM audiobooks_fts looked up
+-- the tokens to remove in a content row that no longer exists
+DROP TRIGGER IF EXISTS audiobooks_ad;
 CREATE TRIGGER IF NOT EXISTS audiobooks_ad AFTER DELETE ON audiobooks BEGIN
-    DELETE FROM audiobooks_fts WHERE rowid = old.id;
+    INSERT INTO audiobooks_fts(audiobooks_fts, rowid, title, author, narrator, publisher, series, description)
+    VALUES ('delete', old.id, old.title, old.author, old.narrator, old.publisher, old.series, old.description);
 END;
 
-CREATE TRIGGER IF NOT EXISTS audiobooks_au AFTER UPDATE ON audiobooks BEGIN
-    UPDATE audiobooks_fts
-    SET title = new.title,
-        author = new.author,
-        narrator = new.narrator,
-        publisher = new.publisher,
-        series = new.series,
-        description = new.description
-    WHERE rowid = new.id;
+-- Only fires for the indexed columns; replaces the original trigger that
+-- rewrote the FTS row on every UPDATE of audiobooks. An external-content
+-- FTS5 table can't be UPDATEd in place: the old tokens are removed with the
+-- 'delete' command, which needs the old values, then the new row is indexed.
+DROP TRIGGER IF EXISTS audiobooks_au;
+CREATE TRIGGER IF NOT EXISTS audiobooks_au
+AFTER UPDATE OF title, author, narrator, publisher, series, description ON audiobooks BEGIN
+    INSERT INTO audiobooks_fts(audiobooks_fts, rowid, title, author, narrator, publisher, series, description)
+    VALUES ('delete', old.id, old.title, old.author, old.narrator, old.publisher, old.series, old.description);
+    INSERT INTO audiobooks_fts(rowid, title, author, narrator, publisher, series, description)
+    VALUES (new.id, new.title, new.author, new.narrator, new.publisher, new.series, new.description);
+END;
+
+-- Triggers to keep denormalized genre/era/topic names and supplement counts
+-- in sync, so list views read one row per book instead of joining per book
+
+CREATE TRIGGER IF NOT EXISTS audiobook_genres_ai AFTER INSERT ON audiobook_genres BEGIN
+    UPDATE audiobooks SET genre_names = (
+        SELECT GROUP_CONCAT(x.name, '|||') FROM audiobook_genres l
+        JOIN genres x ON l.genre_id = x.id
+        WHERE l.audiobook_id = new.audiobook_id
+    )
+    WHERE id = new.audiobook_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS audiobook_genres_ad AFTER DELETE ON audiobook_genres BEGIN
+    UPDATE audiobooks SET genre_names = (
+        SELECT GROUP_CONCAT(x.name, '|||') FROM audiobook_genres l
+        JOIN genres x ON l.genre_id = x.id
+        WHERE l.audiobook_id = old.audiobook_id
+    )
+    WHERE id = old.audiobook_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS genres_au AFTER UPDATE OF name ON genres BEGIN
+    UPDATE audiobooks SET genre_names = (
+        SELECT GROUP_CONCAT(x.name, '|||') FROM audiobook_genres l
+        JOIN genres x ON l.genre_id = x.id
+        WHERE l.audiobook_id = audiobooks.id
+    )
+    WHERE id IN (SELECT audiobook_id FROM audiobook_genres WHERE genre_id = new.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS genres_ad AFTER DELETE ON genres BEGIN
+    UPDATE audiobooks SET genre_names = (
+        SELECT GROUP_CONCAT(x.name, '|||') FROM audiobook_genres l
+        JOIN genres x ON l.genre_id = x.id
+        WHERE l.audiobook_id = audiobooks.id
+    )
+    WHERE id IN (SELECT audiobook_id FROM audiobook_genres WHERE genre_id = old.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS audiobook_eras_ai AFTER INSERT ON audiobook_eras BEGIN
+    UPDATE audiobooks SET era_names = (
+        SELECT GROUP_CONCAT(x.name, '|||') FROM audiobook_eras l
+        JOIN eras x ON l.era_id = x.id
+        WHERE l.audiobook_id = new.audiobook_id
+    )
+    WHERE id = new.audiobook_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS audiobook_eras_ad AFTER DELETE ON audiobook_eras BEGIN
+    UPDATE audiobooks SET era_names = (
+        SELECT GROUP_CONCAT(x.name, '|||') FROM audiobook_eras l
+        JOIN eras x ON l.era_id = x.id
+        WHERE l.audiobook_id = old.audiobook_id
+    )
+    WHERE id = old.audiobook_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS eras_au AFTER UPDATE OF name ON eras BEGIN
+    UPDATE audiobooks SET era_names = (
+        SELECT GROUP_CONCAT(x.name, '|||') FROM audiobook_eras l
+        JOIN eras x ON l.era_id = x.id
+        WHERE l.audiobook_id = audiobooks.id
+    )
+    WHERE id IN (SELECT audiobook_id FROM audiobook_eras WHERE era_id = new.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS eras_ad AFTER DELETE ON eras BEGIN
+    UPDATE audiobooks SET era_names = (
+        SELECT GROUP_CONCAT(x.name, '|||') FROM audiobook_eras l
+        JOIN eras x ON l.era_id = x.id
+        WHERE l.audiobook_id = audiobooks.id
+    )
+    WHERE id IN (SELECT audiobook_id FROM audiobook_eras WHERE era_id = old.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS audiobook_topics_ai AFTER INSERT ON audiobook_topics BEGIN
+    UPDATE audiobooks SET topic_names = (
+        SELECT GROUP_CONCAT(x.name, '|||') FROM audiobook_topics l
+        JOIN topics x ON l.topic_id = x.id
+        WHERE l.audiobook_id = new.audiobook_id
+    )
+    WHERE id = new.audiobook_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS audiobook_topics_ad AFTER DELETE ON audiobook_topics BEGIN
+    UPDATE audiobooks SET topic_names = (
+        SELECT GROUP_CONCAT(x.name, '|||') FROM audiobook_topics l
+        JOIN topics x ON l.topic_id = x.id
+        WHERE l.audiobook_id = old.audiobook_id
+    )
+    WHERE id = old.audiobook_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS topics_au AFTER UPDATE OF name ON topics BEGIN
+    UPDATE audiobooks SET topic_names = (
+        SELECT GROUP_CONCAT(x.name, '|||') FROM audiobook_topics l
+        JOIN topics x ON l.topic_id = x.id
+        WHERE l.audiobook_id = audiobooks.id
+    )
+    WHERE id IN (SELECT audiobook_id FROM audiobook_topics WHERE topic_id = new.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS topics_ad AFTER DELETE ON topics BEGIN
+    UPDATE audiobooks SET topic_names = (
+        SELECT GROUP_CONCAT(x.name, '|||') FROM audiobook_topics l
+        JOIN topics x ON l.topic_id = x.id
+        WHERE l.audiobook_id = audiobooks.id
+    )
+    WHERE id IN (SELECT audiobook_id FROM audiobook_topics WHERE topic_id = old.id);
+END;
+
+CREATE TRIGGER IF NOT EXISTS supplements_ai AFTER INSERT ON supplements BEGIN
+    UPDATE audiobooks SET supplement_count = (
+        SELECT COUNT(*) FROM supplements WHERE audiobook_id = new.audiobook_id
+    )
+    WHERE id = new.audiobook_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS supplements_ad AFTER DELETE ON supplements BEGIN
+    UPDATE audiobooks SET supplement_count = (
+        SELECT COUNT(*) FROM supplements WHERE audiobook_id = old.audiobook_id
+    )
+    WHERE id = old.audiobook_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS supplements_au AFTER UPDATE OF audiobook_id ON supplements BEGIN
+    UPDATE audiobooks SET supplement_count = (
+        SELECT COUNT(*) FROM supplements WHERE audiobook_id = audiobooks.id
+    )
+    WHERE id IN (old.audiobook_id, new.audiobook_id);
 END;
 
 -- Indices for fast queries
@@ -133,12 +304,35 @@ CREATE INDEX IF NOT EXISTS idx_audiobooks_title ON audiobooks(title);
 CREATE INDEX IF NOT EXISTS idx_audiobooks_author ON audiobooks(author);
 CREATE INDEX IF NOT EXISTS idx_audiobooks_narrator ON audiobooks(narrator);
 CREATE INDEX IF NOT EXISTS idx_audiobooks_publisher ON audiobooks(publisher);
-CREATE INDEX IF NOT EXISTS idx_audiobooks_series ON audiobooks(series);
+-- (series, series_sequence) matches the series sort and supersedes the
+-- original single-column idx_audiobooks_series
+DROP INDEX IF EXISTS idx_audiobooks_series;
+CREATE INDEX IF NOT EXISTS idx_audiobooks_series_sequence ON audiobooks(series, series_sequence);
 CREATE INDEX IF NOT EXISTS idx_audiobooks_format ON audiobooks(format);
 CREATE INDEX IF NOT EXISTS idx_audiobooks_duration ON audiobooks(duration_hours);
 CREATE INDEX IF NOT EXISTS idx_audiobooks_year ON audiobooks(published_year);
 CREATE INDEX IF NOT EXISTS idx_audiobooks_sha256 ON audiobooks(sha256_hash);
+-- Hash duplicate grouping and wasted-space sums, answered from the index
+-- alone; unhashed rows are never grouped so they are left out
+CREATE INDEX IF NOT EXISTS idx_audiobooks_sha256_cover
+    ON audiobooks(sha256_hash, file_size_mb) WHERE sha256_hash IS NOT NULL;
 CREATE INDEX IF NOT EXISTS idx_audiobooks_content_type ON audiobooks(content_type);
+-- Title duplicate lookups, with each group's rows already in keeper order
+DROP INDEX IF EXISTS idx_audiobooks_norm_title_author;
+CREATE INDEX IF NOT EXISTS idx_audiobooks_title_dedup
+    ON audiobooks(norm_title, norm_author, format_rank, file_size_mb DESC, id);
+
+-- Indices backing the remaining /api/audiobooks sort options, so a sorted
+-- page is an index walk with LIMIT instead of sorting every matching row
+CREATE INDEX IF NOT EXISTS idx_audiobooks_author_last ON audiobooks(author_last_name);
+CREATE INDEX IF NOT EXISTS idx_audiobooks_author_first ON audiobooks(author_first_name);
+CREATE INDEX IF NOT EXISTS idx_audiobooks_narrator_last ON audiobooks(narrator_last_name);
+CREATE INDEX IF NOT EXISTS idx_audiobooks_narrator_first ON audiobooks(narrator_first_name);
+CREATE INDEX IF NOT EXISTS idx_audiobooks_created ON audiobooks(created_at);
+CREATE INDEX IF NOT EXISTS idx_audiobooks_acquired ON audiobooks(acquired_date);
+CREATE INDEX IF NOT EXISTS idx_audiobooks_published_date ON audiobooks(published_date);
+CREATE INDEX IF NOT EXISTS idx_audiobooks_file_size ON audiobooks(file_size_mb);
+CREATE INDEX IF NOT EXISTS idx_audiobooks_edition ON audiobooks(edition);
 
 -- View for easy querying with all related data
 CREATE VIEW IF NOT EXISTS audiobooks_full AS
@@ -193,6 +193,11 @@ AUDIOBOOKS_USE_WAITRESS = get_config("AUDIOBOOKS_USE_WAITRESS", "true").lower()
     "1",
     "yes",
 )
+# Hand file bodies off to a fronting web server (X-Sendfile) instead of
+# streaming them through Python. Only enable behind a server that honors it.
+AUDIOBOOKS_USE_X_SENDFILE = get_config(
+    "AUDIOBOOKS_USE_X_SENDFILE", "false"
+).lower() in ("true", "1", "yes")
 
 # =============================================================================
 # Legacy Aliases (backwards compatibility)
@@ -245,6 +250,7 @@ def print_config() -> None:
     print(f"AUDIOBOOKS_BIND_ADDRESS: {AUDIOBOOKS_BIND_ADDRESS}")
     print(f"AUDIOBOOKS_HTTPS_ENABLED: {AUDIOBOOKS_HTTPS_ENABLED}")
     print(f"AUDIOBOOKS_USE_WAITRESS: {AUDIOBOOKS_USE_WAITRESS}")
+    print(f"AUDIOBOOKS_USE_X_SENDFILE: {AUDIOBOOKS_USE_X_SENDFILE}")
     print("=" * 50)
 
 
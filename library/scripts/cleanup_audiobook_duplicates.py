@@ -17,6 +17,7 @@ SAFETY:
 """
 
 import sqlite3
+import string
 import sys
 from argparse import ArgumentParser
 from pathlib import Path
@@ -37,52 +38,74 @@ def format_size(size_bytes: float) -> str:
     return f"{size_bytes:.1f}PB"
 
 
+# Drops ':' and '-' and lowercases ASCII only, like SQLite's LOWER()
+_TITLE_STRIP = str.maketrans(string.ascii_uppercase, string.ascii_lowercase, ":-")
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+
+
+def normalize_title(title: str | None) -> str | None:
+    """
+    Normalize a title for duplicate matching in a single translate pass.
+
+    Equivalent to the SQL expression used by the web UI (and the norm_title
+    column): LOWER(TRIM(REPLACE(REPLACE(REPLACE(title, ':', ''), '-', ''), '  ', ' ')))
+
+    Returns None for a NULL title, which never matches anything (NULL = NULL
+    is not true in SQL).
+    """
+    if title is None:
+        return None
+    return title.translate(_TITLE_STRIP).replace("  ", " ").strip(" ")
+
+
 def find_audiobook_folder_duplicates(conn):
     """
     Find entries in /Library/Audiobook/ that have matching entries in /Library/Author/
     """
     cursor = conn.cursor()
 
-    # Find all entries from /Library/Audiobook/ folder
+    # Read every entry once; titles are normalized in Python rather than
+    # re-running the SQL normalization over the whole table per entry
     cursor.execute(
         """
-        SELECT id, title, author, file_path, file_size_mb, duration_hours,
-               LOWER(TRIM(REPLACE(REPLACE(REPLACE(title, ':', ''), '-', ''), '  ', ' '))) as norm_title,
-               ROUND(duration_hours, 1) as duration_group
+        SELECT id, title, author, file_path, file_size_mb,
+               ROUND(duration_hours, 1) as duration_group,
+               file_path LIKE '%/Library/Audiobook/%' as in_audiobook_folder
         FROM audiobooks
-        WHERE file_path LIKE '%/Library/Audiobook/%'
-        ORDER BY title
+        ORDER BY title, id
     """
     )
-    audiobook_folder_entries = cursor.fetchall()
+    rows = cursor.fetchall()
+
+    # Entries with a real author outside /Library/Audiobook/, keyed by
+    # normalized title + duration (first by ID wins)
+    real_entries = {}
+    for entry_id, title, author, file_path, _, duration_group, in_folder in sorted(
+        rows, key=lambda r: r[0]
+    ):
+        if in_folder or author is None:
+            continue
+        if author.strip(" ").translate(_ASCII_LOWER) == "audiobook":
+            continue
+        norm_title = normalize_title(title)
+        if norm_title is None or duration_group is None:
+            continue
+        real_entries.setdefault(
+            (norm_title, duration_group), (entry_id, title, author, file_path)
+        )
 
     duplicates_to_remove = []
     protected_entries = []
 
-    for entry in audiobook_folder_entries:
-        entry_id = entry[0]
-        title = entry[1]
-        author = entry[2]
-        file_path = entry[3]
-        file_size_mb = entry[4]
-        # entry[5] is duration_hours (unused in this context)
-        norm_title = entry[6]
-        duration_group = entry[7]
+    for entry_id, title, author, file_path, file_size_mb, duration_group, in_folder in rows:
+        if not in_folder:
+            continue
 
         # Check if there's a matching entry with real author (not in /Audiobook/ folder)
-        cursor.execute(
-            """
-            SELECT id, title, author, file_path
-            FROM audiobooks
-            WHERE LOWER(TRIM(REPLACE(REPLACE(REPLACE(title, ':', ''), '-', ''), '  ', ' '))) = ?
-              AND ROUND(duration_hours, 1) = ?
-              AND file_path NOT LIKE '%/Library/Audiobook/%'
-              AND LOWER(TRIM(author)) != 'audiobook'
-        """,
-            (norm_title, duration_group),
-        )
-
-        matching_real_entry = cursor.fetchone()
+        matching_real_entry = None
+        norm_title = normalize_title(title)
+        if norm_title is not None and duration_group is not None:
+            matching_real_entry = real_entries.get((norm_title, duration_group))
 
         if matching_real_entry:
             duplicates_to_remove.append(
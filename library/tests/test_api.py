@@ -214,6 +214,65 @@ class TestAudiobooksFiltering:
         )
         assert response.status_code == 200
 
+    def test_filter_by_name_prefix(self, flask_app, app_client):
+        """Test author/narrator filters match word prefixes via FTS."""
+        import sqlite3
+
+        conn = sqlite3.connect(flask_app.config["DATABASE_PATH"])
+        conn.execute(
+            "INSERT INTO audiobooks (title, author, narrator, file_path) "
+            "VALUES ('Prefix Filter Book', 'Ursula K. Le Guin', "
+            "'Zephyrine Quill', '/test/prefix_filter.opus')"
+        )
+        conn.commit()
+        try:
+            response = app_client.get(
+                '/api/audiobooks?author=le%20gui&narrator=zephyr"*'
+            )
+            assert response.status_code == 200
+            titles = [b["title"] for b in json.loads(response.data)["audiobooks"]]
+            assert titles == ["Prefix Filter Book"]
+
+            response = app_client.get("/api/audiobooks?author=Guinevere")
+            titles = [b["title"] for b in json.loads(response.data)["audiobooks"]]
+            assert "Prefix Filter Book" not in titles
+        finally:
+            conn.execute(
+                "DELETE FROM audiobooks WHERE file_path = '/test/prefix_filter.opus'"
+            )
+            conn.commit()
+            conn.close()
+
+    def test_filter_by_edited_author(self, flask_app, app_client):
+        """Test author filters follow edits rather than the old name."""
+        import sqlite3
+
+        conn = sqlite3.connect(flask_app.config["DATABASE_PATH"])
+        conn.execute(
+            "INSERT INTO audiobooks (title, author, file_path) "
+            "VALUES ('Edited Author Book', 'Alistair Quenby', "
+            "'/test/edited_author.opus')"
+        )
+        conn.execute(
+            "UPDATE audiobooks SET author = 'Bartholomew Quenby' "
+            "WHERE file_path = '/test/edited_author.opus'"
+        )
+        conn.commit()
+        try:
+            response = app_client.get("/api/audiobooks?author=alistair")
+            titles = [b["title"] for b in json.loads(response.data)["audiobooks"]]
+            assert "Edited Author Book" not in titles
+
+            response = app_client.get("/api/audiobooks?author=bartholomew")
+            titles = [b["title"] for b in json.loads(response.data)["audiobooks"]]
+            assert titles == ["Edited Author Book"]
+        finally:
+            conn.execute(
+                "DELETE FROM audiobooks WHERE file_path = '/test/edited_author.opus'"
+            )
+            conn.commit()
+            conn.close()
+
     def test_invalid_sort_field(self, app_client):
         """Test that invalid sort field defaults to title."""
         response = app_client.get("/api/audiobooks?sort=invalid_field")
@@ -630,6 +689,26 @@ class TestAPIResponseFormats:
         assert "total_supplements" in data
         assert "linked_to_audiobooks" in data
 
+    def test_orjson_provider_matches_default(self, flask_app):
+        """Test the orjson provider encodes and decodes like the default."""
+        from datetime import datetime
+
+        from flask.json.provider import DefaultJSONProvider
+
+        from backend.api_modular.core import OrjsonProvider, orjson
+
+        if orjson is None:
+            pytest.skip("orjson not installed")
+        assert isinstance(flask_app.json, OrjsonProvider)
+
+        payload = {"b": [1, 2.5, None], "c": datetime(2024, 1, 2, 3, 4, 5), "a": "é"}
+        default = DefaultJSONProvider(flask_app)
+        assert json.loads(flask_app.json.dumps(payload)) == json.loads(
+            default.dumps(payload)
+        )
+        assert list(json.loads(flask_app.json.dumps(payload))) == ["a", "b", "c"]
+        assert flask_app.json.loads(b'{"a": [1, "\\u00e9"]}') == {"a": [1, "é"]}
+
 
 class TestCORSBehavior:
     """Test CORS behavior in more detail."""
@@ -151,21 +151,66 @@ class TestStreamingWithMocks:
         # Should return 404 for file not found
         assert response.status_code in (200, 404)
 
+    def test_stream_audiobook_missing_file_returns_404(
+        self, flask_app, app_client, tmp_path
+    ):
+        """Test a catalogued but missing file is reported as 404."""
+        import sqlite3
+
+        conn = sqlite3.connect(flask_app.config["DATABASE_PATH"])
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO audiobooks (title, file_path, format) VALUES (?, ?, ?)",
+            ("Missing Book", str(tmp_path / "missing_book.opus"), "opus"),
+        )
+        audiobook_id = cursor.lastrowid
+        conn.commit()
+
+        try:
+            response = app_client.get(f"/api/stream/{audiobook_id}")
+            assert response.status_code == 404
+            assert json.loads(response.data)["error"] == "File not found on disk"
+        finally:
+            cursor.execute("DELETE FROM audiobooks WHERE id = ?", (audiobook_id,))
+            conn.commit()
+            conn.close()
+
+    def test_stream_audiobook_x_sendfile(self, flask_app, app_client, tmp_path):
+        """Test streaming hands the file to the front-end server when enabled."""
+        import sqlite3
+
+        audio_file = tmp_path / "x_sendfile_book.opus"
+        audio_file.write_bytes(b"OggS" + b"\x00" * 1024)
+
+        conn = sqlite3.connect(flask_app.config["DATABASE_PATH"])
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO audiobooks (title, file_path, format) VALUES (?, ?, ?)",
+            ("X-Sendfile Book", str(audio_file), "opus"),
+        )
+        audiobook_id = cursor.lastrowid
+        conn.commit()
+
+        flask_app.config["USE_X_SENDFILE"] = True
+        try:
+            response = app_client.get(f"/api/stream/{audiobook_id}")
+            assert response.status_code == 200
+            assert response.headers["X-Sendfile"] == str(audio_file)
+            assert response.mimetype == "audio/ogg"
+            assert response.data == b""
+        finally:
+            flask_app.config["USE_X_SENDFILE"] = False
+            cursor.execute("DELETE FROM audiobooks WHERE id = ?", (audiobook_id,))
+            conn.commit()
+            conn.close()
+
 
 class TestSupplementDownloadWithMocks:
     """Test supplement download with mocked file system."""
 
     def test_download_supplement_file_exists(self, app_client):
         """Test downloading supplement when file exists."""
-        with (
-            patch("backend.api_modular.supplements.Path") as MockPath,
-            patch("backend.api_modular.supplements.send_file") as mock_send,
-        ):
-            mock_path_instance = MagicMock()
-            mock_path_instance.exists.return_value = True
-            mock_path_instance.suffix = ".pdf"
-            MockPath.return_value = mock_path_instance
-
+        with patch("backend.api_modular.supplements.send_file") as mock_send:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_send.return_value = mock_response
@@ -176,7 +221,7 @@ class TestSupplementDownloadWithMocks:
 
     def test_download_supplement_file_missing(self, app_client):
         """Test downloading supplement when file is missing from disk."""
-        # This tests the file_path.exists() == False branch
+        # This tests the FileNotFoundError -> 404 handler
         response = app_client.get("/api/supplements/1/download")
         # May return 200 if supplement exists and file is served, or 404 if not found
         assert response.status_code in (200, 404)
@@ -855,6 +900,8 @@ class TestDuplicatesByHashWithRealData:
         duplicates = [f for f in found_group["files"] if f["is_duplicate"]]
         assert len(keepers) == 1
         assert len(duplicates) == 1
+        assert keepers[0]["id"] == min(db_with_hash_duplicates["ids"])
+        assert "sha256_hash" not in keepers[0]
 
     def test_duplicates_by_hash_wasted_space_calculation(
         self, app_client, db_with_hash_duplicates
@@ -869,10 +916,24 @@ class TestDuplicatesByHashWithRealData:
                 # Wasted = file_size * (count - 1)
                 # Our test files are 50.0 MB and 51.0 MB
                 # Keeper is first by ID, so wasted is ~50.0 MB
-                assert group["wasted_mb"] >= 0
-                assert group["file_size_mb"] >= 0
+                assert group["wasted_mb"] == 50.0
+                assert group["file_size_mb"] == 50.0
                 break
 
+    def test_duplicates_by_hash_paginated(self, app_client, db_with_hash_duplicates):
+        """Test a page holds the matching slice and library-wide totals."""
+        full = json.loads(app_client.get("/api/duplicates").data)
+        response = app_client.get("/api/duplicates?page=1&per_page=1")
+        data = json.loads(response.data)
+
+        assert data["duplicate_groups"] == full["duplicate_groups"][:1]
+        assert data["total_groups"] == full["total_groups"]
+        assert data["total_wasted_mb"] == full["total_wasted_mb"]
+        assert data["total_duplicate_files"] == full["total_duplicate_files"]
+        assert data["pagination"]["total_count"] == full["total_groups"]
+        assert data["pagination"]["has_prev"] is False
+        assert "pagination" not in full
+
 
 class TestDuplicatesByTitleWithRealData:
     """Test duplicates by title endpoint with actual duplicate data in DB."""
@@ -917,6 +978,45 @@ class TestDuplicatesByTitleWithRealData:
                 assert keepers[0]["format"] == "opus"
                 break
 
+    def test_duplicates_by_title_includes_placeholder_author(
+        self, flask_app, app_client, db_with_title_duplicates
+    ):
+        """Test an 'Audiobook'-author copy joins the group but isn't the keeper."""
+        import sqlite3
+
+        conn = sqlite3.connect(flask_app.config["DATABASE_PATH"])
+        conn.execute(
+            """
+            INSERT INTO audiobooks (
+                title, author, file_path, file_size_mb, format, duration_hours
+            ) VALUES (?, 'Audiobook', '/test/path/title_dup_placeholder.opus',
+                      99.0, 'opus', 10.5)
+        """,
+            (db_with_title_duplicates["title"] + ":",),
+        )
+        conn.commit()
+        try:
+            response = app_client.get("/api/duplicates/by-title")
+            data = json.loads(response.data)
+            group = next(
+                g
+                for g in data["duplicate_groups"]
+                if g["title"] == db_with_title_duplicates["title"]
+            )
+            assert group["count"] == 3
+            assert group["potential_savings_mb"] == 95.0  # 45 + 50, keeps 99
+            assert group["author"] == "Real Author Name"
+            assert group["files"][0]["author"] == "Real Author Name"
+            assert group["files"][-1]["author"] == "Audiobook"
+            assert "group_count" not in group["files"][0]
+        finally:
+            conn.execute(
+                "DELETE FROM audiobooks WHERE file_path = "
+                "'/test/path/title_dup_placeholder.opus'"
+            )
+            conn.commit()
+            conn.close()
+
     def test_duplicates_by_title_potential_savings(
         self, app_client, db_with_title_duplicates
     ):
@@ -932,6 +1032,19 @@ class TestDuplicatesByTitleWithRealData:
                 assert group["potential_savings_mb"] >= 0
                 break
 
+    def test_duplicates_by_title_paginated(self, app_client, db_with_title_duplicates):
+        """Test a page holds the matching slice and library-wide totals."""
+        full = json.loads(app_client.get("/api/duplicates/by-title").data)
+        last_page = full["total_groups"]
+        response = app_client.get(f"/api/duplicates/by-title?page={last_page}&per_page=1")
+        data = json.loads(response.data)
+
+        assert data["duplicate_groups"] == full["duplicate_groups"][-1:]
+        assert data["total_groups"] == full["total_groups"]
+        assert data["total_potential_savings_mb"] == full["total_potential_savings_mb"]
+        assert data["total_duplicate_files"] == full["total_duplicate_files"]
+        assert data["pagination"]["has_next"] is False
+
 
 class TestDeleteDuplicatesWithRealData:
     """Test delete duplicates endpoint with actual duplicate data."""
@@ -960,6 +1073,9 @@ class TestDeleteDuplicatesWithRealData:
             # Should have blocked one (keeper) and possibly deleted one
             assert "blocked_count" in result
             assert "deleted_count" in result
+            # Deleting every copy blocks the opus keeper, deletes the m4b
+            assert result["blocked_ids"] == [ids[0]]
+            assert [f["id"] for f in result["deleted_files"]] == [ids[1]]
 
     def test_delete_duplicates_hash_mode_with_data(
         self, app_client, db_with_hash_duplicates
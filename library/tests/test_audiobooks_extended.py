@@ -24,6 +24,32 @@ class TestStreamAudiobook:
         assert "not found" in data["error"].lower()
 
 
+class TestServeCover:
+    """Test the serve_cover endpoint."""
+
+    def test_cover_is_cacheable(self, flask_app, tmp_path):
+        """Test covers are served with long-lived cache headers and an ETag."""
+        from unittest.mock import patch
+
+        (tmp_path / "abc123.jpg").write_bytes(b"\xff\xd8\xff\xe0cover")
+
+        with patch("backend.api_modular.audiobooks.COVER_DIR", tmp_path):
+            with flask_app.test_client() as client:
+                response = client.get("/covers/abc123.jpg")
+                assert response.status_code == 200
+                etag = response.headers["ETag"]
+                cache_control = response.headers["Cache-Control"]
+
+                revalidated = client.get(
+                    "/covers/abc123.jpg", headers={"If-None-Match": etag}
+                )
+
+        assert "public" in cache_control
+        assert "max-age=31536000" in cache_control
+        assert "immutable" in cache_control
+        assert revalidated.status_code == 304
+
+
 class TestHealthEndpoint:
     """Test the health check endpoint."""
 
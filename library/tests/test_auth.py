@@ -41,6 +41,7 @@ from auth import (
     InboxStatus,
     PendingRegistration,
     PendingRegistrationRepository,
+    AccessRequestRepository,
     hash_token,
     generate_session_token,
     # Backup codes
@@ -138,6 +139,99 @@ class TestAuthDatabase:
                 key = f.read().strip()
             assert len(key) == 64  # 256 bits as hex
 
+    def test_connection_reused_per_thread(self, temp_db):
+        """Test a thread reuses its connection and other threads get their own."""
+        import threading
+
+        with temp_db.connection() as first:
+            pass
+        with temp_db.connection() as second:
+            assert second is first
+
+        other = []
+
+        def use_connection():
+            with temp_db.connection() as conn:
+                other.append(conn)
+
+        thread = threading.Thread(target=use_connection)
+        thread.start()
+        thread.join()
+        assert other[0] is not first
+
+        temp_db.close()
+        with temp_db.connection() as reopened:
+            assert reopened is not first
+
+    def test_nested_connection_rolls_back_as_one(self, temp_db):
+        """Test an error in a nested block rolls back the outer block's work."""
+        with pytest.raises(RuntimeError):
+            with temp_db.connection() as conn:
+                conn.execute(
+                    "INSERT INTO users (username, auth_type, auth_credential) "
+                    "VALUES ('nested', 'totp', x'00')"
+                )
+                with temp_db.connection():
+                    raise RuntimeError("boom")
+
+        with temp_db.connection() as conn:
+            count = conn.execute(
+                "SELECT COUNT(*) FROM users WHERE username = 'nested'"
+            ).fetchone()[0]
+        assert count == 0
+
+    def test_caught_nested_failure_undoes_only_inner_writes(self, temp_db):
+        """Test a caught error in a nested block rolls back just that block."""
+        insert = (
+            "INSERT INTO users (username, auth_type, auth_credential) "
+            "VALUES (?, 'totp', x'00')"
+        )
+        with temp_db.connection() as conn:
+            conn.execute(insert, ('outer',))
+            try:
+                with temp_db.connection() as inner:
+                    inner.execute(insert, ('inner',))
+                    raise RuntimeError("boom")
+            except RuntimeError:
+                pass
+
+        with temp_db.connection() as conn:
+            names = {
+                row[0] for row in conn.execute("SELECT username FROM users")
+            }
+        assert names == {'outer'}
+
+    def test_nested_block_does_not_commit_outer_early(self, temp_db):
+        """Test an inner block's writes wait for the outer block to commit."""
+        with pytest.raises(RuntimeError):
+            with temp_db.connection() as conn:
+                conn.execute("SELECT 1")
+                with temp_db.connection() as inner:
+                    inner.execute(
+                        "INSERT INTO users (username, auth_type, auth_credential) "
+                        "VALUES ('early', 'totp', x'00')"
+                    )
+                raise RuntimeError("boom")
+
+        with temp_db.connection() as conn:
+            count = conn.execute(
+                "SELECT COUNT(*) FROM users WHERE username = 'early'"
+            ).fetchone()[0]
+        assert count == 0
+
+    def test_close_refused_inside_block(self, temp_db):
+        """Test close() cannot pull the connection out from under a block."""
+        from auth.database import AuthDatabaseError
+
+        with temp_db.connection() as conn:
+            with pytest.raises(AuthDatabaseError):
+                temp_db.close()
+            conn.execute("SELECT 1")
+
+        temp_db.close()
+        with temp_db.connection() as conn:
+            assert conn.execute("SELECT 1").fetchone() == (1,)
+
 
 class TestUserModel:
     """Tests for User model and repository."""
@@ -179,6 +273,23 @@ class TestUserModel:
         not_found = repo.get_by_username('nonexistent')
         assert not_found is None
 
+    def test_user_repository_get_by_ids(self, temp_db):
+        """Test fetching several users at once, skipping unknown IDs."""
+        users = [
+            User(username=f'batch{i}', auth_type=AuthType.TOTP, auth_credential=b'secret')
+            for i in range(3)
+        ]
+        for user in users:
+            user.save(temp_db)
+
+        repo = UserRepository(temp_db)
+        found = repo.get_by_ids([users[0].id, users[2].id, users[0].id, 99999])
+        assert {uid: u.username for uid, u in found.items()} == {
+            users[0].id: 'batch0',
+            users[2].id: 'batch2',
+        }
+        assert repo.get_by_ids([]) == {}
+
     def test_username_case_sensitive(self, temp_db):
         """Test that usernames are case-sensitive."""
         user = User(username='CaseSensitive', auth_type=AuthType.TOTP, auth_credential=b'secret')
@@ -267,6 +378,40 @@ class TestSessionModel:
         not_found = repo.get_by_token('invalid_token')
         assert not_found is None
 
+    def test_session_lookup_with_user(self, temp_db):
+        """Test fetching a session and its user in one call."""
+        user = User(username='joined1', auth_type=AuthType.TOTP, auth_credential=b'secret')
+        user.save(temp_db)
+
+        session, token = Session.create_for_user(temp_db, user.id)
+        repo = SessionRepository(temp_db)
+
+        found_session, found_user = repo.get_with_user(token)
+        assert found_session.id == session.id
+        assert found_session.last_seen == session.last_seen
+        assert found_user.id == user.id
+        assert found_user.username == 'joined1'
+
+        assert repo.get_with_user('invalid_token') is None
+
+    def test_session_lookup_drops_stale(self, temp_db):
+        """Test the grace period check removes idle sessions during lookup."""
+        user = User(username='staleuser1', auth_type=AuthType.TOTP, auth_credential=b'secret')
+        user.save(temp_db)
+
+        session, token = Session.create_for_user(temp_db, user.id)
+        repo = SessionRepository(temp_db)
+        session.touch(temp_db)
+        assert repo.get_with_user(token, grace_minutes=30) is not None
+
+        idle = (datetime.now() - timedelta(minutes=31)).isoformat()
+        with temp_db.connection() as conn:
+            conn.execute("UPDATE sessions SET last_seen = ? WHERE id = ?", (idle, session.id))
+
+        assert repo.get_with_user(token) is not None
+        assert repo.get_with_user(token, grace_minutes=30) is None
+        assert repo.get_by_token(token) is None
+
     def test_session_touch(self, temp_db):
         """Test updating last_seen timestamp."""
         user = User(username='touchuser1', auth_type=AuthType.TOTP, auth_credential=b'secret')
@@ -399,6 +544,16 @@ class TestNotificationModel:
         # Should not see it anymore
         assert len(repo.get_active_for_user(user.id)) == 0
 
+    def test_notification_repository_delete(self, temp_db):
+        """Test deleting a notification by ID."""
+        notif = Notification(message='Delete me', type=NotificationType.INFO)
+        notif.save(temp_db)
+
+        repo = NotificationRepository(temp_db)
+        assert repo.delete(notif.id) is True
+        assert repo.list_all() == []
+        assert repo.delete(notif.id) is False
+
     def test_notification_expiry(self, temp_db):
         """Test notification expiry filtering."""
         user = User(username='expire1', auth_type=AuthType.TOTP, auth_credential=b'secret')
@@ -534,6 +689,21 @@ class TestPendingRegistration:
         assert reg.is_expired()
 
 
+class TestAccessRequestRepository:
+    """Tests for AccessRequestRepository."""
+
+    def test_table_checked_once_per_database(self, temp_db, monkeypatch):
+        """Test per-request repositories don't re-run the table migration."""
+        AccessRequestRepository(temp_db).create('first1', hash_token('claim1'))
+
+        def fail_ensure(self):
+            raise AssertionError("access_requests table already ensured")
+
+        monkeypatch.setattr(AccessRequestRepository, "_ensure_table", fail_ensure)
+        repo = AccessRequestRepository(temp_db)
+        assert repo.get_by_username('first1') is not None
+
+
 class TestTokenHashing:
     """Tests for token hashing utilities."""
 
@@ -278,6 +278,20 @@ class TestLogin:
         assert data['user']['username'] == 'testuser1'
         assert 'Set-Cookie' in r.headers
 
+    def test_login_cookie_attributes(self, client, auth_app):
+        """Test the session cookie flags, with Max-Age only for remember_me."""
+        auth = TOTPAuthenticator(auth_app.test_user_secret)
+        r = client.post('/auth/login',
+            json={"username": "testuser1", "code": auth.current_code()})
+        cookie = r.headers['Set-Cookie']
+        assert cookie.startswith('audiobooks_session=')
+        assert '; HttpOnly; Path=/; SameSite=Lax' in cookie
+        assert 'Max-Age' not in cookie
+
+        r = client.post('/auth/login', json={"username": "testuser1",
+            "code": auth.current_code(), "remember_me": True})
+        assert r.headers['Set-Cookie'].endswith('; Max-Age=31536000')
+
     def test_login_wrong_code(self, client):
         """Test login fails with wrong TOTP code."""
         r = client.post('/auth/login',
@@ -298,6 +312,23 @@ class TestLogin:
         # Should not reveal if user exists
         assert 'Invalid credentials' in data['error']
 
+    def test_login_unknown_user_still_verifies_code(self, client, monkeypatch):
+        """Test unknown users go through TOTP verification like real ones."""
+        from api_modular import auth as auth_module
+
+        checked = []
+
+        def always_valid(secret, code):
+            checked.append(secret)
+            return True
+
+        monkeypatch.setattr(auth_module, "verify_totp", always_valid)
+        r = client.post('/auth/login',
+            json={"username": "nonexistent", "code": "123456"})
+
+        assert r.status_code == 401
+        assert checked == [auth_module._DUMMY_TOTP_SECRET]
+
     def test_login_missing_fields(self, client):
         """Test login fails with missing fields."""
         r = client.post('/auth/login', json={"username": "testuser1"})
@@ -312,6 +343,13 @@ class TestLogin:
         # 415 Unsupported Media Type when no JSON body
         assert r.status_code in (400, 415)
 
+    def test_login_malformed_body(self, client):
+        """Test an unparseable body gets the JSON error, not an HTML page."""
+        r = client.post('/auth/login', data='{"username":',
+            content_type='application/json')
+        assert r.status_code == 400
+        assert r.get_json()['error'] == 'Request body required'
+
 
 class TestLogout:
     """Tests for /auth/logout endpoint."""
@@ -328,6 +366,8 @@ class TestLogout:
         assert r.status_code == 200
         assert r.get_json()['success'] is True
 
+        assert 'Max-Age=0' in r.headers['Set-Cookie']
+
         # Verify logged out
         r = client.get('/auth/check')
         assert r.get_json()['authenticated'] is False
@@ -390,6 +430,21 @@ class TestRegistration:
         assert r.status_code == 400
         assert 'at most 16' in r.get_json()['error']
 
+    @pytest.mark.parametrize("username", ["bad<name", "back\\slash", "tab\tname", "caféuser"])
+    def test_registration_username_invalid_characters(self, client, username):
+        """Test non-printable, non-ASCII and HTML-ish characters are rejected."""
+        r = client.post('/auth/register/start', json={"username": username})
+        assert r.status_code == 400
+        assert 'invalid characters' in r.get_json()['error']
+
+    @pytest.mark.parametrize("email", ["a.b@", "@example.com", "user@host", "us er@example.com"])
+    def test_registration_invalid_contact_email(self, client, email):
+        """Test malformed contact emails are rejected."""
+        r = client.post('/auth/register/start',
+            json={"username": "mailcheck1", "contact_email": email})
+        assert r.status_code == 400
+        assert 'Invalid email' in r.get_json()['error']
+
     def test_registration_duplicate_username(self, client):
         """Test registration fails for existing username."""
         r = client.post('/auth/register/start',
@@ -397,6 +452,31 @@ class TestRegistration:
         assert r.status_code == 400
         assert 'already taken' in r.get_json()['error']
 
+    def test_failed_claim_leaves_no_user(self, client, auth_app, monkeypatch):
+        """Test a claim that fails part way can be retried from scratch."""
+        from auth.backup_codes import BackupCodeRepository
+
+        r = client.post('/auth/register/start', json={"username": "atomicclaim"})
+        start = r.get_json()
+        admin_client = auth_app.test_client()
+        admin_auth = TOTPAuthenticator(auth_app.admin_secret)
+        admin_client.post('/auth/login',
+            json={"username": "adminuser", "code": admin_auth.current_code()})
+        admin_client.post(f"/auth/admin/access-requests/{start['request_id']}/approve")
+
+        def fail_codes(self, user_id):
+            raise RuntimeError("disk full")
+
+        claim = {"username": "atomicclaim", "claim_token": start['claim_token']}
+        with monkeypatch.context() as m:
+            m.setattr(BackupCodeRepository, "create_codes_for_user", fail_codes)
+            with pytest.raises(RuntimeError):
+                client.post('/auth/register/claim', json=claim)
+
+        assert UserRepository(auth_app.auth_db).get_by_username("atomicclaim") is None
+        r = client.post('/auth/register/claim', json=claim)
+        assert r.status_code == 200
+
     def test_registration_full_flow(self, client, auth_app):
         """Test complete registration flow: start -> approve -> claim -> login."""
         data = _register_and_claim(client, auth_app, "flowuser1")
@@ -421,6 +501,24 @@ class TestRegistration:
             json={"username": "nobody", "claim_token": "XXXX-XXXX-XXXX-XXXX"})
         assert r.status_code == 404
 
+    def test_credential_responses_not_cached(self, client, auth_app):
+        """Test responses carrying TOTP secrets and QR codes are never cached."""
+        r = client.post('/auth/register/start', json={"username": "nocache1"})
+        request_id = r.get_json()['request_id']
+        claim_token = r.get_json()['claim_token']
+
+        admin_client = auth_app.test_client()
+        admin_auth = TOTPAuthenticator(auth_app.admin_secret)
+        admin_client.post('/auth/login',
+            json={"username": "adminuser", "code": admin_auth.current_code()})
+        admin_client.post(f'/auth/admin/access-requests/{request_id}/approve')
+
+        r = client.post('/auth/register/claim',
+            json={"username": "nocache1", "claim_token": claim_token})
+        assert r.status_code == 200
+        assert 'totp_secret' in r.get_json()
+        assert r.headers['Cache-Control'] == 'no-store'
+
 
 class TestSessionManagement:
     """Tests for session management."""
@@ -453,6 +551,351 @@ class TestSessionManagement:
         assert r.get_json()['authenticated'] is False
 
 
+class TestSessionCache:
+    """Tests for the short-lived session lookup cache."""
+
+    def test_repeat_requests_skip_session_lookup(self, client, auth_app, monkeypatch):
+        """Test a repeat request is answered from the cache."""
+        from auth import SessionRepository
+
+        auth = TOTPAuthenticator(auth_app.test_user_secret)
+        client.post('/auth/login',
+            json={"username": "testuser1", "code": auth.current_code()})
+        assert client.get('/auth/check').get_json()['authenticated'] is True
+
+        def fail_lookup(self, raw_token, grace_minutes=None):
+            raise AssertionError("session should come from the cache")
+
+        monkeypatch.setattr(SessionRepository, "get_with_user", fail_lookup)
+        r = client.get('/auth/check')
+        assert r.get_json()['username'] == 'testuser1'
+
+    def test_expired_entry_sees_revoked_session(self, client, auth_app, monkeypatch):
+        """Test sessions revoked outside the API drop out once entries expire."""
+        from api_modular import auth as auth_module
+        from auth import SessionRepository
+
+        auth = TOTPAuthenticator(auth_app.test_user_secret)
+        client.post('/auth/login',
+            json={"username": "testuser1", "code": auth.current_code()})
+        assert client.get('/auth/check').get_json()['authenticated'] is True
+
+        user = UserRepository(auth_app.auth_db).get_by_username('testuser1')
+        SessionRepository(auth_app.auth_db).invalidate_user_sessions(user.id)
+
+        monkeypatch.setattr(auth_module, "SESSION_CACHE_TTL", 0)
+        assert client.get('/auth/check').get_json()['authenticated'] is False
+
+
+class TestCurrentUserMemo:
+    """Tests for per-request memoization of the current user and session."""
+
+    def test_session_lookup_resolves_user_once(self, auth_app):
+        """Test get_current_session resolves the user, then both are memoized."""
+        from flask import g
+
+        from api_modular.auth import get_current_session, get_current_user
+
+        with auth_app.test_request_context("/"):
+            assert get_current_session() is None
+            assert g._current_user is None
+            g._current_user = marker = object()
+            assert get_current_user() is marker
+
+    def test_foreign_cookies_not_parsed(self, auth_app):
+        """Test requests without our session cookie skip cookie parsing."""
+        from flask import request
+
+        from api_modular.auth import get_current_user
+
+        with auth_app.test_request_context("/", headers={"Cookie": "theme=dark"}):
+            assert get_current_user() is None
+            assert "cookies" not in request.__dict__
+
+
+class TestSessionTouch:
+    """Tests for coalescing session last_seen updates."""
+
+    def test_touch_skipped_when_recent(self, client, auth_app, monkeypatch):
+        """Test last_seen is only rewritten once it has drifted."""
+        from datetime import datetime, timedelta
+
+        from api_modular import auth as auth_module
+        from auth import Session
+
+        touches = []
+        original_touch = Session.touch
+
+        def counting_touch(self, db):
+            touches.append(self.id)
+            original_touch(self, db)
+
+        monkeypatch.setattr(Session, "touch", counting_touch)
+        monkeypatch.setattr(auth_module, "SESSION_CACHE_TTL", 0)
+
+        auth = TOTPAuthenticator(auth_app.test_user_secret)
+        client.post('/auth/login',
+            json={"username": "testuser1", "code": auth.current_code()})
+        assert client.get('/auth/check').get_json()['authenticated'] is True
+        assert touches == []
+
+        earlier = (datetime.now() - timedelta(minutes=5)).isoformat()
+        with auth_app.auth_db.connection() as conn:
+            conn.execute("UPDATE sessions SET last_seen = ?", (earlier,))
+        assert client.get('/auth/check').get_json()['authenticated'] is True
+        assert len(touches) == 1
+
+    def test_touch_when_local_time_behind_utc(self, client, auth_app, monkeypatch):
+        """Test last_seen stays current when local time is behind UTC."""
+        import time
+        from datetime import datetime, timedelta
+
+        from api_modular import auth as auth_module
+        from auth import Session
+
+        touches = []
+        original_touch = Session.touch
+
+        def counting_touch(self, db):
+            touches.append(self.id)
+            original_touch(self, db)
+
+        monkeypatch.setattr(Session, "touch", counting_touch)
+        monkeypatch.setattr(auth_module, "SESSION_CACHE_TTL", 0)
+        monkeypatch.setenv("TZ", "EST+05")
+        time.tzset()
+        try:
+            auth = TOTPAuthenticator(auth_app.test_user_secret)
+            client.post('/auth/login',
+                json={"username": "testuser1", "code": auth.current_code()})
+
+            # New sessions record local time, not the UTC column default
+            with auth_app.auth_db.connection() as conn:
+                session_id, last_seen = conn.execute(
+                    "SELECT id, last_seen FROM sessions ORDER BY id DESC LIMIT 1"
+                ).fetchone()
+            age = datetime.now() - datetime.fromisoformat(last_seen)
+            assert timedelta(0) <= age < timedelta(minutes=1)
+
+            # A UTC value read as local time lies in the future; rewrite it
+            ahead = (datetime.now() + timedelta(hours=5)).isoformat()
+            with auth_app.auth_db.connection() as conn:
+                conn.execute("UPDATE sessions SET last_seen = ? WHERE id = ?",
+                             (ahead, session_id))
+            assert client.get('/auth/check').get_json()['authenticated'] is True
+            assert len(touches) == 1
+        finally:
+            monkeypatch.delenv("TZ")
+            time.tzset()
+
+
+class TestAuthTypeLookup:
+    """Tests for the login page's auth type lookup."""
+
+    @pytest.fixture
+    def lookups(self, monkeypatch):
+        """Record usernames looked up in the auth database."""
+        from api_modular.auth import clear_auth_type_cache
+
+        calls = []
+        original = UserRepository.get_by_username
+
+        def counting(self, username):
+            calls.append(username)
+            return original(self, username)
+
+        monkeypatch.setattr(UserRepository, "get_by_username", counting)
+        clear_auth_type_cache()
+        yield calls
+        clear_auth_type_cache()
+
+    def test_auth_type_cached(self, client, lookups):
+        """Test repeat lookups for a username are answered from the cache."""
+        for _ in range(3):
+            r = client.post('/auth/login/auth-type', json={"username": "testuser1"})
+            assert r.get_json() == {"auth_type": "totp"}
+        r = client.post('/auth/login/auth-type', json={"username": "nobody-here"})
+        assert r.get_json() == {"auth_type": "totp"}
+
+        assert lookups == ["testuser1", "nobody-here"]
+
+    def test_state_change_clears_cache(self, client, lookups):
+        """Test auth changes made through the blueprint aren't served stale."""
+        client.post('/auth/login/auth-type', json={"username": "testuser1"})
+        client.post('/auth/logout')
+        client.post('/auth/login/auth-type', json={"username": "testuser1"})
+
+        assert lookups == ["testuser1", "testuser1"]
+
+
+class TestLocalhostOnly:
+    """Tests for the localhost_only decorator."""
+
+    @pytest.mark.parametrize("remote_addr,forwarded,allowed", [
+        ("127.0.0.1", None, True),
+        ("::1", None, True),
+        ("10.0.0.5", None, False),
+        ("10.0.0.5", "127.0.0.1, 10.0.0.5", True),
+        ("10.0.0.5", " 192.168.1.9 ,127.0.0.1", False),
+        ("10.0.0.5", "", False),
+    ])
+    def test_access(self, auth_app, remote_addr, forwarded, allowed):
+        """Test loopback clients pass, directly or via X-Forwarded-For."""
+        from api_modular.auth import localhost_only
+
+        view = localhost_only(lambda: "ok")
+        headers = {} if forwarded is None else {"X-Forwarded-For": forwarded}
+        with auth_app.test_request_context(
+            "/", environ_base={"REMOTE_ADDR": remote_addr}, headers=headers
+        ):
+            result = view()
+
+        if allowed:
+            assert result == "ok"
+        else:
+            assert result[1] == 404
+
+
+class TestConfigCaching:
+    """Tests for settings read once per process."""
+
+    def test_smtp_config_read_once(self, auth_app, monkeypatch):
+        """Test SMTP settings are parsed once and then reused."""
+        from api_modular.auth import _smtp_config
+
+        _smtp_config.cache_clear()
+        monkeypatch.setenv("SMTP_PORT", "2525")
+        monkeypatch.delenv("ADMIN_EMAIL", raising=False)
+        monkeypatch.setenv("SMTP_FROM", "from@example.com")
+        try:
+            config = _smtp_config()
+            assert config.port == 2525
+            assert config.admin_email == "from@example.com"
+            monkeypatch.setenv("SMTP_PORT", "587")
+            assert _smtp_config() is config
+        finally:
+            _smtp_config.cache_clear()
+
+    def test_webauthn_config_cached(self, auth_app):
+        """Test the WebAuthn relying party settings are worked out once."""
+        from api_modular.auth import get_webauthn_config
+
+        assert get_webauthn_config() is get_webauthn_config()
+
+
+class TestOutgoingEmail:
+    """Tests for building notification emails and reusing SMTP connections."""
+
+    @pytest.fixture
+    def fake_smtp(self, monkeypatch):
+        """Replace smtplib.SMTP in the auth module with a recording fake."""
+        import smtplib
+
+        from api_modular import auth as auth_module
+
+        class FakeSMTP:
+            opened: list = []
+
+            def __init__(self, host, port):
+                self.sent = []
+                self.alive = True
+                self.handshakes = []
+                FakeSMTP.opened.append(self)
+
+            def starttls(self):
+                self.handshakes.append("starttls")
+
+            def login(self, user, password):
+                self.handshakes.append("login")
+
+            def noop(self):
+                if not self.alive:
+                    raise smtplib.SMTPServerDisconnected()
+                return (250, b"OK")
+
+            def sendmail(self, sender, to, msg):
+                self.sent.append(msg)
+
+            def quit(self):
+                self.alive = False
+
+            def close(self):
+                self.alive = False
+
+        monkeypatch.setattr(auth_module.smtplib, "SMTP", FakeSMTP)
+        monkeypatch.setattr(auth_module, "_smtp_pool", {})
+        monkeypatch.setenv("SMTP_USER", "mailer")
+        monkeypatch.delenv("SMTP_PASS", raising=False)
+        auth_module._smtp_config.cache_clear()
+        yield FakeSMTP
+        auth_module._smtp_config.cache_clear()
+
+    def test_connection_reused(self, auth_app, fake_smtp):
+        """Test consecutive sends share one connection and handshake."""
+        from api_modular.auth import _send_admin_alert
+
+        with auth_app.app_context():
+            assert _send_admin_alert("a", "first") is True
+            assert _send_admin_alert("b", "second") is True
+
+        assert len(fake_smtp.opened) == 1
+        server = fake_smtp.opened[0]
+        assert server.handshakes == ["starttls"]
+        assert len(server.sent) == 2
+
+    def test_dead_connection_replaced(self, auth_app, fake_smtp):
+        """Test a connection dropped by the server is not reused."""
+        from api_modular.auth import _send_admin_alert
+
+        with auth_app.app_context():
+            assert _send_admin_alert("a", "first") is True
+            fake_smtp.opened[0].alive = False
+            assert _send_admin_alert("b", "second") is True
+
+        assert len(fake_smtp.opened) == 2
+        assert fake_smtp.opened[1].sent
+
+    def test_admin_alert_is_single_part(self, auth_app, fake_smtp):
+        """Test plain-text alerts aren't wrapped in a multipart container."""
+        from api_modular.auth import _send_admin_alert
+
+        with auth_app.app_context():
+            assert _send_admin_alert("alice", "hello") is True
+
+        message = fake_smtp.opened[0].sent[0]
+        assert b"Content-Type: text/plain" in message
+        assert b"multipart" not in message
+        assert b"alice" in message
+        assert b"\n" not in message.replace(b"\r\n", b"")
+
+
+class TestOptionalAuthStripping:
+    """Tests for dropping pass-through auth wrappers in single-user apps."""
+
+    @staticmethod
+    def _view(app, name):
+        return next(
+            view for endpoint, view in app.view_functions.items()
+            if endpoint.endswith("." + name)
+        )
+
+    def test_single_user_app_calls_views_directly(self, flask_app):
+        """Test *_if_enabled wrappers are skipped, other decorators kept."""
+        assert not hasattr(self._view(flask_app, "get_duplicates"), "__wrapped__")
+        # localhost_only sits on top of admin_if_enabled and must stay
+        services = self._view(flask_app, "get_services_status")
+        assert hasattr(services, "__wrapped__")
+        with flask_app.test_request_context(
+            "/", environ_base={"REMOTE_ADDR": "10.0.0.5"}
+        ):
+            assert services()[1] == 404
+
+    def test_auth_app_keeps_checks(self, client, auth_app):
+        """Test apps with auth enabled still require login."""
+        assert hasattr(self._view(auth_app, "get_duplicates"), "__wrapped__")
+        assert client.get('/api/duplicates').status_code == 401
+
+
 class TestAuthHealth:
     """Tests for /auth/health endpoint."""
 
@@ -527,6 +970,27 @@ class TestBackupCodeRecovery:
         assert r.status_code == 401
         assert 'Invalid' in r.get_json()['error']
 
+    def test_recover_unknown_user_still_checks_code(self, client, auth_app, monkeypatch):
+        """Test unknown usernames run the same code lookup as known ones."""
+        from auth.backup_codes import BackupCodeRepository
+
+        calls = []
+        original = BackupCodeRepository.verify_and_consume
+
+        def record(self, user_id, code):
+            calls.append(user_id)
+            return original(self, user_id, code)
+
+        monkeypatch.setattr(BackupCodeRepository, "verify_and_consume", record)
+        r = client.post('/auth/recover/backup-code',
+            json={
+                "username": "nosuchuser",
+                "backup_code": "XXXX-XXXX-XXXX-XXXX"
+            })
+
+        assert r.status_code == 401
+        assert calls == [0]
+
     def test_recover_backup_code_single_use(self, client, auth_app):
         """Test backup code can only be used once."""
         data = _register_and_claim(client, auth_app, "rectest3")
@@ -941,6 +1405,28 @@ class TestMagicLinkRequest:
         assert data['success'] is True
         # Email won't actually send in test (no SMTP), but endpoint succeeds
 
+    def test_magic_link_sent_off_request_thread(self, auth_app, monkeypatch):
+        """Test outside dev mode, email tasks run on the worker pool in app context."""
+        import threading
+
+        from flask import current_app
+
+        from api_modular.auth import _run_in_background
+
+        monkeypatch.setitem(auth_app.config, "AUTH_DEV_MODE", False)
+        done = threading.Event()
+        seen = []
+
+        def task():
+            seen.append((threading.current_thread(), current_app.name))
+            done.set()
+
+        with auth_app.app_context():
+            _run_in_background(task)
+        assert done.wait(5)
+        assert seen[0][0].name.startswith("auth-background")
+        assert seen[0][1] == auth_app.name
+
 
 class TestMagicLinkVerify:
     """Tests for /auth/magic-link/verify endpoint."""
@@ -958,6 +1444,18 @@ class TestMagicLinkVerify:
         assert r.status_code == 400
         assert 'Invalid or expired' in r.get_json()['error']
 
+    def test_magic_link_verify_wrong_length_skips_lookup(self, client, monkeypatch):
+        """Test tokens of the wrong length are rejected before the database."""
+        from auth import PendingRecoveryRepository
+
+        def fail_lookup(self, raw_token):
+            raise AssertionError("token lookup should be skipped")
+
+        monkeypatch.setattr(PendingRecoveryRepository, "get_by_token", fail_lookup)
+        r = client.post('/auth/magic-link/verify', json={"token": "a" * 500})
+        assert r.status_code == 400
+        assert 'Invalid or expired' in r.get_json()['error']
+
     def test_magic_link_verify_creates_session(self, client, auth_app):
         """Test successful magic link verification creates a session."""
         _register_and_claim(client, auth_app, "verifuser1",
@@ -1011,6 +1509,27 @@ class TestMagicLinkVerify:
         assert r.status_code == 400
         assert 'already been used' in r.get_json()['error']
 
+    def test_magic_link_failed_login_keeps_token(self, client, auth_app, monkeypatch):
+        """Test a login that fails part way doesn't use up the link."""
+        _register_and_claim(client, auth_app, "atomicml1",
+            recovery_email="atomic@example.com")
+
+        from auth import PendingRecovery
+        db = auth_app.auth_db
+        user = UserRepository(db).get_by_username("atomicml1")
+        recovery, raw_token = PendingRecovery.create(db, user.id, expiry_minutes=15)
+
+        def fail_save(self, db):
+            raise RuntimeError("disk full")
+
+        with monkeypatch.context() as m:
+            m.setattr(User, "save", fail_save)
+            with pytest.raises(RuntimeError):
+                client.post('/auth/magic-link/verify', json={"token": raw_token})
+
+        r = client.post('/auth/magic-link/verify', json={"token": raw_token})
+        assert r.status_code == 200
+
     def test_magic_link_expired_token(self, client, auth_app):
         """Test magic link verify fails with expired token."""
         _register_and_claim(client, auth_app, "expireuser",
@@ -1189,6 +1708,19 @@ class TestAdminNotificationsEndpoints:
         assert r.status_code == 400
         assert 'target_user_id' in r.get_json()['error'].lower()
 
+    @pytest.mark.parametrize("notif_type", ["bogus", "INFO", ["info"]])
+    def test_create_notification_invalid_type(self, client, auth_app, notif_type):
+        """Test unknown notification types are rejected."""
+        auth = TOTPAuthenticator(auth_app.admin_secret)
+        client.post('/auth/login',
+            json={"username": "adminuser", "code": auth.current_code()})
+
+        r = client.post('/auth/admin/notifications',
+            json={"message": "Hello", "type": notif_type})
+
+        assert r.status_code == 400
+        assert r.get_json()['error'] == "Invalid notification type"
+
     def test_delete_notification_requires_admin(self, client, auth_app):
         """Test deleting notification requires admin."""
         auth = TOTPAuthenticator(auth_app.test_user_secret)
@@ -1247,6 +1779,10 @@ class TestAdminInboxEndpoints:
         data = r.get_json()
         assert 'messages' in data
         assert 'unread_count' in data
+        assert data['total'] >= len(data['messages'])
+
+        r = client.get('/auth/admin/inbox?limit=0')
+        assert r.get_json()['messages'] == []
 
     def test_inbox_read_message_requires_admin(self, client, auth_app):
         """Test reading inbox message requires admin."""
@@ -48,6 +48,42 @@ class TestGetDuplicates:
         assert "total_wasted_mb" in data or "total_wasted_space_mb" in data
 
 
+class TestStreamJsonList:
+    """Test the streamed JSON list helper used by the duplicate listings."""
+
+    def test_streams_items_then_trailer(self, flask_app):
+        """Test the body is valid JSON with totals gathered during iteration."""
+        import json
+
+        from backend.api_modular.core import stream_json_list
+
+        seen = []
+
+        def items():
+            for i in range(3):
+                seen.append(i)
+                yield {"n": i}
+
+        with flask_app.app_context():
+            response = stream_json_list("rows", items(), lambda: {"total": len(seen)})
+            assert response.is_streamed
+            body = b"".join(response.response)
+
+        assert json.loads(body) == {"rows": [{"n": 0}, {"n": 1}, {"n": 2}], "total": 3}
+
+    def test_empty_list_without_orjson(self, flask_app):
+        """Test the stdlib fallback encoder produces the same document."""
+        import json
+
+        from backend.api_modular import core
+
+        with patch.object(core, "orjson", None), flask_app.app_context():
+            response = core.stream_json_list("rows", iter(()), lambda: {"total": 0})
+            body = b"".join(response.response)
+
+        assert json.loads(body) == {"rows": [], "total": 0}
+
+
 class TestGetDuplicatesByTitle:
     """Test the get_duplicates_by_title endpoint."""
 
@@ -217,6 +253,64 @@ class TestVerifyDeletion:
 
         assert response.status_code == 400
 
+    def test_non_integer_ids_returns_400(self, flask_app):
+        """Test returns 400 when ids are not integers."""
+        with flask_app.test_client() as client:
+            response = client.post(
+                "/api/duplicates/verify", json={"audiobook_ids": [1, "2"]}
+            )
+
+        assert response.status_code == 400
+
+    def test_oversized_ids_returns_400(self, flask_app):
+        """Test returns 400 when more ids are sent than allowed."""
+        from backend.api_modular.duplicates import MAX_AUDIOBOOK_IDS
+
+        ids = list(range(MAX_AUDIOBOOK_IDS + 1))
+        with flask_app.test_client() as client:
+            response = client.post("/api/duplicates/verify", json={"audiobook_ids": ids})
+
+        assert response.status_code == 400
+
+    def test_ids_beyond_one_chunk(self, flask_app):
+        """Test lists larger than one IN (...) chunk are checked in full."""
+        from backend.api_modular.duplicates import IN_CHUNK_SIZE
+
+        ids = list(range(-2 * IN_CHUNK_SIZE, 0))
+        with flask_app.test_client() as client:
+            response = client.post("/api/duplicates/verify", json={"audiobook_ids": ids})
+
+        assert response.status_code == 200
+        assert response.get_json()["safe_ids"] == []
+
+
+class TestInChunks:
+    """Test the chunked IN (...) query helper."""
+
+    def test_merges_rows_across_chunks(self, tmp_path):
+        """Test every chunk is queried and extra parameters bound first."""
+        import sqlite3
+
+        from backend.api_modular.duplicates import IN_CHUNK_SIZE, _in_chunks
+
+        conn = sqlite3.connect(tmp_path / "chunks.db")
+        conn.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, tag TEXT)")
+        conn.executemany(
+            "INSERT INTO t VALUES (?, ?)",
+            [(i, "even" if i % 2 == 0 else "odd") for i in range(2 * IN_CHUNK_SIZE + 5)],
+        )
+        cursor = conn.cursor()
+
+        rows = _in_chunks(
+            cursor,
+            "SELECT id FROM t WHERE tag = ? AND id IN ({})",
+            list(range(2 * IN_CHUNK_SIZE + 5)),
+            extra=("even",),
+        )
+        conn.close()
+
+        assert sorted(r[0] for r in rows) == list(range(0, 2 * IN_CHUNK_SIZE + 5, 2))
+
 
 class TestRemoveFromIndexes:
     """Test the remove_from_indexes helper function."""
@@ -250,6 +344,92 @@ class TestRemoveFromIndexes:
         assert isinstance(result, dict)
 
 
+class TestHasColumn:
+    """Test the cached _has_column helper."""
+
+    def test_caches_and_refreshes_on_miss(self, tmp_path):
+        """Test the column list is cached but re-read when a column is missing."""
+        import sqlite3
+
+        from backend.api_modular.duplicates import _columns_cache, _has_column
+
+        db_path = tmp_path / "cols.db"
+        conn = sqlite3.connect(db_path)
+        conn.row_factory = sqlite3.Row
+        conn.execute("CREATE TABLE audiobooks (id INTEGER PRIMARY KEY)")
+
+        assert not _has_column(conn, db_path, "audiobooks", "sha256_hash")
+
+        conn.execute("ALTER TABLE audiobooks ADD COLUMN sha256_hash TEXT")
+        assert _has_column(conn, db_path, "audiobooks", "sha256_hash")
+        assert "sha256_hash" in _columns_cache[(str(db_path), "audiobooks")]
+
+        # Served from the cache without another PRAGMA
+        mock_conn = MagicMock()
+        assert _has_column(mock_conn, db_path, "audiobooks", "sha256_hash")
+        mock_conn.execute.assert_not_called()
+        conn.close()
+
+
+class TestCleanupAudiobookFolderDuplicates:
+    """Test /Library/Audiobook/ duplicate matching in the cleanup script."""
+
+    def _find(self, rows):
+        import sqlite3
+
+        from scripts.cleanup_audiobook_duplicates import (
+            find_audiobook_folder_duplicates,
+        )
+
+        conn = sqlite3.connect(":memory:")
+        conn.execute(
+            """CREATE TABLE audiobooks (
+                id INTEGER PRIMARY KEY, title TEXT, author TEXT,
+                file_path TEXT, file_size_mb REAL, duration_hours REAL)"""
+        )
+        conn.executemany(
+            "INSERT INTO audiobooks (title, author, file_path, file_size_mb, "
+            "duration_hours) VALUES (?, ?, ?, 1.0, 5.0)",
+            rows,
+        )
+        duplicates, protected = find_audiobook_folder_duplicates(conn)
+        conn.close()
+        return [d["title"] for d in duplicates], [p["title"] for p in protected]
+
+    def test_matches_normalized_title(self):
+        """Test punctuation and ASCII case differences still match."""
+        duplicates, protected = self._find(
+            [
+                ("Dune: Part One", "Frank Herbert", "/Library/Herbert/Dune.opus"),
+                ("DUNE Part One", "Audiobook", "/Library/Audiobook/Dune.opus"),
+            ]
+        )
+        assert duplicates == ["DUNE Part One"]
+        assert protected == []
+
+    def test_null_title_never_matches(self):
+        """Test a NULL title is kept, as NULL = NULL never matched in SQL."""
+        duplicates, protected = self._find(
+            [
+                (None, "Someone", "/Library/Someone/a.opus"),
+                (None, "Audiobook", "/Library/Audiobook/a.opus"),
+            ]
+        )
+        assert duplicates == []
+        assert protected == [None]
+
+    def test_non_ascii_case_is_significant(self):
+        """Test only ASCII letters are folded, like SQLite's LOWER()."""
+        duplicates, protected = self._find(
+            [
+                ("école", "Someone", "/Library/Someone/ecole.opus"),
+                ("ÉCOLE", "Audiobook", "/Library/Audiobook/ecole.opus"),
+            ]
+        )
+        assert duplicates == []
+        assert protected == ["ÉCOLE"]
+
+
 class TestEndpointMethodConstraints:
     """Test that endpoints only respond to correct HTTP methods."""
 
@@ -292,12 +292,30 @@ class TestInboxRepository:
         messages = repo.list_all(include_archived=True)
         assert len(messages) == 2
 
+    def test_list_all_paginated(self, temp_db, test_user):
+        """Test limit/offset pages through messages newest first."""
+        for i in range(5):
+            InboxMessage(
+                from_user_id=test_user.id,
+                message=f"Message {i}",
+                reply_via=ReplyMethod.IN_APP,
+            ).save(temp_db)
+
+        repo = InboxRepository(temp_db)
+        first = repo.list_all(limit=2)
+        rest = repo.list_all(limit=10, offset=2)
+
+        assert [m.message for m in first] == ["Message 4", "Message 3"]
+        assert [m.message for m in rest] == ["Message 2", "Message 1", "Message 0"]
+        assert repo.count_all_and_unread() == (5, 5)
+
     def test_count_unread(self, temp_db, test_user):
         """Test counting unread messages."""
         repo = InboxRepository(temp_db)
 
         # Initially zero
         assert repo.count_unread() == 0
+        assert repo.count_all_and_unread() == (0, 0)
 
         # Add unread messages
         InboxMessage(
@@ -322,6 +340,13 @@ class TestInboxRepository:
 
         assert repo.count_unread() == 1
 
+        # Archived messages only count towards the total when included
+        messages[0].status = InboxStatus.ARCHIVED
+        messages[0].save(temp_db)
+
+        assert repo.count_all_and_unread() == (1, 1)
+        assert repo.count_all_and_unread(include_archived=True) == (2, 1)
+
     def test_list_all_returns_all(self, temp_db, test_user):
         """Test list_all returns all messages."""
         InboxMessage(
@@ -366,6 +366,17 @@ class TestNotificationRepository:
 
         assert len(all_notifs) == 3
 
+    def test_list_all_paginated(self, temp_db):
+        """Test limit/offset pages through notifications newest first."""
+        for i in range(4):
+            Notification(message=f"N{i}", type=NotificationType.INFO).save(temp_db)
+
+        repo = NotificationRepository(temp_db)
+
+        assert [n.message for n in repo.list_all(limit=3)] == ["N3", "N2", "N1"]
+        assert [n.message for n in repo.list_all(limit=3, offset=3)] == ["N0"]
+        assert repo.count_all() == 4
+
     def test_list_all_returns_all(self, temp_db):
         """Test list_all returns all notifications."""
         Notification(message="First", type=NotificationType.INFO).save(temp_db)
@@ -0,0 +1,368 @@
+"""
+Tests for the library database schema and its startup upgrade path.
+
+Covers:
+- Triggers that keep denormalized genre/era/topic names and supplement
+  counts in sync with the junction tables
+- ensure_schema() upgrading databases created before those columns existed
+- The generated mime_type column used for streaming
+- Sort indices being used for ordered, limited listings
+- The covering index behind hash duplicate grouping
+- get_db() only relaxing synchronous writes on WAL databases
+"""
+
+import sqlite3
+
+import pytest
+
+from backend.api_modular.core import SCHEMA_PATH, ensure_schema, get_db
+
+
+@pytest.fixture
+def schema_db(tmp_path):
+    """Fresh database built from schema.sql."""
+    db_path = tmp_path / "schema.db"
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA_PATH.read_text())
+    conn.execute("PRAGMA foreign_keys = ON")
+    yield conn
+    conn.close()
+
+
+def _book(conn, book_id):
+    return conn.execute(
+        "SELECT genre_names, era_names, topic_names, supplement_count "
+        "FROM audiobooks WHERE id = ?",
+        (book_id,),
+    ).fetchone()
+
+
+class TestDenormalizedTriggers:
+    """Test triggers maintaining the denormalized list columns."""
+
+    def test_link_insert_and_delete(self, schema_db):
+        """Test genre/era/topic names follow junction table changes."""
+        cur = schema_db.cursor()
+        cur.execute("INSERT INTO audiobooks (title, file_path) VALUES ('B', '/b.opus')")
+        book_id = cur.lastrowid
+        cur.execute("INSERT INTO genres (id, name) VALUES (1, 'Fantasy'), (2, 'Horror')")
+        cur.execute("INSERT INTO eras (id, name) VALUES (1, 'Modern')")
+        cur.execute("INSERT INTO topics (id, name) VALUES (1, 'Dragons')")
+        cur.execute("INSERT INTO audiobook_genres VALUES (?, 1), (?, 2)", (book_id, book_id))
+        cur.execute("INSERT INTO audiobook_eras VALUES (?, 1)", (book_id,))
+        cur.execute("INSERT INTO audiobook_topics VALUES (?, 1)", (book_id,))
+
+        genres, eras, topics, _ = _book(schema_db, book_id)
+        assert sorted(genres.split("|||")) == ["Fantasy", "Horror"]
+        assert eras == "Modern"
+        assert topics == "Dragons"
+
+        cur.execute("DELETE FROM audiobook_genres WHERE genre_id = 2")
+        assert _book(schema_db, book_id)[0] == "Fantasy"
+
+        cur.execute("UPDATE genres SET name = 'Epic Fantasy' WHERE id = 1")
+        assert _book(schema_db, book_id)[0] == "Epic Fantasy"
+
+        cur.execute("DELETE FROM audiobook_eras")
+        assert _book(schema_db, book_id)[1] is None
+
+    def test_supplement_count(self, schema_db):
+        """Test supplement_count follows supplement inserts, moves and deletes."""
+        cur = schema_db.cursor()
+        cur.execute("INSERT INTO audiobooks (title, file_path) VALUES ('A', '/a.opus')")
+        first = cur.lastrowid
+        cur.execute("INSERT INTO audiobooks (title, file_path) VALUES ('B', '/b.opus')")
+        second = cur.lastrowid
+
+        cur.execute(
+            "INSERT INTO supplements (audiobook_id, type, filename, file_path) "
+            "VALUES (?, 'pdf', 'a.pdf', '/s/a.pdf')",
+            (first,),
+        )
+        assert _book(schema_db, first)[3] == 1
+
+        cur.execute("UPDATE supplements SET audiobook_id = ?", (second,))
+        assert _book(schema_db, first)[3] == 0
+        assert _book(schema_db, second)[3] == 1
+
+        cur.execute("DELETE FROM supplements")
+        assert _book(schema_db, second)[3] == 0
+
+
+class TestMimeType:
+    """Test the generated mime_type column."""
+
+    @pytest.mark.parametrize(
+        "fmt,path,expected",
+        [
+            ("opus", "/a/book.opus", "audio/ogg"),
+            ("m4b", "/a/book.m4b", "audio/mp4"),
+            ("mp3", "/a/book.mp3", "audio/mpeg"),
+            (None, "/a/book.M4A", "audio/mp4"),
+            ("flac", "/a/book.flac", "application/octet-stream"),
+        ],
+    )
+    def test_mime_type_from_format(self, schema_db, fmt, path, expected):
+        """Test mime_type follows format, falling back to the extension."""
+        cur = schema_db.cursor()
+        cur.execute(
+            "INSERT INTO audiobooks (title, file_path, format) VALUES ('M', ?, ?)",
+            (path, fmt),
+        )
+        row = cur.execute(
+            "SELECT mime_type FROM audiobooks WHERE id = ?", (cur.lastrowid,)
+        ).fetchone()
+        assert row[0] == expected
+
+
+class TestNormalizedKeys:
+    """Test the generated duplicate-detection key columns."""
+
+    def test_norm_columns(self, schema_db):
+        """Test title/author normalization matches the duplicate grouping rules."""
+        cur = schema_db.cursor()
+        cur.execute(
+            "INSERT INTO audiobooks (title, author, file_path) "
+            "VALUES ('Dune: Part-One', '  Frank Herbert ', '/d.opus')"
+        )
+        row = cur.execute(
+            "SELECT norm_title, norm_author FROM audiobooks WHERE id = ?",
+            (cur.lastrowid,),
+        ).fetchone()
+        assert row == ("dune partone", "frank herbert")
+
+    def test_format_rank(self, schema_db):
+        """Test format_rank orders formats opus, m4b, m4a, mp3, then others."""
+        cur = schema_db.cursor()
+        for fmt in ("mp3", "flac", "opus", "m4a", "m4b"):
+            cur.execute(
+                "INSERT INTO audiobooks (title, file_path, format) VALUES ('F', ?, ?)",
+                (f"/f.{fmt}", fmt),
+            )
+        formats = [
+            row[0]
+            for row in cur.execute(
+                "SELECT format FROM audiobooks ORDER BY format_rank"
+            )
+        ]
+        assert formats == ["opus", "m4b", "m4a", "mp3", "flac"]
+
+    def test_norm_title_lookup_uses_index(self, schema_db):
+        """Test norm_title lookups probe the index instead of scanning."""
+        plan = schema_db.execute(
+            "EXPLAIN QUERY PLAN SELECT COUNT(*) FROM audiobooks "
+            "WHERE norm_title = ? AND ROUND(duration_hours, 1) = ?",
+            ("x", 1.0),
+        ).fetchall()
+        details = " ".join(row[-1] for row in plan)
+        assert "idx_audiobooks_title_dedup" in details
+
+
+class TestEnsureSchema:
+    """Test ensure_schema() on existing databases."""
+
+    def test_adds_and_backfills_columns(self, tmp_path):
+        """Test an older database gains populated columns and new indices."""
+        db_path = tmp_path / "old.db"
+        conn = sqlite3.connect(db_path)
+        conn.executescript(
+            """
+            CREATE TABLE audiobooks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL, author TEXT, author_last_name TEXT,
+                author_first_name TEXT, narrator TEXT, narrator_last_name TEXT,
+                narrator_first_name TEXT, publisher TEXT, series TEXT,
+                series_sequence REAL, edition TEXT, description TEXT,
+                format TEXT, duration_hours REAL, file_size_mb REAL,
+                file_path TEXT UNIQUE NOT NULL, published_date TEXT,
+                acquired_date TEXT,
+                sha256_hash TEXT, content_type TEXT DEFAULT 'Product',
+                published_year INTEGER, playback_position_ms INTEGER DEFAULT 0,
+                asin TEXT, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            );
+            CREATE TABLE genres (id INTEGER PRIMARY KEY, name TEXT UNIQUE NOT NULL);
+            CREATE TABLE audiobook_genres (audiobook_id INTEGER, genre_id INTEGER,
+                PRIMARY KEY (audiobook_id, genre_id));
+            CREATE TABLE supplements (id INTEGER PRIMARY KEY, audiobook_id INTEGER,
+                type TEXT NOT NULL, filename TEXT NOT NULL,
+                file_path TEXT UNIQUE NOT NULL, file_size_mb REAL);
+            CREATE INDEX idx_audiobooks_series ON audiobooks(series);
+            INSERT INTO audiobooks (id, title, file_path) VALUES (1, 'Old', '/old.opus');
+            INSERT INTO genres VALUES (1, 'Mystery');
+            INSERT INTO audiobook_genres VALUES (1, 1);
+            INSERT INTO supplements (audiobook_id, type, filename, file_path)
+                VALUES (1, 'pdf', 'old.pdf', '/s/old.pdf');
+            """
+        )
+        conn.close()
+
+        ensure_schema(db_path)
+        ensure_schema(db_path)  # idempotent
+
+        conn = sqlite3.connect(db_path)
+        genres, eras, topics, supplements = _book(conn, 1)
+        indices = {
+            row[0]
+            for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index'"
+            )
+        }
+        conn.close()
+        assert "idx_audiobooks_series" not in indices
+        assert "idx_audiobooks_series_sequence" in indices
+        assert "idx_audiobooks_author_last" in indices
+        assert "idx_audiobooks_title_dedup" in indices
+        assert "idx_audiobooks_sha256_cover" in indices
+        conn = sqlite3.connect(db_path)
+        mime_type = conn.execute(
+            "SELECT mime_type FROM audiobooks WHERE id = 1"
+        ).fetchone()[0]
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        conn.close()
+        assert mime_type == "audio/ogg"
+        assert journal_mode == "wal"
+        assert genres == "Mystery"
+        assert eras is None
+        assert topics is None
+        assert supplements == 1
+
+    def test_replaces_fts_update_trigger(self, tmp_path):
+        """Test the original every-UPDATE FTS trigger is narrowed."""
+        db_path = tmp_path / "fts.db"
+        conn = sqlite3.connect(db_path)
+        conn.executescript(SCHEMA_PATH.read_text())
+        conn.executescript(
+            """
+            DROP TRIGGER audiobooks_au;
+            CREATE TRIGGER audiobooks_au AFTER UPDATE ON audiobooks BEGIN
+                UPDATE audiobooks_fts
+                SET title = new.title,
+                    author = new.author,
+                    narrator = new.narrator,
+                    publisher = new.publisher,
+                    series = new.series,
+                    description = new.description
+                WHERE rowid = new.id;
+            END;
+            INSERT INTO audiobooks (id, title, file_path) VALUES (1, 'Old', '/old.opus');
+            """
+        )
+        conn.commit()
+        conn.close()
+
+        ensure_schema(db_path)
+
+        conn = sqlite3.connect(db_path)
+        trigger_sql = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'trigger' "
+            "AND name = 'audiobooks_au'"
+        ).fetchone()[0]
+        conn.execute("UPDATE audiobooks SET title = 'New' WHERE id = 1")
+        matches = conn.execute(
+            "SELECT rowid FROM audiobooks_fts WHERE audiobooks_fts MATCH 'New'"
+        ).fetchall()
+        stale = conn.execute(
+            "SELECT rowid FROM audiobooks_fts WHERE audiobooks_fts MATCH 'Old'"
+        ).fetchall()
+        conn.close()
+        assert "UPDATE OF title" in trigger_sql
+        assert matches == [(1,)]
+        assert stale == []
+
+    def test_rebuilds_stale_fts_index(self, tmp_path):
+        """Test tokens left behind by the original triggers are dropped once."""
+        db_path = tmp_path / "stale.db"
+        conn = sqlite3.connect(db_path)
+        conn.executescript(SCHEMA_PATH.read_text())
+        conn.executescript(
+            """
+            DROP TRIGGER audiobooks_ad;
+            CREATE TRIGGER audiobooks_ad AFTER DELETE ON audiobooks BEGIN
+                DELETE FROM audiobooks_fts WHERE rowid = old.id;
+            END;
+            INSERT INTO audiobooks (id, title, author, file_path)
+                VALUES (1, 'Book', 'Alice Smith', '/book.opus');
+            """
+        )
+        # What the original UPDATE trigger left behind: the index still
+        # holds the old author after the row changed
+        conn.execute("DROP TRIGGER audiobooks_au")
+        conn.execute("UPDATE audiobooks SET author = 'Bob Jones' WHERE id = 1")
+        conn.commit()
+        conn.close()
+
+        ensure_schema(db_path)
+
+        conn = sqlite3.connect(db_path)
+
+        def match(query):
+            return conn.execute(
+                "SELECT rowid FROM audiobooks_fts WHERE audiobooks_fts MATCH ?",
+                (query,),
+            ).fetchall()
+
+        assert match('author : "alice"*') == []
+        assert match('author : "bob"*') == [(1,)]
+
+        conn.execute("DELETE FROM audiobooks WHERE id = 1")
+        assert match('author : "bob"*') == []
+        conn.close()
+
+    def test_missing_database_not_created(self, tmp_path):
+        """Test ensure_schema leaves a missing database path alone."""
+        db_path = tmp_path / "missing.db"
+        ensure_schema(db_path)
+        assert not db_path.exists()
+
+
+class TestSortIndices:
+    """Test that listing sorts can walk an index instead of sorting."""
+
+    @pytest.mark.parametrize(
+        "sort_sql",
+        ["created_at", "file_size_mb", "author_last_name", "series, series_sequence"],
+    )
+    def test_order_by_uses_index(self, schema_db, sort_sql):
+        """Test ORDER BY ... LIMIT avoids a temp b-tree sort."""
+        plan = schema_db.execute(
+            f"EXPLAIN QUERY PLAN SELECT id FROM audiobooks "
+            f"ORDER BY {sort_sql} LIMIT 50"
+        ).fetchall()
+        details = " ".join(row[-1] for row in plan)
+        assert "USE TEMP B-TREE" not in details
+
+
+class TestHashIndex:
+    """Test hash duplicate queries are served from the covering index."""
+
+    def test_group_by_hash_uses_covering_index(self, schema_db):
+        """Test hash grouping reads only the partial covering index."""
+        plan = schema_db.execute(
+            "EXPLAIN QUERY PLAN SELECT sha256_hash, COUNT(*), SUM(file_size_mb) "
+            "FROM audiobooks WHERE sha256_hash IS NOT NULL "
+            "GROUP BY sha256_hash HAVING COUNT(*) > 1"
+        ).fetchall()
+        details = " ".join(row[-1] for row in plan)
+        assert "COVERING INDEX idx_audiobooks_sha256_cover" in details
+        assert "USE TEMP B-TREE" not in details
+
+
+class TestGetDb:
+    """Test connection settings applied by get_db()."""
+
+    def test_synchronous_follows_journal_mode(self, tmp_path):
+        """Test synchronous is only lowered once the database uses WAL."""
+        db_path = tmp_path / "sync.db"
+        conn = sqlite3.connect(db_path)
+        conn.executescript(SCHEMA_PATH.read_text())
+        conn.close()
+
+        conn = get_db(db_path)
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2  # FULL
+        conn.close()
+
+        ensure_schema(db_path)
+
+        conn = get_db(db_path)
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        conn.close()
@@ -80,6 +80,44 @@ class TestDownloadSupplement:
         data = response.get_json()
         assert "not found" in data["error"].lower()
 
+    def test_download_revalidates_and_reports_missing_file(
+        self, flask_app, tmp_path
+    ):
+        """Test downloads support 304 revalidation and 404 once the file is gone."""
+        import sqlite3
+
+        pdf = tmp_path / "guide.pdf"
+        pdf.write_bytes(b"%PDF-1.4 test content")
+
+        conn = sqlite3.connect(flask_app.config["DATABASE_PATH"])
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO supplements (type, filename, file_path) VALUES (?, ?, ?)",
+            ("pdf", "guide.pdf", str(pdf)),
+        )
+        supplement_id = cursor.lastrowid
+        conn.commit()
+
+        try:
+            url = f"/api/supplements/{supplement_id}/download"
+            with flask_app.test_client() as client:
+                response = client.get(url)
+                assert response.status_code == 200
+                assert response.mimetype == "application/pdf"
+                etag = response.headers["ETag"]
+
+                response = client.get(url, headers={"If-None-Match": etag})
+                assert response.status_code == 304
+
+                pdf.unlink()
+                response = client.get(url)
+                assert response.status_code == 404
+                assert response.get_json()["error"] == "File not found on disk"
+        finally:
+            cursor.execute("DELETE FROM supplements WHERE id = ?", (supplement_id,))
+            conn.commit()
+            conn.close()
+
 
 class TestScanSupplements:
     """Test the scan_supplements endpoint."""
@@ -115,6 +153,43 @@ class TestScanSupplements:
         assert data["added"] >= 1
         assert "new_book.pdf" in data["added_files"]
 
+    def test_scan_links_supplement_to_title(self, flask_app, session_temp_dir):
+        """Test a supplement filename is matched to the audiobook title."""
+        import sqlite3
+
+        db_path = flask_app.config["DATABASE_PATH"]
+        conn = sqlite3.connect(db_path)
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO audiobooks (title, file_path) VALUES (?, ?)",
+            ("Zyxwv Companion: The Quorum-Saga", "/test/zyxwv_companion.opus"),
+        )
+        audiobook_id = cursor.lastrowid
+        conn.commit()
+
+        supplements_dir = session_temp_dir / "supplements"
+        test_pdf = supplements_dir / "Zyxwv_Companion_The_QuorumSaga.pdf"
+        test_pdf.write_bytes(b"%PDF-1.4 test content")
+
+        try:
+            with flask_app.test_client() as client:
+                response = client.post("/api/supplements/scan")
+            assert response.status_code == 200
+
+            cursor.execute(
+                "SELECT audiobook_id FROM supplements WHERE file_path = ?",
+                (str(test_pdf),),
+            )
+            assert cursor.fetchone()[0] == audiobook_id
+        finally:
+            test_pdf.unlink()
+            cursor.execute(
+                "DELETE FROM supplements WHERE file_path = ?", (str(test_pdf),)
+            )
+            cursor.execute("DELETE FROM audiobooks WHERE id = ?", (audiobook_id,))
+            conn.commit()
+            conn.close()
+
 
 class TestEndpointMethodConstraints:
     """Test that endpoints only respond to correct HTTP methods."""